@@ -0,0 +1,62 @@
+"""
+So sánh chi phí tìm handler cho mỗi request: importlib.import_module (cũ) và bảng handler dựng sẵn.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_dispatch.py --calls 100000
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+
+from routes.api import discover_handlers  # noqa: E402
+
+def legacy_dispatch(version: str, name: str):
+    """
+    Cách cũ: import module theo tên mỗi request, ModuleNotFoundError nghĩa là 404.
+    """
+    try:
+        return importlib.import_module(f"api.v{version}.{name}").handle_request
+    except ModuleNotFoundError:
+        return None
+
+def table_dispatch(handlers: dict, version: str, name: str):
+    """
+    Cách mới: tra bảng handler đã dựng khi khởi động.
+    """
+    return handlers.get(version, {}).get(name)
+
+def _measure(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000, help="Số lần tìm handler cho mỗi trường hợp")
+    options = parser.parse_args()
+
+    start = time.perf_counter()
+    handlers = discover_handlers()
+    boot = time.perf_counter() - start
+
+    for version, name in (("1", "getCalendar"), ("1", "missing")):
+        if legacy_dispatch(version, name) is not table_dispatch(handlers, version, name):
+            raise SystemExit(f"Kết quả tìm handler v{version}/{name} của hai cách không giống nhau")
+
+    print(f"discovery at startup: {boot * 1000:.1f} ms ({sum(map(len, handlers.values()))} handlers)")
+    for label, version, name, calls in (
+        ("known route  ", "1", "getCalendar", options.calls),
+        ("unknown route", "1", "missing", max(1, options.calls // 100)),
+    ):
+        legacy = _measure(lambda version=version, name=name: legacy_dispatch(version, name), calls)
+        table = _measure(lambda version=version, name=name: table_dispatch(handlers, version, name), calls)
+        print(f"{label}: importlib {legacy * 1e6:.2f} µs, table {table * 1e6:.3f} µs (x{legacy / table:.0f})")
+
+if __name__ == "__main__":
+    main()
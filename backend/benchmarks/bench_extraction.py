@@ -0,0 +1,98 @@
+"""
+So sánh tốc độ trích xuất Thời khóa biểu: vòng lặp iterrows cũ và pipeline theo cột.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_extraction.py --classes 8000
+"""
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from classes.subject import DetailedClass, Subject, Lesson, Timetable  # noqa: E402
+from classes.schedule import Schedule  # noqa: E402
+from utils.getClass import _find_header_row, _standardize_dataframe  # noqa: E402
+from generators import make_schedule_sheet, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+
+TIMETABLE = Timetable(os.path.join(BACKEND_DIR, "config", "time.csv"))
+
+def legacy_extract(df: pd.DataFrame, id_header: str) -> list[DetailedClass]:
+    """
+    Cách trích xuất cũ: tìm header và tạo từng lớp bằng df.iterrows().
+    """
+    header_row_index = next((row_index for row_index, row in df.iterrows() if id_header in row.values), None)
+    df = df.copy()
+    df.columns = df.iloc[header_row_index]
+    df = df.iloc[header_row_index + 1:].reset_index(drop=True)
+    df = _standardize_dataframe(df)
+
+    classes: dict[str, DetailedClass] = {}
+    for _, row in df.iterrows():
+        class_id = row[id_header]
+        if class_id not in classes:
+            classes[class_id] = DetailedClass(
+                id=class_id,
+                subject=Subject(id=row["Mã học phần"], name=row["Học phần"]),
+                teacher=row["Giảng viên"]
+            )
+        classes[class_id].add_lesson(
+            Lesson(weekday=row["Thứ"], location=row["Giảng đường"], group=row["Nhóm"], period=TIMETABLE.reference(row["Tiết"]))
+        )
+    return list(classes.values())
+
+def columnar_extract(df: pd.DataFrame, id_header: str) -> list[DetailedClass]:
+    """
+    Cách trích xuất mới: mask header theo cột, mã hóa từ điển, groupby theo mã lớp.
+    """
+    header_row_index = _find_header_row(df, id_header)
+    df = df.copy()
+    df.columns = df.iloc[header_row_index]
+    df = df.iloc[header_row_index + 1:].reset_index(drop=True)
+    df = _standardize_dataframe(df)
+    schedule = Schedule.from_dataframe(df, id_header, TIMETABLE)
+    return schedule.get_classes(list(schedule))
+
+def _signature(classes: list[DetailedClass]) -> list[tuple]:
+    return [
+        (
+            class_.id, class_.subject.id, class_.subject.name, class_.teacher,
+            [(lesson.weekday, lesson.location, lesson.group, lesson.period.start, lesson.period.end) for lesson in class_.lessons]
+        )
+        for class_ in classes
+    ]
+
+def _measure(func, *args, repeat: int = 3) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=6000, help="Số lớp học phần của Thời khóa biểu giả")
+    parser.add_argument("--repeat", type=int, default=3, help="Số lần lặp, lấy thời gian tốt nhất")
+    options = parser.parse_args()
+
+    df = make_schedule_sheet(options.classes)
+    header_legacy, _ = _measure(lambda: next(i for i, row in df.iterrows() if ID_HEADER in row.values), repeat=options.repeat)
+    header_columnar, _ = _measure(_find_header_row, df, ID_HEADER, repeat=options.repeat)
+    legacy_time, legacy_classes = _measure(legacy_extract, df, ID_HEADER, repeat=options.repeat)
+    columnar_time, columnar_classes = _measure(columnar_extract, df, ID_HEADER, repeat=options.repeat)
+
+    if _signature(legacy_classes) != _signature(columnar_classes):
+        raise SystemExit("Kết quả của hai cách trích xuất không giống nhau")
+
+    print(f"rows={len(df)} classes={len(columnar_classes)}")
+    print(f"header detection: iterrows {header_legacy * 1000:.2f} ms, mask {header_columnar * 1000:.2f} ms")
+    print(f"extraction:       iterrows {legacy_time * 1000:.2f} ms, columnar {columnar_time * 1000:.2f} ms "
+          f"(x{legacy_time / columnar_time:.1f})")
+
+if __name__ == "__main__":
+    main()
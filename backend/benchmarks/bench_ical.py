@@ -0,0 +1,65 @@
+"""
+So sánh hai cách xuất iCalendar: cây component của icalendar và writer trực tiếp.
+
+Kiểm tra hai cách cho ra cùng dữ liệu (so sánh byte và so sánh sau khi đọc lại bằng
+icalendar), rồi đo thời gian. Chạy từ thư mục backend:
+    python benchmarks/bench_ical.py --classes 200
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from icalendar import Calendar as ICalendar  # noqa: E402
+from bench_extraction import columnar_extract  # noqa: E402
+from generators import make_schedule_sheet, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+from utils.makeCalendar import export_calendar  # noqa: E402
+
+CASES = [
+    {'start_date': date(2025, 2, 17), 'repeat': 15, 'remind_before': [15], 'practical_delay': 1, 'practical_groups': []},
+    {'start_date': date(2025, 2, 17), 'repeat': date(2025, 6, 1), 'remind_before': [0, 90, 1500], 'practical_delay': 2, 'practical_groups': ["1", "2"]},
+    {'start_date': date(2025, 2, 17), 'repeat': 10, 'remind_before': [], 'practical_delay': 1, 'practical_groups': ["CL"]},
+]
+
+def make_classes(count: int):
+    classes = columnar_extract(make_schedule_sheet(count), ID_HEADER)
+    # Thêm ký tự cần escape và tên dài nhiều byte để kiểm tra việc gập dòng
+    for index, class_ in enumerate(classes[:10]):
+        class_.subject.name = f"Lập trình; hướng đối tượng, nâng cao \\ {'ữ' * index * 7} {index}"
+    return classes
+
+def _measure(func, *args, rounds: int = 5, **kwargs) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=200, help="Số lớp học phần trong lịch")
+    options = parser.parse_args()
+
+    classes = make_classes(options.classes)
+    for case in CASES:
+        icalendar_time, icalendar_data = _measure(export_calendar, classes, renderer="icalendar", **case)
+        direct_time, direct_data = _measure(export_calendar, classes, renderer="direct", **case)
+
+        parsed_icalendar = ICalendar.from_ical(icalendar_data).to_ical()
+        parsed_direct = ICalendar.from_ical(direct_data).to_ical()
+        if parsed_icalendar != parsed_direct:
+            raise SystemExit("Dữ liệu iCalendar sau khi đọc lại không giống nhau")
+        identical = "identical bytes" if icalendar_data == direct_data else "same after re-parse"
+
+        print(f"repeat={case['repeat']} reminders={case['remind_before']}: "
+              f"icalendar {icalendar_time * 1000:.2f} ms, direct {direct_time * 1000:.2f} ms "
+              f"(x{icalendar_time / direct_time:.1f}, {identical})")
+
+if __name__ == "__main__":
+    main()
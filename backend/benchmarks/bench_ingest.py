@@ -0,0 +1,90 @@
+"""
+Đo việc đọc Thời khóa biểu gồm nhiều sheet/nhiều file (get_merged_schedule): đọc lần lượt trong
+tiến trình chính và đọc song song trong process pool, kiểm tra hai cách cho cùng kết quả và
+phát hiện lớp trùng giữa các sheet.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_ingest.py --files 2 --sheets 4 --classes 1500 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from utils.getClass import get_merged_schedule, ALL_SHEETS  # noqa: E402
+from generators import schedule_rows, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+
+def write_workbook(path: str, sheets: int, classes: int, prefix: str) -> list[str]:
+    """
+    Ghi một file nhiều sheet (thêm một sheet bìa không có bảng). Mã lớp của mỗi sheet có tiền tố riêng,
+    riêng sheet cuối lặp lại các lớp của sheet đầu để kiểm tra phát hiện lớp trùng.
+
+    Returns:
+        list[str]: Mã các lớp bị trùng
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    workbook.create_sheet("Bìa").append(["THỜI KHÓA BIỂU"])
+    duplicates = []
+    for sheet in range(sheets):
+        rows = schedule_rows(classes, seed=sheet)
+        header_index = next(index for index, row in enumerate(rows) if ID_HEADER in row)
+        id_column = rows[header_index].index(ID_HEADER)
+        tag = 0 if sheet == sheets - 1 and sheets > 1 else sheet
+        for row in rows[header_index + 1:]:
+            row[id_column] = f"{prefix}{tag}-{row[id_column]}"
+            if tag != sheet:
+                duplicates.append(row[id_column])
+        worksheet = workbook.create_sheet(f"Khoa {sheet}")
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return sorted(set(duplicates))
+
+def _signature(schedule) -> list[tuple]:
+    return [
+        (class_.id, class_.subject.id, class_.teacher, [(lesson.weekday, lesson.location, lesson.group, lesson.period) for lesson in class_.lessons])
+        for class_ in schedule.get_classes(list(schedule))
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2, help="Số file")
+    parser.add_argument("--sheets", type=int, default=4, help="Số sheet có bảng trong mỗi file")
+    parser.add_argument("--classes", type=int, default=1500, help="Số lớp học phần của mỗi sheet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Số tiến trình con")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        sources, duplicates = [], 0
+        for index in range(options.files):
+            path = os.path.join(workdir, f"tkb{index}.xlsx")
+            duplicates += len(write_workbook(path, options.sheets, options.classes, prefix=f"F{index}-"))
+            sources.append({"file": path, "sheet": ALL_SHEETS})
+
+        start = time.perf_counter()
+        sequential = get_merged_schedule(sources, ID_HEADER, max_workers=1)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = get_merged_schedule(sources, ID_HEADER, max_workers=options.workers)
+        parallel_time = time.perf_counter() - start
+
+    if _signature(sequential) != _signature(parallel):
+        raise SystemExit("Kết quả đọc lần lượt và song song không giống nhau")
+    expected = options.files * options.sheets * options.classes - duplicates
+    if len(sequential) != expected:
+        raise SystemExit(f"Số lớp sau khi gộp không đúng: {len(sequential)} != {expected}")
+
+    print(f"files={options.files} sheets={options.files * options.sheets} classes={len(sequential)} duplicates={duplicates}")
+    print(f"sequential: {sequential_time * 1000:9.1f} ms")
+    print(f"parallel:   {parallel_time * 1000:9.1f} ms  workers={options.workers}  (x{sequential_time / parallel_time:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+So sánh bộ nhớ giữ lại khi nạp cả Thời khóa biểu: dataclass thường (mỗi buổi học một Period,
+chuỗi lặp lại theo từng dòng), DetailedClass có __slots__ và Period dùng chung, và ClassView đọc
+thẳng từ các cột của Schedule.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_memory.py --classes 20000
+"""
+import gc
+import os
+import sys
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from classes.subject import Lesson, Timetable  # noqa: E402
+from classes.schedule import Schedule  # noqa: E402
+from utils.getClass import _find_header_row, _standardize_dataframe  # noqa: E402
+from generators import make_schedule_sheet, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+
+TIMETABLE = Timetable(os.path.join(BACKEND_DIR, "config", "time.csv"))
+
+@dataclass
+class LegacyPeriod:
+    start: time
+    end: time
+
+@dataclass
+class LegacySubject:
+    id: str
+    name: str
+
+@dataclass
+class LegacyLesson:
+    weekday: int
+    period: LegacyPeriod
+    location: str
+    group: str
+
+@dataclass
+class LegacyClass:
+    id: str
+    subject: LegacySubject
+    teacher: str
+    lessons: list[LegacyLesson] = field(default_factory=list)
+
+def _copy(value):
+    # Mỗi ô đọc từ file Excel là một đối tượng chuỗi riêng
+    return "".join(value) if isinstance(value, str) else value
+
+def legacy_classes(rows: list[dict]) -> list[LegacyClass]:
+    """
+    Mô hình cũ: dataclass có __dict__, mỗi buổi học một Period, chuỗi không dùng chung.
+    """
+    classes: dict[str, LegacyClass] = {}
+    for row in rows:
+        class_id = row[ID_HEADER]
+        class_ = classes.get(class_id)
+        if class_ is None:
+            class_ = classes[class_id] = LegacyClass(
+                id=_copy(class_id),
+                subject=LegacySubject(id=_copy(row["Mã học phần"]), name=_copy(row["Học phần"])),
+                teacher=_copy(row["Giảng viên"])
+            )
+        period = TIMETABLE.reference(row["Tiết"])
+        class_.lessons.append(LegacyLesson(
+            weekday=Lesson.parse_weekday(row["Thứ"]),
+            period=LegacyPeriod(period.start, period.end),
+            location=_copy(row["Giảng đường"]),
+            group=_copy(row["Nhóm"])
+        ))
+    return list(classes.values())
+
+def _signature(classes) -> list[tuple]:
+    return [
+        (
+            class_.id, class_.subject.id, class_.subject.name, class_.teacher,
+            [(lesson.weekday, lesson.location, lesson.group, lesson.period.start, lesson.period.end) for lesson in class_.lessons]
+        )
+        for class_ in classes
+    ]
+
+def retained(build) -> tuple[int, object]:
+    """
+    Số byte còn được giữ lại sau khi gọi build (đo bằng tracemalloc).
+
+    Returns:
+        tuple[int, object]: Số byte và kết quả của build
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=20000, help="Số lớp học phần của Thời khóa biểu giả")
+    options = parser.parse_args()
+
+    df = make_schedule_sheet(options.classes)
+    header_row_index = _find_header_row(df, ID_HEADER)
+    df.columns = df.iloc[header_row_index]
+    df = _standardize_dataframe(df.iloc[header_row_index + 1:].reset_index(drop=True))
+    rows = df.to_dict("records")
+    del df
+
+    legacy_bytes, legacy = retained(lambda: legacy_classes(rows))
+
+    def load_schedule() -> Schedule:
+        import pandas as pd
+        return Schedule.from_dataframe(pd.DataFrame(rows), ID_HEADER, TIMETABLE)
+
+    schedule_bytes, schedule = retained(load_schedule)
+    class_ids = list(schedule)
+    objects_bytes, objects = retained(lambda: schedule.get_classes(class_ids))
+
+    view_schedule = load_schedule()
+    view_schedule.views = True
+    views_bytes, views = retained(lambda: view_schedule.get_classes(class_ids))
+
+    if not (_signature(legacy) == _signature(objects) == _signature(views)):
+        raise SystemExit("Kết quả của các mô hình không giống nhau")
+
+    lessons = len(rows)
+    print(f"rows={lessons} classes={len(class_ids)}")
+    print(f"schedule (columns):       {schedule_bytes / 1024:10.1f} KiB")
+    for name, size in (("legacy dataclasses", legacy_bytes), ("slotted DetailedClass", objects_bytes), ("ClassView", views_bytes)):
+        print(f"{name + ':':<25} {size / 1024:10.1f} KiB  {size / lessons:7.1f} B/lesson  (x{legacy_bytes / max(size, 1):.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+So sánh cách đọc file Kết quả Đăng ký học: BeautifulSoup và parser theo luồng.
+
+Kiểm tra hai cách cho cùng kết quả rồi đo thời gian. Chạy từ thư mục backend:
+    python benchmarks/bench_registration.py --classes 12 --layout 2000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from utils.getClass import _get_simplified_classes_bs4  # noqa: E402
+from utils.registration import parse_registration  # noqa: E402
+from generators import make_registration_page, REGISTRATION_ID_HEADER as ID_HEADER  # noqa: E402
+
+def _signature(classes) -> list[tuple]:
+    return [(class_.id, class_.subject.id, class_.subject.name) for class_ in classes]
+
+def _measure(func, *args, repeat: int = 5) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=12, help="Số lớp học phần đã đăng ký")
+    parser.add_argument("--layout", type=int, default=2000, help="Số dòng bố cục quanh bảng")
+    options = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as file:
+        file.write(make_registration_page(options.classes, options.layout))
+    try:
+        bs4_time, bs4_classes = _measure(_get_simplified_classes_bs4, file.name, ID_HEADER)
+        stream_time, stream_classes = _measure(parse_registration, file.name, ID_HEADER)
+        with open(file.name, "rb") as stream:
+            bytes_classes = parse_registration(stream.read(), ID_HEADER)
+    finally:
+        os.remove(file.name)
+
+    if not (_signature(bs4_classes) == _signature(stream_classes) == _signature(bytes_classes)):
+        raise SystemExit("Kết quả của hai cách đọc không giống nhau")
+
+    print(f"classes={options.classes} layout rows={options.layout}")
+    print(f"BeautifulSoup {bs4_time * 1000:.2f} ms, stream {stream_time * 1000:.2f} ms (x{bs4_time / stream_time:.1f})")
+
+if __name__ == "__main__":
+    main()
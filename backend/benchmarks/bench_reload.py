@@ -0,0 +1,96 @@
+"""
+Đo việc đọc lại Thời khóa biểu khi file thay đổi vài lớp: thời gian đọc lại và so sánh theo mã lớp
+(FileWatcher.poll), số fragment VEVENT được giữ lại, và thời gian xuất lại lịch của mọi lớp khi
+chỉ xóa fragment của các lớp thay đổi so với khi xóa hết.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_reload.py --classes 2000 --changed 20
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+os.environ["SCHEDULE_SNAPSHOT_ENABLED"] = "0"
+os.environ["SCHEDULE_WATCH_INTERVAL"] = "3600"  # Chỉ kiểm tra khi gọi poll()
+
+from utils import getClass  # noqa: E402
+from utils.getClass import get_schedule, on_schedule_changed, watch_schedule  # noqa: E402
+from utils.icalWriter import FRAGMENT_CACHE  # noqa: E402
+from utils.makeCalendar import export_calendar  # noqa: E402
+from generators import schedule_rows, SCHEDULE_ID_HEADER  # noqa: E402
+
+CALENDAR_OPTIONS = {'start_date': date(2025, 2, 17), 'repeat': 15, 'remind_before': [15], 'practical_groups': ["1", "2"]}
+
+def write_workbook(path: str, rows: list[list]) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("TKB")
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+def export_all(path: str) -> float:
+    schedule = get_schedule(path, SCHEDULE_ID_HEADER)
+    classes = [schedule.get_class(class_id) for class_id in schedule]
+    start = time.perf_counter()
+    # Mỗi sinh viên 8 lớp liên tiếp
+    for index in range(0, len(classes), 8):
+        export_calendar(classes[index:index + 8], renderer="direct", **CALENDAR_OPTIONS)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=2000, help="Số lớp học phần")
+    parser.add_argument("--changed", type=int, default=20, help="Số lớp bị sửa giảng đường")
+    options = parser.parse_args()
+
+    rows = schedule_rows(options.classes)
+    header_index = next(index for index, row in enumerate(rows) if SCHEDULE_ID_HEADER in row)
+    id_column = rows[header_index].index(SCHEDULE_ID_HEADER)
+    location_column = rows[header_index].index("Giảng đường")
+
+    diffs = []
+    on_schedule_changed(lambda old, new, diff: diffs.append(diff))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "tkb.xlsx")
+        write_workbook(path, rows)
+        get_schedule(path, SCHEDULE_ID_HEADER)
+        watch_schedule(path, SCHEDULE_ID_HEADER)
+        cold = export_all(path)
+        warm = export_all(path)
+        before = len(FRAGMENT_CACHE)
+
+        class_ids = sorted({row[id_column] for row in rows[header_index + 1:]})
+        edited = set(random.Random(1).sample(class_ids, min(options.changed, len(class_ids))))
+        for row in rows[header_index + 1:]:
+            if row[id_column] in edited:
+                row[location_column] = "999-G2"
+        write_workbook(path, rows)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+
+        start = time.perf_counter()
+        changed_files = getClass.WATCHER.poll()
+        reload_time = time.perf_counter() - start
+        if len(changed_files) != 1 or not diffs or diffs[-1].changed != edited:
+            raise SystemExit(f"Khác biệt không đúng: {diffs[-1] if diffs else None}")
+        kept = len(FRAGMENT_CACHE)
+        incremental = export_all(path)
+
+    getClass.WATCHER.stop()
+    print(f"classes={len(class_ids)} changed={len(edited)} fragments={before}")
+    print(f"export (cold):            {cold * 1000:9.1f} ms")
+    print(f"export (warm):            {warm * 1000:9.1f} ms")
+    print(f"reload + diff (poll):     {reload_time * 1000:9.1f} ms  kept {kept}/{before} fragments")
+    print(f"export after reload:      {incremental * 1000:9.1f} ms  (full invalidation ~ cold)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Đo thời gian tự động xếp lịch (utils/autoScheduler.py) trên Thời khóa biểu giả: tìm kiếm tuần tự
+và chia nhánh cho process pool, kiểm tra với cách duyệt mọi tổ hợp khi số môn nhỏ.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_scheduler.py --subjects 10 --sections 6 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+import itertools
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import pandas as pd  # noqa: E402
+from classes.subject import Timetable  # noqa: E402
+from classes.schedule import Schedule  # noqa: E402
+from utils.autoScheduler import find_combinations, OccupancyEncoder, Preferences, _evaluate  # noqa: E402
+from generators import schedule_rows, SCHEDULE_ID_HEADER  # noqa: E402
+
+TIMETABLE = Timetable(os.path.join(BACKEND_DIR, "config", "time.csv"))
+WEEKDAYS = ["2", "3", "4", "5", "6", "7", "CN"]
+
+def make_classes(subjects: int, sections: int, seed: int):
+    """
+    Các lớp học phần của `subjects` môn, mỗi môn `sections` lớp (dữ liệu của generators.schedule_rows).
+    """
+    rows = schedule_rows(subjects * 4, seed)
+    header_index = next(index for index, row in enumerate(rows) if SCHEDULE_ID_HEADER in row)
+    df = pd.DataFrame(rows[header_index + 1:], columns=rows[header_index])
+    df = df.loc[:, df.columns.notna()]
+    # Mỗi môn có 4 lớp trong generator; nhân bản để có đủ `sections` lớp, mỗi bản dịch sang một thứ khác
+    frames = []
+    for copy in range(max(1, -(-sections // 4))):
+        frame = df.copy()
+        frame[SCHEDULE_ID_HEADER] = frame[SCHEDULE_ID_HEADER] + f"-{copy}"
+        frame["Thứ"] = frame["Thứ"].map(lambda day, shift=copy: WEEKDAYS[(WEEKDAYS.index(day) + shift) % 6])
+        frames.append(frame)
+    schedule = Schedule.from_dataframe(pd.concat(frames, ignore_index=True), SCHEDULE_ID_HEADER, TIMETABLE)
+    classes = [schedule.get_class(class_id) for class_id in schedule]
+    per_subject: dict[str, list] = {}
+    for class_ in classes:
+        per_subject.setdefault(class_.subject.id, []).append(class_)
+    classes = [class_ for subject_classes in per_subject.values() for class_ in subject_classes[:sections]]
+    return classes, list(per_subject)
+
+def brute_force(classes, subject_ids, preferences: Preferences) -> list[float]:
+    encoder = OccupancyEncoder(TIMETABLE)
+    options = [
+        [option for class_ in classes if class_.subject.id == subject_id for option in encoder.class_options(class_)]
+        for subject_id in subject_ids
+    ]
+    scores = []
+    for combination in itertools.product(*options):
+        occupancy = 0
+        for option in combination:
+            if occupancy & option.mask:
+                break
+            occupancy |= option.mask
+        else:
+            scores.append(_evaluate(occupancy, encoder.periods, preferences))
+    return sorted(scores, reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subjects", type=int, default=10, help="Số môn học cần xếp")
+    parser.add_argument("--sections", type=int, default=6, help="Số lớp học phần của mỗi môn")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Số tiến trình con")
+    parser.add_argument("--top", type=int, default=10, help="Số phương án tốt nhất")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    classes, subject_ids = make_classes(options.subjects, options.sections, options.seed)
+    preferences = Preferences(avoid_days=(5,))
+
+    start = time.perf_counter()
+    sequential = find_combinations(classes, subject_ids, TIMETABLE, preferences, options.top, max_workers=1)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = find_combinations(classes, subject_ids, TIMETABLE, preferences, options.top, max_workers=options.workers)
+    parallel_time = time.perf_counter() - start
+
+    sequential_scores = [candidate.score for candidate in sequential.candidates]
+    # Khi dừng sớm vì max_nodes, hai cách duyệt các phần khác nhau của cây nên kết quả có thể khác
+    if sequential.complete and parallel.complete and sequential_scores != [candidate.score for candidate in parallel.candidates]:
+        raise SystemExit("Kết quả tuần tự và song song không giống nhau")
+    if options.subjects <= 6:
+        if sequential_scores != brute_force(classes, subject_ids, preferences)[:options.top]:
+            raise SystemExit("Kết quả khác với duyệt mọi tổ hợp")
+
+    print(f"subjects={len(subject_ids)} classes={len(classes)} candidates={len(sequential.candidates)} "
+          f"best={sequential_scores[0] if sequential_scores else None}")
+    print(f"sequential: {sequential_time * 1000:9.1f} ms  nodes={sequential.nodes} complete={sequential.complete}")
+    print(f"parallel:   {parallel_time * 1000:9.1f} ms  nodes={parallel.nodes} complete={parallel.complete} "
+          f"workers={options.workers}")
+
+if __name__ == "__main__":
+    main()
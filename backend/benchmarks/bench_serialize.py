@@ -0,0 +1,91 @@
+"""
+So sánh cách tạo JSON của getLessons cho nhiều lớp: dict lồng nhau + jsonify (cũ), dict lồng nhau
+mã hóa một lần bằng utils.response.dumps (orjson nếu có), dạng cột có mã hóa từ điển, và chỉ lấy
+một số trường (fields). Đo thời gian và kích thước payload.
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_serialize.py --classes 8000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from flask import Flask, jsonify  # noqa: E402
+from classes.schedule import Schedule  # noqa: E402
+from utils.getClass import _find_header_row, _standardize_dataframe, PERIOD_REFERENCE  # noqa: E402
+from utils.response import dumps, orjson  # noqa: E402
+from utils.serialize import class_to_dict, classes_to_columns, parse_fields  # noqa: E402
+from generators import make_schedule_sheet, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+
+def legacy_payload(classes) -> bytes:
+    """
+    Cách cũ: str(period) và kiểm tra TH/BT cho từng buổi học, rồi jsonify.
+    """
+    data = {'classes': [
+        {
+            'id': class_.id,
+            'subject': {'id': class_.subject.id, 'name': class_.subject.name},
+            'teacher': class_.teacher,
+            'lessons': [
+                {
+                    'weekday': lesson.weekday,
+                    'period': str(lesson.period),
+                    'location': lesson.location,
+                    'group': lesson.group,
+                    'is_practical': any(keyword in lesson.group for keyword in ["TH", "BT"])
+                }
+                for lesson in class_.lessons
+            ]
+        }
+        for class_ in classes
+    ]}
+    return jsonify(data).get_data()
+
+def _measure(func, repeat: int = 3) -> tuple[float, bytes]:
+    best, result = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=8000, help="Số lớp học phần")
+    options = parser.parse_args()
+
+    df = make_schedule_sheet(options.classes)
+    header_row_index = _find_header_row(df, ID_HEADER)
+    df.columns = df.iloc[header_row_index]
+    df = _standardize_dataframe(df.iloc[header_row_index + 1:].reset_index(drop=True))
+    schedule = Schedule.from_dataframe(df, ID_HEADER, PERIOD_REFERENCE)
+    classes = schedule.get_classes(list(schedule))
+
+    projection = parse_fields(["id", "lessons.weekday", "lessons.period"])
+    with Flask(__name__).app_context():
+        cases = [
+            ("legacy jsonify", lambda: legacy_payload(classes)),
+            ("nested", lambda: dumps({'classes': [class_to_dict(class_) for class_ in classes]})),
+            ("columnar", lambda: dumps({'layout': 'columnar', **classes_to_columns(classes)})),
+            ("nested fields", lambda: dumps({'classes': [class_to_dict(class_, *projection) for class_ in classes]})),
+            ("columnar fields", lambda: dumps({'layout': 'columnar', **classes_to_columns(classes, *projection)})),
+        ]
+        results = [(label, *_measure(func)) for label, func in cases]
+
+    if json.loads(results[0][2]) != json.loads(results[1][2]):
+        raise SystemExit("Payload dạng lồng nhau khác với cách cũ")
+
+    baseline_time, baseline_size = results[0][1], len(results[0][2])
+    print(f"classes={len(classes)} encoder={'orjson' if orjson is not None else 'json'}")
+    for label, elapsed, payload in results:
+        print(f"{label:<16} {elapsed * 1000:8.1f} ms (x{baseline_time / elapsed:4.1f})  "
+              f"{len(payload) / 1024:9.1f} KiB ({len(payload) / baseline_size:4.0%})")
+
+if __name__ == "__main__":
+    main()
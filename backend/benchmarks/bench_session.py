@@ -0,0 +1,132 @@
+"""
+So sánh một phiên người dùng xem trước rồi tải lịch: getLessons rồi getCalendar với hai file (cũ),
+getLessons rồi getCalendar với handle, và một request getLessonsCalendar. Đếm số lần đọc file đăng ký
+và Thời khóa biểu (theo các bước *.registration / *.schedule của utils.metrics) và đo thời gian mỗi phiên.
+Cache Thời khóa biểu được xóa trước mỗi request (trường hợp xấu nhất, ví dụ request tới tiến trình khác
+hoặc cache đã bị đẩy ra), cache .ics tắt.
+
+Chạy từ thư mục bất kỳ:
+    python benchmarks/bench_session.py --classes 4000 --registered 8 --sessions 5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from generators import schedule_rows, write_registration_page  # noqa: E402
+from generators import SCHEDULE_ID_HEADER, REGISTRATION_ID_HEADER  # noqa: E402
+
+START_DATE = "2025-01-06"
+# Đặt trước khi import app (config.settings đọc biến môi trường khi được import)
+ENVIRONMENT = {
+    "METRICS_ENABLED": "1", "RESPONSE_CACHE_ENABLED": "0", "SCHEDULE_SNAPSHOT_ENABLED": "0", "STARTUP_WARMUP": "off"
+}
+
+def write_schedule(path: str, classes: int) -> str:
+    """
+    Ghi Thời khóa biểu giả có thêm cột "Lớp môn học" (bản sao cột "Mã lớp"): getLessons dùng cùng một
+    id_header cho cả hai file, còn getCalendar đọc Thời khóa biểu theo "Mã lớp".
+    """
+    from openpyxl import Workbook
+
+    rows = schedule_rows(classes)
+    header_index = next(index for index, row in enumerate(rows) if SCHEDULE_ID_HEADER in row)
+    id_column = rows[header_index].index(SCHEDULE_ID_HEADER)
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    for index, row in enumerate(rows):
+        if index == header_index:
+            extra = REGISTRATION_ID_HEADER
+        elif index > header_index:
+            extra = row[id_column]
+        else:
+            extra = None
+        worksheet.append(row[:id_column + 1] + [extra] + row[id_column + 1:])
+    workbook.save(path)
+    return path
+
+def _post(client, endpoint: str, body: dict):
+    from utils.getClass import SCHEDULE_CACHE
+
+    SCHEDULE_CACHE.clear()
+    response = client.post(f"/api/v1/{endpoint}", json=body)
+    if response.status_code != 200:
+        raise SystemExit(f"{endpoint} trả về {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+def separate(client, files: dict) -> bytes:
+    _post(client, "getLessons", files)
+    return _post(client, "getCalendar", {**files, 'start_date': START_DATE}).data
+
+def with_handle(client, files: dict) -> bytes:
+    handle = _post(client, "getLessons", files).json['handle']
+    return _post(client, "getCalendar", {'handle': handle, 'start_date': START_DATE}).data
+
+def combined(client, files: dict) -> bytes:
+    response = _post(client, "getLessonsCalendar", {**files, 'start_date': START_DATE})
+    return response.json['calendar'].encode('utf-8')
+
+def _parse_counts() -> tuple[int, int]:
+    """
+    Returns:
+        tuple[int, int]: Số lần đọc file đăng ký và số lần đọc Thời khóa biểu từ lần reset gần nhất
+    """
+    from utils import metrics
+
+    registration = schedule = 0
+    for line in metrics.render_prometheus().splitlines():
+        if not line.startswith(metrics.STAGE_METRIC + "_count"):
+            continue
+        value = int(float(line.rsplit(" ", 1)[1]))
+        if '.registration"' in line:
+            registration += value
+        elif '.schedule"' in line:
+            schedule += value
+    return registration, schedule
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=4000, help="Số lớp học phần của Thời khóa biểu giả")
+    parser.add_argument("--registered", type=int, default=8, help="Số lớp đã đăng ký")
+    parser.add_argument("--sessions", type=int, default=5, help="Số phiên đo mỗi cách, lấy thời gian nhỏ nhất")
+    options = parser.parse_args()
+
+    os.environ.update(ENVIRONMENT)
+    from main import app
+    from utils import metrics
+
+    client = app.test_client()
+    with tempfile.TemporaryDirectory() as workdir:
+        schedule = write_schedule(os.path.join(workdir, "tkb.xlsx"), options.classes)
+        registered = write_registration_page(os.path.join(workdir, "dkh.html"), options.registered)
+        files = {'registered_file': registered, 'schedule_file': schedule}
+
+        results = []
+        for label, session, body in (
+            ("separate", separate, files), ("handle", with_handle, files), ("combined", combined, files)
+        ):
+            best, calendar = float("inf"), b""
+            metrics.reset()
+            for _ in range(options.sessions):
+                start = time.perf_counter()
+                calendar = session(client, body)
+                best = min(best, time.perf_counter() - start)
+            registration, schedule_reads = _parse_counts()
+            results.append((label, best, calendar, registration / options.sessions, schedule_reads / options.sessions))
+
+    if len({calendar for _, _, calendar, _, _ in results}) != 1:
+        raise SystemExit("Các cách cho file .ics khác nhau")
+
+    baseline = results[0][1]
+    print(f"classes={options.classes} registered={options.registered} sessions={options.sessions}")
+    for label, elapsed, _, registration, schedule_reads in results:
+        print(f"{label:<9} {elapsed * 1000:8.1f} ms/phiên (x{baseline / elapsed:4.2f})  "
+              f"đọc file đăng ký {registration:.0f} lần, Thời khóa biểu {schedule_reads:.0f} lần")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Đo thời gian khởi động backend trong một tiến trình Python mới: thời gian import main.py và thời gian
+tới response đầu tiên (getConflicts với file đăng ký học và Thời khóa biểu nhỏ), với từng chế độ
+STARTUP_WARMUP. Mỗi lần đo chạy ở một thư mục làm việc khác thư mục src.
+
+Chạy từ thư mục bất kỳ:
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from generators import write_schedule_workbook, write_registration_page  # noqa: E402
+
+MODES = ("off", "background", "eager")
+
+# Chạy trong tiến trình con: in ra JSON {"import_ms", "first_response_ms", "status"}
+_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import main
+imported = time.perf_counter()
+response = main.app.test_client().post('/api/v1/getConflicts', json={{
+    'registered_file': {registered!r}, 'schedule_file': {schedule!r}
+}})
+done = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'first_response_ms': (done - imported) * 1000,
+    'status': response.status_code
+}}))
+"""
+
+def probe(mode: str, registered: str, schedule: str, workdir: str) -> dict:
+    code = _PROBE.format(src=os.path.join(BACKEND_DIR, "src"), registered=registered, schedule=schedule)
+    environment = {**os.environ, "STARTUP_WARMUP": mode, "SCHEDULE_SNAPSHOT_ENABLED": "0"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=workdir, env=environment, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Số lần đo mỗi chế độ, lấy trung vị")
+    parser.add_argument("--classes", type=int, default=200, help="Số lớp học phần của Thời khóa biểu giả")
+    parser.add_argument("--output", help="Ghi kết quả ra file JSON")
+    options = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        schedule = write_schedule_workbook(os.path.join(workdir, "tkb.xlsx"), options.classes)
+        registered = write_registration_page(os.path.join(workdir, "dkh.html"), 8)
+        for mode in MODES:
+            runs = [probe(mode, registered, schedule, workdir) for _ in range(options.runs)]
+            if any(run['status'] != 200 for run in runs):
+                raise SystemExit(f"Request đầu tiên không thành công ({mode}): {runs}")
+            import_ms = statistics.median(run['import_ms'] for run in runs)
+            first_ms = statistics.median(run['first_response_ms'] for run in runs)
+            results.append({'mode': mode, 'import_ms': round(import_ms, 1), 'first_response_ms': round(first_ms, 1)})
+            print(f"{mode:<10} import {import_ms:7.1f} ms  first response {first_ms:7.1f} ms  "
+                  f"total {import_ms + first_ms:7.1f} ms")
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump({'python': sys.version.split()[0], 'runs': options.runs, 'results': results}, file, indent=2)
+
+if __name__ == "__main__":
+    main()
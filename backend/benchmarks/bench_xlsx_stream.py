@@ -0,0 +1,84 @@
+"""
+So sánh cách lấy vài lớp học phần từ file Thời khóa biểu (.xlsx): đọc cả sheet bằng pd.read_excel
+rồi lọc (SCHEDULE_READER="pandas", không tính cache) và đọc theo luồng bằng openpyxl chỉ giữ các dòng
+cần lấy (SCHEDULE_READER="stream"). Đo thời gian và bộ nhớ đỉnh (tracemalloc).
+
+Chạy từ thư mục backend:
+    python benchmarks/bench_xlsx_stream.py --classes 8000 --take 8
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from classes.schedule import Schedule, SCHEDULE_COLUMNS  # noqa: E402
+from utils.getClass import _parse_schedule, PERIOD_REFERENCE  # noqa: E402
+from utils.xlsxReader import read_schedule_rows  # noqa: E402
+from generators import write_schedule_workbook, class_id, SCHEDULE_ID_HEADER as ID_HEADER  # noqa: E402
+
+def pandas_classes(path: str, id_list: list[str]):
+    return _parse_schedule(path, ID_HEADER).get_classes(id_list)
+
+def stream_classes(path: str, id_list: list[str]):
+    df = read_schedule_rows(path, ID_HEADER, id_list, SCHEDULE_COLUMNS)
+    return Schedule.from_dataframe(df, ID_HEADER, PERIOD_REFERENCE).get_classes(id_list)
+
+def _signature(classes) -> list[tuple]:
+    return [
+        (
+            class_.id, class_.subject.id, class_.subject.name, class_.teacher,
+            [(lesson.weekday, lesson.location, lesson.group, lesson.period) for lesson in class_.lessons]
+        )
+        for class_ in classes
+    ]
+
+def measure(func, *args) -> tuple[float, int, object]:
+    """
+    Returns:
+        tuple[float, int, object]: Thời gian (giây), bộ nhớ đỉnh (byte) và kết quả
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=8000, help="Số lớp học phần của Thời khóa biểu giả")
+    parser.add_argument("--take", type=int, default=8, help="Số lớp cần lấy")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = write_schedule_workbook(os.path.join(workdir, "tkb.xlsx"), options.classes)
+        id_list = [class_id(index) for index in random.Random(0).sample(range(options.classes), options.take)]
+
+        # Đọc mọi dòng theo luồng phải giống hệt cách đọc cũ
+        full = read_schedule_rows(path, ID_HEADER)
+        everything = list(_parse_schedule(path, ID_HEADER))
+        if _signature(Schedule.from_dataframe(full, ID_HEADER, PERIOD_REFERENCE).get_classes(everything)) != \
+                _signature(pandas_classes(path, everything)):
+            raise SystemExit("Đọc theo luồng cả sheet cho kết quả khác pd.read_excel")
+
+        pandas_time, pandas_peak, expected = measure(pandas_classes, path, id_list)
+        stream_time, stream_peak, actual = measure(stream_classes, path, id_list)
+
+    if _signature(expected) != _signature(actual):
+        raise SystemExit("Kết quả của hai cách đọc không giống nhau")
+
+    print(f"classes={options.classes} take={len(actual)}")
+    print(f"pandas: {pandas_time * 1000:9.1f} ms  peak {pandas_peak / 1024 / 1024:7.1f} MiB")
+    print(f"stream: {stream_time * 1000:9.1f} ms  peak {stream_peak / 1024 / 1024:7.1f} MiB  "
+          f"(x{pandas_time / stream_time:.1f} nhanh hơn, x{pandas_peak / max(stream_peak, 1):.1f} ít bộ nhớ hơn)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Sinh dữ liệu giả cho benchmark: file Thời khóa biểu (.xlsx) và trang Kết quả Đăng ký học (.html).
+
+Dữ liệu có cùng bố cục với file thật: Thời khóa biểu có vài dòng rác ở đầu, header ở giữa
+sheet, một cột trống rồi cột ghi chú ở cuối (phần mà _standardize_dataframe cắt bỏ); trang
+đăng ký có nhiều markup bố cục quanh bảng lớp học phần.
+"""
+import random
+import pandas as pd
+
+SCHEDULE_ID_HEADER = "Mã lớp"
+REGISTRATION_ID_HEADER = "Lớp môn học"
+SCHEDULE_HEADERS = ["STT", "Mã học phần", "Học phần", "Số TC", SCHEDULE_ID_HEADER, "Giảng viên", "Số SV", "Thứ", "Tiết", "Giảng đường", "Nhóm"]
+_JUNK_ROWS = [["ĐẠI HỌC QUỐC GIA HÀ NỘI"], ["THỜI KHÓA BIỂU HỌC KỲ II NĂM HỌC 2024-2025"], []]
+_TRAILING_COLUMNS = [None, "ghi chú"]
+
+def class_id(index: int) -> str:
+    """
+    Mã lớp học phần thứ index (giống nhau giữa hai generator).
+    """
+    return f"INT{index // 4:04d} {index % 4 + 1}"
+
+def schedule_rows(classes: int, seed: int = 0) -> list[list]:
+    """
+    Các dòng của sheet Thời khóa biểu (kể cả dòng rác và header) cho `classes` lớp học phần.
+
+    Mỗi lớp có 1-3 buổi học; buổi đầu tiên thuộc nhóm "CL", các buổi sau thuộc nhóm TH "1"/"2".
+    """
+    rng = random.Random(seed)
+    width = len(SCHEDULE_HEADERS) + len(_TRAILING_COLUMNS)
+    rows = [row + [None] * (width - len(row)) for row in _JUNK_ROWS]
+    rows.append(SCHEDULE_HEADERS + _TRAILING_COLUMNS)
+    number = 0
+    for index in range(classes):
+        subject = index // 4
+        for lesson in range(rng.randint(1, 3)):
+            number += 1
+            start = rng.choice([1, 4, 7, 10])
+            rows.append([
+                number, f"INT{subject:04d}", f"Học phần {subject}", 3, class_id(index),
+                f"Giảng viên {index % 97}", 60, rng.choice(["2", "3", "4", "5", "6", "7", "CN"]),
+                f"{start}-{start + 2}", f"{rng.randint(100, 400)}-G2", "CL" if lesson == 0 else rng.choice(["1", "2"]),
+                None, "ghi chú" if rng.random() < 0.05 else None
+            ])
+    return rows
+
+def make_schedule_sheet(classes: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Sheet Thời khóa biểu dạng DataFrame, giống kết quả của pd.read_excel(..., header=None).
+    """
+    return pd.DataFrame(schedule_rows(classes, seed))
+
+def write_schedule_workbook(path: str, classes: int, seed: int = 0) -> str:
+    """
+    Ghi file Thời khóa biểu (.xlsx) cho `classes` lớp học phần.
+
+    Returns:
+        str: Đường dẫn file đã ghi
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("TKB")
+    for row in schedule_rows(classes, seed):
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+def make_registration_page(classes: int, layout: int = 2000, offset: int = 0) -> str:
+    """
+    Trang Kết quả Đăng ký học với `classes` lớp học phần (mã lớp khớp với schedule_rows).
+
+    Args:
+        classes (int): Số lớp đã đăng ký
+        layout (int): Số dòng bố cục trong các bảng trước và sau bảng lớp học
+        offset (int): Chỉ số lớp đầu tiên
+    """
+    layout_rows = "".join(
+        f'<tr><td class="menu"><a href="/m/{index}">Mục&nbsp;{index}</a></td><td><span> </span></td></tr>'
+        for index in range(layout)
+    )
+    rows = "".join(
+        f"<tr><td>{number + 1}</td><td>INT{index // 4:04d}</td><td> Môn học <b>{index // 4}</b> &amp; thực hành </td>"
+        f"<td>3</td><td>{class_id(index)}</td></tr>"
+        for number, index in enumerate(range(offset, offset + classes))
+    )
+    return (
+        "<html><head><title>Kết quả đăng ký học</title></head><body>"
+        f'<table class="layout">{layout_rows}</table>'
+        "<table><tr><th>STT</th><th>Mã môn học</th><th>Môn học</th><th>Số TC</th>"
+        f"<th>{REGISTRATION_ID_HEADER}</th></tr>{rows}</table>"
+        f'<table class="footer">{layout_rows}</table>'
+        "</body></html>"
+    )
+
+def write_registration_page(path: str, classes: int, layout: int = 2000, offset: int = 0) -> str:
+    """
+    Ghi trang Kết quả Đăng ký học ra file.
+
+    Returns:
+        str: Đường dẫn file đã ghi
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(make_registration_page(classes, layout, offset))
+    return path
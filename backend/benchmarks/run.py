@@ -0,0 +1,177 @@
+"""
+Đo thời gian từng bước xử lý với nhiều kích thước dữ liệu và ghi kết quả ra file JSON.
+
+Các bước được đo riêng:
+    registration.parse     get_simplified_classes trên trang đăng ký có N lớp
+    schedule.parse         đọc file Thời khóa biểu N lớp (.xlsx -> Schedule), không qua cache/snapshot
+    schedule.lookup        get_detailed_classes khi Thời khóa biểu đã có trong cache
+    timetable.reference    Timetable.reference cho mọi dòng của Thời khóa biểu
+    calendar.events        dựng cây component (Events) cho N lớp
+    calendar.export_ical   Calendar.export_ical_as_str
+    ical.direct            xuất iCalendar bằng writer trực tiếp, cache fragment trống
+    ical.fragments         xuất iCalendar khi các VEVENT đã có trong cache fragment
+
+So sánh với một lần chạy trước để phát hiện chậm đi (thoát với mã 1 nếu có). Chạy từ thư mục backend:
+    python benchmarks/run.py --sizes 50,500,2000 --output results.json
+    python benchmarks/run.py --compare results.json --threshold 1.25
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import date, datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+# Đo đúng việc đọc file .xlsx, không dùng snapshot
+os.environ["SCHEDULE_SNAPSHOT_ENABLED"] = "0"
+
+from classes.subject import Timetable  # noqa: E402
+from utils.getClass import get_simplified_classes, get_detailed_classes, _parse_schedule, SCHEDULE_CACHE  # noqa: E402
+from utils.makeCalendar import make_calendar, export_calendar  # noqa: E402
+from utils.icalWriter import FRAGMENT_CACHE  # noqa: E402
+from generators import (  # noqa: E402
+    write_schedule_workbook, make_registration_page, schedule_rows, SCHEDULE_HEADERS,
+    SCHEDULE_ID_HEADER, REGISTRATION_ID_HEADER
+)
+
+CALENDAR_OPTIONS = {'start_date': date(2025, 2, 17), 'repeat': 15, 'remind_before': [15], 'practical_delay': 1, 'practical_groups': ["1", "2"]}
+
+def measure(func, rounds: int) -> tuple[list[float], object]:
+    """
+    Gọi func nhiều lần.
+
+    Returns:
+        tuple[list[float], object]: Thời gian từng lần (giây) và kết quả của lần cuối
+    """
+    times, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+def run_size(size: int, rounds: int, workdir: str) -> list[dict]:
+    """
+    Đo tất cả các bước với Thời khóa biểu và trang đăng ký có `size` lớp học phần.
+    """
+    results = []
+
+    def record(stage: str, func, items: int | None = None):
+        times, result = measure(func, rounds)
+        results.append({
+            'stage': stage,
+            'size': size,
+            'items': items if items is not None else (len(result) if hasattr(result, "__len__") else None),
+            'best_ms': min(times) * 1000,
+            'median_ms': statistics.median(times) * 1000,
+            'rounds': rounds,
+        })
+        return result
+
+    workbook = write_schedule_workbook(os.path.join(workdir, f"tkb_{size}.xlsx"), size)
+    page = make_registration_page(size, layout=200).encode("utf-8")
+
+    simple_classes = record("registration.parse", lambda: get_simplified_classes(page, REGISTRATION_ID_HEADER))
+    class_ids = [class_.id for class_ in simple_classes]
+    record("schedule.parse", lambda: _parse_schedule(workbook, SCHEDULE_ID_HEADER), items=size)
+
+    SCHEDULE_CACHE.clear()
+    get_detailed_classes(workbook, class_ids, SCHEDULE_ID_HEADER)
+    classes = record("schedule.lookup", lambda: get_detailed_classes(workbook, class_ids, SCHEDULE_ID_HEADER))
+
+    rows = schedule_rows(size)
+    header_index = next(index for index, row in enumerate(rows) if SCHEDULE_ID_HEADER in row)
+    periods = [row[SCHEDULE_HEADERS.index("Tiết")] for row in rows[header_index + 1:]]
+    timetable = Timetable(os.path.join(BACKEND_DIR, "config", "time.csv"))
+    record("timetable.reference", lambda: [timetable.reference(period) for period in periods])
+
+    events = sum(len(class_.lessons) for class_ in classes)
+    calendar = record("calendar.events", lambda: make_calendar(classes, **CALENDAR_OPTIONS), items=events)
+    record("calendar.export_ical", calendar.export_ical_as_str, items=events)
+
+    def export_cold():
+        FRAGMENT_CACHE.clear()
+        return export_calendar(classes, renderer="direct", **CALENDAR_OPTIONS)
+
+    record("ical.direct", export_cold, items=events)
+    record("ical.fragments", lambda: export_calendar(classes, renderer="direct", **CALENDAR_OPTIONS), items=events)
+    return results
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> list[str]:
+    """
+    So sánh với kết quả của một lần chạy trước (theo best_ms của cùng stage và size).
+
+    Returns:
+        list[str]: Các bước chậm hơn baseline quá threshold lần
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {(entry['stage'], entry['size']): entry for entry in json.load(file)['results']}
+
+    regressions = []
+    for entry in results:
+        old = baseline.get((entry['stage'], entry['size']))
+        if old is None or old['best_ms'] <= 0:
+            continue
+        ratio = entry['best_ms'] / old['best_ms']
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"{entry['stage']:<22} {entry['size']:>7} {old['best_ms']:>10.2f} -> {entry['best_ms']:>10.2f} ms  x{ratio:.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(f"{entry['stage']}@{entry['size']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="50,500,2000", help="Các số lớp học phần cần đo, cách nhau bởi dấu phẩy")
+    parser.add_argument("--rounds", type=int, default=3, help="Số lần đo mỗi bước")
+    parser.add_argument("--output", help="File JSON để ghi kết quả")
+    parser.add_argument("--compare", help="File JSON của một lần chạy trước để so sánh")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Tỉ lệ chậm đi tối đa cho phép khi so sánh")
+    options = parser.parse_args()
+
+    sizes = [int(size) for size in options.sizes.split(",") if size.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for entry in run_size(size, options.rounds, workdir):
+                results.append(entry)
+                print(f"{entry['stage']:<22} size={entry['size']:<7} items={entry['items']!s:<7} "
+                      f"best {entry['best_ms']:>10.2f} ms  median {entry['median_ms']:>10.2f} ms")
+
+    if options.output:
+        report = {
+            'meta': {
+                'revision': _git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'created': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                'sizes': sizes,
+                'rounds': options.rounds,
+            },
+            'results': results,
+        }
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"Đã ghi kết quả vào {options.output}")
+
+    if options.compare:
+        regressions = compare(results, options.compare, options.threshold)
+        if regressions:
+            raise SystemExit(f"Chậm hơn baseline: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
-from datetime import datetime, timedelta
-from flask import jsonify, Request
-from classes.calendar import Calendar, Events, Alarms
+from typing import Iterator
+from flask import jsonify, Request, Response
+from config import settings
 from utils.getClass import get_simplified_classes, get_detailed_classes
+from utils.executor import offload
+from utils.metrics import timed
+from utils.response import APIError
+from utils.upload import get_file_parameter
+from utils.sessionStore import get_session
+from utils import responseCache as response_cache
+from utils.makeCalendar import parse_calendar_options, export_calendar, stream_calendar
 import traceback
 import logging
 
@@ -13,23 +20,38 @@ def handle_request(request: Request, args: dict, argv: dict):
         request (Request): Request object từ Flask
         args (dict): Query parameters
         argv (dict): Request body (JSON) với các trường:
-            registered_file (str): Đường dẫn đến file đăng ký học
-            schedule_file (str): Đường dẫn đến file thời khóa biểu
+            registered_file (str): Đường dẫn đến file đăng ký học (hoặc file .html tải lên cùng tên)
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu (hoặc file .xlsx tải lên cùng tên),
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            handle (str, optional): Handle do getLessons/getLessonsCalendar trả về, thay cho registered_file
+                và schedule_file: dùng lại các lớp đã đọc, không đọc lại hai file. Nếu handle đã hết hạn mà
+                vẫn gửi kèm hai file thì đọc file như bình thường
             start_date (str): Ngày bắt đầu (YYYY-MM-DD)
             repeat (int | str, optional): Số tuần hoặc ngày kết thúc (YYYY-MM-DD). Mặc định: 15
             remind_before (list[int], optional): Danh sách số phút nhắc trước. Mặc định: [15]
             practical_delay (int, optional): Số tuần delay tiết TH/BT. Mặc định: 1
             practical_groups (list[str], optional): Danh sách nhóm TH/BT cần delay. Mặc định: []
+            renderer (str, optional): Cách xuất iCalendar, "direct" hoặc "icalendar". Mặc định: ICAL_RENDERER
+            stream (bool, optional): Gửi dần file .ics theo từng lớp (chunked), chỉ dùng với renderer "direct".
+                Mặc định: ICAL_STREAM
 
     Returns:
         Response: Các trường hợp:
             - 200: File iCalendar (.ics)
                 Content-Type: text/calendar
                 Content-Disposition: attachment; filename=calendar.ics
+                ETag: Mã băm của hai file đầu vào và các tham số (khi bật RESPONSE_CACHE_ENABLED)
+                Khi stream, dữ liệu được gửi theo chunked transfer encoding (không có Content-Length)
+            - 304: Client đã có file .ics này (If-None-Match trùng ETag), không đọc file hay tạo lịch
             - 400: Thiếu tham số hoặc không tìm thấy dữ liệu
                 {
                     "error": str  # Thông báo lỗi
                 }
+            - 404: handle không tồn tại hoặc đã hết hạn (và không gửi kèm hai file)
+                {
+                    "error": str  # Thông báo lỗi
+                }
+            - 413/415: File tải lên quá lớn hoặc sai định dạng
             - 500: Lỗi server
                 {
                     "error": str  # Thông báo lỗi
@@ -39,111 +61,115 @@ def handle_request(request: Request, args: dict, argv: dict):
         Exception: Khi có lỗi xảy ra trong quá trình xử lý
     """
     try:
+        # Các lớp đã được đọc ở request trước (getLessons) thì không cần hai file
+        handle = argv.get('handle')
+        session = get_session(handle) if handle is not None else None
+
         # Kiểm tra các tham số bắt buộc
-        required_params = ['registered_file', 'schedule_file', 'start_date']
-        missing_params = [param for param in required_params if param not in argv]
+        required_params = ['start_date'] if session is not None else ['registered_file', 'schedule_file', 'start_date']
+        missing_params = [param for param in required_params if param not in argv and param not in request.files]
+        if handle is not None and session is None and set(missing_params) & {'registered_file', 'schedule_file'}:
+            return jsonify({
+                'error': 'handle không tồn tại hoặc đã hết hạn, hãy gửi lại registered_file và schedule_file'
+            }), 404
         if missing_params:
             return jsonify({
                 'error': f'Thiếu các tham số: {", ".join(missing_params)}'
             }), 400
 
         # Lấy và kiểm tra các tham số
-        registered_file = argv['registered_file']
-        schedule_file = argv['schedule_file']
-        start_date = datetime.strptime(argv['start_date'], '%Y-%m-%d').date()
-        
-        # Tham số tùy chọn
-        repeat = argv.get('repeat', 15)
-        if isinstance(repeat, str):
-            repeat = datetime.strptime(repeat, '%Y-%m-%d').date()
-            
-        remind_before = argv.get('remind_before', [15])
-        if not isinstance(remind_before, list):
-            remind_before = [remind_before]
-            
-        practical_delay = argv.get('practical_delay', 1)  # Mặc định delay 1 tuần
-        practical_groups = argv.get('practical_groups', [])  # Danh sách nhóm TH/BT cần delay
-
-        # Lấy danh sách lớp học
-        simple_classes = get_simplified_classes(
-            file_path=registered_file,
-            id_header="Lớp môn học"
-        )
-        if not simple_classes:
+        if session is None:
+            registered_file = get_file_parameter(request, argv, 'registered_file', 'html')
+            schedule_file = get_file_parameter(request, argv, 'schedule_file', 'xlsx')
+        options = parse_calendar_options(argv)
+        renderer = argv.get('renderer')
+        if renderer not in (None, 'direct', 'icalendar'):
             return jsonify({
-                'error': 'Không tìm thấy thông tin lớp học trong file đăng ký'
+                'error': f'renderer không hợp lệ: {renderer}'
             }), 400
 
-        class_ids = [class_.id for class_ in simple_classes]
-        detailed_classes = get_detailed_classes(
-            file_path=schedule_file,
-            id_list=class_ids,
-            id_header="Mã lớp"
-        )
-        if not detailed_classes:
-            return jsonify({
-                'error': 'Không tìm thấy thông tin lớp học trong file thời khóa biểu'
-            }), 400
+        # Kết quả chỉ phụ thuộc vào nội dung file và tham số: trả 304 / dùng cache nếu được
+        cache_key = None
+        if settings.RESPONSE_CACHE_ENABLED:
+            with timed("getCalendar.cache"):
+                if session is None:
+                    cache_key = response_cache.calendar_key(registered_file, schedule_file, options)
+                elif session.registered_digest is not None:
+                    cache_key = response_cache.calendar_key_from_digests(
+                        session.registered_digest, session.schedule_digest, options,
+                        session.id_header, session.schedule_id_header
+                    )
+                cached = None
+                if cache_key:
+                    etag = response_cache.make_etag(cache_key)
+                    if request.if_none_match.contains(cache_key):
+                        return '', 304, {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+                    cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached, 200, _calendar_headers(etag)
 
-        # Tạo lịch
-        calendar = Calendar()
-        for class_ in detailed_classes:
-            # Tách thành 2 danh sách: tiết lý thuyết và tiết TH/BT
-            theory_lessons = []
-            practical_lessons = []
-            
-            for lesson in class_.lessons:
-                # Kiểm tra nếu là tiết TH/BT dựa theo nhóm được chọn
-                if lesson.group in practical_groups:
-                    practical_lessons.append(lesson)
-                else:
-                    theory_lessons.append(lesson)
-            
-            # Tạo events cho tiết lý thuyết
-            if theory_lessons:
-                class_theory = class_.__class__(
-                    id=class_.id,
-                    subject=class_.subject,
-                    teacher=class_.teacher
-                )
-                class_theory.lessons = theory_lessons
-                
-                theory_events = Events(
-                    class_=class_theory,
-                    start_first_week=start_date,
-                    repeat=repeat
+        if session is not None:
+            detailed_classes = list(session.classes)
+        else:
+            # Lấy danh sách lớp học
+            with timed("getCalendar.registration"):
+                simple_classes = offload(
+                    get_simplified_classes,
+                    file_path=registered_file,
+                    id_header="Lớp môn học"
                 )
-                if remind_before:
-                    theory_events.add_alarms(Alarms(remind_before))
-                calendar.add_events(theory_events)
-            
-            # Tạo events cho tiết TH/BT với delay
-            if practical_lessons:
-                class_practical = class_.__class__(
-                    id=class_.id,
-                    subject=class_.subject,
-                    teacher=class_.teacher
-                )
-                class_practical.lessons = practical_lessons
-                
-                practical_start = start_date + timedelta(weeks=practical_delay)
-                practical_events = Events(
-                    class_=class_practical,
-                    start_first_week=practical_start,
-                    repeat=repeat
+            if not simple_classes:
+                return jsonify({
+                    'error': 'Không tìm thấy thông tin lớp học trong file đăng ký'
+                }), 400
+
+            class_ids = [class_.id for class_ in simple_classes]
+            with timed("getCalendar.schedule"):
+                detailed_classes = offload(
+                    get_detailed_classes,
+                    file_path=schedule_file,
+                    id_list=class_ids,
+                    id_header="Mã lớp"
                 )
-                if remind_before:
-                    practical_events.add_alarms(Alarms(remind_before))
-                calendar.add_events(practical_events)
+            if not detailed_classes:
+                return jsonify({
+                    'error': 'Không tìm thấy thông tin lớp học trong file thời khóa biểu'
+                }), 400
 
-        # Trả về dữ liệu iCal
-        return calendar.export_ical_as_str(), 200, {
-            'Content-Type': 'text/calendar',
-            'Content-Disposition': 'attachment; filename=calendar.ics'
-        }
+        headers = _calendar_headers(response_cache.make_etag(cache_key) if cache_key else None)
+        stream = argv.get('stream', settings.ICAL_STREAM)
+        if stream and (renderer or settings.ICAL_RENDERER) == 'direct':
+            # Gửi dần từng phần; lỗi phát sinh giữa chừng chỉ có thể được ghi log
+            return Response(_log_errors(stream_calendar(detailed_classes, **options)), 200, headers)
 
+        # Tạo lịch và trả về dữ liệu iCal
+        with timed("getCalendar.render"):
+            data = offload(export_calendar, detailed_classes, renderer=renderer, **options).encode('utf-8')
+        if cache_key:
+            response_cache.put(cache_key, data)
+        return data, 200, headers
+
+    except APIError:
+        raise
     except Exception:
         logging.error(traceback.format_exc())
         return jsonify({
             'error': 'An internal error has occurred!'
-        }), 500 
\ No newline at end of file
+        }), 500
+
+def _calendar_headers(etag: str | None) -> dict:
+    headers = {
+        'Content-Type': 'text/calendar',
+        'Content-Disposition': 'attachment; filename=calendar.ics'
+    }
+    if etag:
+        headers['ETag'] = etag
+        headers['Cache-Control'] = 'private, no-cache'
+    return headers
+
+def _log_errors(chunks: Iterator[str]) -> Iterator[str]:
+    try:
+        yield from chunks
+    except Exception:
+        logging.error(traceback.format_exc())
+        raise
@@ -0,0 +1,71 @@
+import io
+import logging
+import traceback
+from flask import jsonify, Request
+from utils.batchCalendar import generate_calendars, write_zip
+from utils.makeCalendar import parse_calendar_options
+
+def handle_request(request: Request, args: dict, argv: dict):
+    """
+    Tạo file lịch iCalendar cho nhiều file đăng ký học dùng chung một file thời khóa biểu.
+
+    Args:
+        request (Request): Request object từ Flask
+        args (dict): Query parameters
+        argv (dict): Request body (JSON) với các trường:
+            registered_files (list[str]): Danh sách đường dẫn đến các file đăng ký học
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu,
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            start_date (str): Ngày bắt đầu (YYYY-MM-DD)
+            repeat, remind_before, practical_delay, practical_groups: Giống getCalendar
+
+    Returns:
+        Response: Các trường hợp:
+            - 200: File zip chứa các file .ics (một file cho mỗi file đăng ký)
+                Content-Type: application/zip
+                Content-Disposition: attachment; filename=calendars.zip
+                X-Batch-Errors: Số file đăng ký bị lỗi, chi tiết trong errors.json của file zip
+            - 400: Thiếu tham số
+                {
+                    "error": str  # Thông báo lỗi
+                }
+            - 500: Lỗi server
+                {
+                    "error": str  # Thông báo lỗi
+                }
+    """
+    try:
+        # Kiểm tra các tham số bắt buộc
+        required_params = ['registered_files', 'schedule_file', 'start_date']
+        missing_params = [param for param in required_params if param not in argv]
+        if missing_params:
+            return jsonify({
+                'error': f'Thiếu các tham số: {", ".join(missing_params)}'
+            }), 400
+
+        registered_files = argv['registered_files']
+        if not isinstance(registered_files, list) or not registered_files:
+            return jsonify({
+                'error': 'registered_files phải là danh sách đường dẫn không rỗng'
+            }), 400
+
+        items = generate_calendars(
+            schedule_file=argv['schedule_file'],
+            registered_files=registered_files,
+            options=parse_calendar_options(argv)
+        )
+
+        buffer = io.BytesIO()
+        write_zip(items, buffer)
+        error_count = sum(1 for item in items if item.error)
+        return buffer.getvalue(), 200, {
+            'Content-Type': 'application/zip',
+            'Content-Disposition': 'attachment; filename=calendars.zip',
+            'X-Batch-Errors': str(error_count)
+        }
+
+    except Exception:
+        logging.error(traceback.format_exc())
+        return jsonify({
+            'error': 'An internal error has occurred!'
+        }), 500
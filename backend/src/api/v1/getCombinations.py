@@ -0,0 +1,108 @@
+from flask import jsonify, current_app as app, Request
+from utils.getClass import get_schedule, PERIOD_REFERENCE
+from utils.autoScheduler import find_combinations, Preferences, Option, COMMON_GROUPS
+from utils.serialize import class_to_dict, lesson_to_dict
+from utils.metrics import timed
+from utils.response import APIError
+from utils.upload import get_file_parameter
+
+MAX_TOP_K = 100
+
+def _option_to_dict(class_, option: Option) -> dict:
+    info = class_to_dict(class_)
+    info['group'] = option.group
+    info['lessons'] = [
+        lesson_to_dict(lesson) for lesson in class_.lessons
+        if option.group is None or not isinstance(lesson.group, str) or lesson.group in COMMON_GROUPS or lesson.group == option.group
+    ]
+    return info
+
+def handle_request(request: Request, args: dict, argv: dict):
+    """
+    Tự động xếp lịch: tìm các cách chọn lớp học phần không trùng giờ cho một danh sách môn học.
+
+    Args:
+        request (Request): Request object từ Flask
+        args (dict): Query parameters
+        argv (dict): Request body (JSON) với các trường:
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu (hoặc file .xlsx tải lên cùng tên),
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            subject_ids (list[str]): Mã các môn học (Mã học phần) cần xếp
+            schedule_id_header (str, optional): Tên cột chứa Mã Lớp học phần trong thời khóa biểu. Mặc định: "Mã lớp"
+            top_k (int, optional): Số phương án tốt nhất cần trả về (tối đa 100). Mặc định: 10
+            preferences (dict, optional): Trọng số ưu tiên (xem utils.autoScheduler.Preferences):
+                free_day, early_start, gap, avoid_day (float) và avoid_days (list[int], 0: Thứ 2, ..., 6: Chủ nhật)
+
+    Returns:
+        Response: JSON response với các trường hợp:
+            - 200: Thành công
+                {
+                    "candidates": [
+                        {
+                            "score": float,  # Điểm theo ưu tiên, càng cao càng tốt
+                            "classes": [...]  # Giống getLessons, thêm "group" (nhóm TH/BT đã chọn hoặc null),
+                                              # chỉ gồm các buổi học của nhóm đã chọn
+                        }
+                    ],
+                    "complete": bool,  # False nếu dừng sớm vì vượt quá SCHEDULER_MAX_NODES
+                    "nodes": int  # Số nút đã duyệt
+                }
+            - 400: Thiếu tham số hoặc tham số không hợp lệ
+            - 404: Có môn học không có lớp học phần nào trong thời khóa biểu
+                {
+                    "error": str,  # Thông báo lỗi
+                    "missing_subjects": list[str]
+                }
+            - 413/415: File tải lên quá lớn hoặc sai định dạng
+            - 500: Lỗi server
+                {
+                    "error": str  # Thông báo lỗi
+                }
+
+    Raises:
+        Exception: Khi có lỗi xảy ra trong quá trình xử lý
+    """
+    try:
+        schedule_file = get_file_parameter(request, argv, 'schedule_file', 'xlsx')
+        subject_ids = argv.get('subject_ids')
+        if schedule_file is None or not isinstance(subject_ids, list) or not subject_ids:
+            raise APIError('Cần schedule_file và subject_ids (danh sách mã học phần không rỗng)')
+        schedule_id_header = argv.get('schedule_id_header', 'Mã lớp')
+        top_k = argv.get('top_k', 10)
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or not 0 < top_k <= MAX_TOP_K:
+            raise APIError(f'top_k phải là số nguyên từ 1 đến {MAX_TOP_K}')
+        try:
+            preferences = Preferences.from_dict(argv.get('preferences') or {})
+        except (TypeError, ValueError) as error:
+            raise APIError(str(error))
+
+        with timed("getCombinations.schedule"):
+            schedule = get_schedule(schedule_file, schedule_id_header)
+            classes = schedule.get_classes(schedule.subject_class_ids(subject_ids))
+
+        with timed("getCombinations.search"):
+            result = find_combinations(classes, subject_ids, PERIOD_REFERENCE, preferences, top_k)
+        if result.missing_subjects:
+            return jsonify({
+                'error': 'Không tìm thấy lớp học phần của các môn học',
+                'missing_subjects': result.missing_subjects
+            }), 404
+
+        classes_by_id = {class_.id: class_ for class_ in classes}
+        return jsonify({
+            'candidates': [
+                {
+                    'score': candidate.score,
+                    'classes': [_option_to_dict(classes_by_id[option.class_id], option) for option in candidate.options]
+                }
+                for candidate in result.candidates
+            ],
+            'complete': result.complete,
+            'nodes': result.nodes
+        })
+
+    except APIError:
+        raise
+    except Exception as e:
+        app.logger.error("Error finding combinations: %s", e)
+        return jsonify({'error': 'An internal error has occurred!'}), 500
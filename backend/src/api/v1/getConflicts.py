@@ -0,0 +1,125 @@
+from datetime import datetime, time
+from flask import jsonify, current_app as app, Request
+from utils.getClass import get_simplified_classes, get_detailed_classes
+from utils.conflicts import Booking, TimetableIndex
+from utils.serialize import class_to_dict, lesson_to_dict
+from utils.executor import offload
+from utils.metrics import timed
+from utils.response import APIError
+from utils.upload import get_file_parameter
+
+def _parse_time(value) -> time:
+    try:
+        return datetime.strptime(value, '%H:%M').time()
+    except (TypeError, ValueError):
+        raise APIError(f'Giờ không hợp lệ (HH:MM): {value!r}')
+
+def _parse_free_checks(checks) -> list[tuple[int, time, time]]:
+    """
+    Đọc danh sách khoảng thời gian cần kiểm tra.
+
+    Raises:
+        APIError: 400 nếu dữ liệu không hợp lệ
+    """
+    if not isinstance(checks, list):
+        raise APIError('check_free phải là danh sách')
+    parsed = []
+    for check in checks:
+        if not isinstance(check, dict) or not isinstance(check.get('weekday'), int) or not 0 <= check['weekday'] <= 6:
+            raise APIError(f'Khoảng thời gian không hợp lệ: {check!r}')
+        start, end = _parse_time(check.get('start')), _parse_time(check.get('end'))
+        if start >= end:
+            raise APIError(f'Giờ bắt đầu phải trước giờ kết thúc: {check!r}')
+        parsed.append((check['weekday'], start, end))
+    return parsed
+
+def _booking_to_dict(booking: Booking) -> dict:
+    return {'class_id': booking.class_.id, **lesson_to_dict(booking.lesson)}
+
+def handle_request(request: Request, args: dict, argv: dict):
+    """
+    Tìm các buổi học trùng giờ giữa các lớp đã đăng ký.
+
+    Args:
+        request (Request): Request object từ Flask
+        args (dict): Query parameters
+        argv (dict): Request body (JSON) với các trường:
+            registered_file (str): Đường dẫn đến file đăng ký học (hoặc file .html tải lên cùng tên)
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu (hoặc file .xlsx tải lên cùng tên),
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            id_header (str, optional): Tên cột chứa Mã Lớp học phần trong file đăng ký. Mặc định: "Lớp môn học"
+            schedule_id_header (str, optional): Tên cột chứa Mã Lớp học phần trong thời khóa biểu. Mặc định: "Mã lớp"
+            check_free (list[dict], optional): Các khoảng thời gian cần kiểm tra có trống không,
+                mỗi phần tử gồm weekday (0-6), start và end (HH:MM)
+
+    Returns:
+        Response: JSON response với các trường hợp:
+            - 200: Thành công
+                {
+                    "classes": [...],  # Giống getLessons
+                    "conflicts": [
+                        {
+                            "weekday": int,  # 0-6 (0: Thứ 2, 6: Chủ nhật)
+                            "first": {"class_id": str, ...},  # Buổi học bắt đầu trước (các trường giống getLessons)
+                            "second": {"class_id": str, ...}  # Buổi học bắt đầu sau
+                        }
+                    ],
+                    "free": [bool]  # Chỉ có khi gửi check_free, theo thứ tự của check_free
+                }
+            - 400: check_free không hợp lệ
+            - 404: Không tìm thấy dữ liệu
+                {
+                    "error": str  # Thông báo lỗi
+                }
+            - 413/415: File tải lên quá lớn hoặc sai định dạng
+            - 500: Lỗi server
+                {
+                    "error": str  # Thông báo lỗi
+                }
+
+    Raises:
+        Exception: Khi có lỗi xảy ra trong quá trình xử lý
+    """
+    try:
+        registered_file = get_file_parameter(request, argv, 'registered_file', 'html')
+        schedule_file = get_file_parameter(request, argv, 'schedule_file', 'xlsx')
+        id_header = argv.get('id_header', 'Lớp môn học')
+        schedule_id_header = argv.get('schedule_id_header', 'Mã lớp')
+        free_checks = _parse_free_checks(argv['check_free']) if 'check_free' in argv else None
+
+        # Lấy danh sách lớp học từ file đăng ký
+        with timed("getConflicts.registration"):
+            simple_classes = offload(get_simplified_classes, registered_file, id_header)
+        if not simple_classes:
+            return jsonify({'error': 'Không tìm thấy lớp học nào'}), 404
+
+        # Lấy thông tin chi tiết các lớp từ TKB
+        with timed("getConflicts.schedule"):
+            detailed_classes = offload(get_detailed_classes, schedule_file, [c.id for c in simple_classes], schedule_id_header)
+        if not detailed_classes:
+            return jsonify({'error': 'Không tìm thấy thông tin chi tiết lớp học'}), 404
+
+        with timed("getConflicts.index"):
+            index = TimetableIndex(detailed_classes)
+            conflicts = index.conflicts()
+
+        result = {
+            'classes': [class_to_dict(class_) for class_ in detailed_classes],
+            'conflicts': [
+                {
+                    'weekday': conflict.weekday,
+                    'first': _booking_to_dict(conflict.first),
+                    'second': _booking_to_dict(conflict.second)
+                }
+                for conflict in conflicts
+            ]
+        }
+        if free_checks is not None:
+            result['free'] = [index.is_free(weekday, start, end) for weekday, start, end in free_checks]
+        return jsonify(result)
+
+    except APIError:
+        raise
+    except Exception as e:
+        app.logger.error("Error finding conflicts: %s", e)
+        return jsonify({'error': 'An internal error has occurred!'}), 500
@@ -1,5 +1,11 @@
 from flask import jsonify, current_app as app, Request
-from src.utils.getClass import get_simplified_classes, get_detailed_classes
+from utils.getClass import get_simplified_classes, get_detailed_classes
+from utils.serialize import lessons_payload, parse_fields, LAYOUTS
+from utils.executor import offload
+from utils.metrics import timed
+from utils.response import APIError, json_response
+from utils.upload import get_file_parameter
+from utils.sessionStore import create_session
 
 def handle_request(request: Request, args: dict, argv: dict):
     """
@@ -8,12 +14,21 @@ def handle_request(request: Request, args: dict, argv: dict):
     Args:
         request (Request): Request object từ Flask
         args (dict): Query parameters
-        argv (dict): Request body (JSON)
+        argv (dict): Request body (JSON) với các trường:
+            registered_file (str): Đường dẫn đến file đăng ký học (hoặc file .html tải lên cùng tên)
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu (hoặc file .xlsx tải lên cùng tên),
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            id_header (str, optional): Tên cột chứa Mã Lớp học phần. Mặc định: "Lớp môn học"
+            fields (list[str] | str, optional): Chỉ lấy các trường này (xem utils.serialize.parse_fields),
+                ví dụ ["id", "lessons.weekday", "lessons.period"]. Mặc định: mọi trường
+            layout (str, optional): "nested" hoặc "columnar" (xem utils.serialize.classes_to_columns).
+                Mặc định: "nested"
 
     Returns:
         Response: JSON response với các trường hợp:
-            - 200: Thành công
+            - 200: Thành công (layout "nested")
                 {
+                    "handle": str,  # Gửi cho getCalendar thay cho hai file để không phải đọc lại (không có nếu SESSION_TTL_SECONDS = 0)
                     "classes": [
                         {
                             "id": str,  # Mã lớp học phần
@@ -34,10 +49,20 @@ def handle_request(request: Request, args: dict, argv: dict):
                         }
                     ]
                 }
+            - 200: Thành công (layout "columnar")
+                {
+                    "layout": "columnar",
+                    "handle": str,
+                    "classes": {"id": [int], "subject.id": [int], ...},  # Chỉ số trong strings
+                    "lessons": {"class": [int], "weekday": [int], "period": [int], ...},
+                    "strings": [str]
+                }
+            - 400: fields hoặc layout không hợp lệ
             - 404: Không tìm thấy dữ liệu
                 {
                     "error": str  # Thông báo lỗi
                 }
+            - 413/415: File tải lên quá lớn hoặc sai định dạng
             - 500: Lỗi server
                 {
                     "error": str  # Thông báo lỗi
@@ -47,47 +72,41 @@ def handle_request(request: Request, args: dict, argv: dict):
         Exception: Khi có lỗi xảy ra trong quá trình xử lý
     """
     try:
-        registered_file = argv.get('registered_file')
-        schedule_file = argv.get('schedule_file')
+        registered_file = get_file_parameter(request, argv, 'registered_file', 'html')
+        schedule_file = get_file_parameter(request, argv, 'schedule_file', 'xlsx')
         id_header = argv.get('id_header', 'Lớp môn học')
+        layout = argv.get('layout', 'nested')
+        if layout not in LAYOUTS:
+            raise APIError(f'layout không hợp lệ: {layout!r}')
+        try:
+            class_fields, lesson_fields = parse_fields(argv.get('fields'))
+        except ValueError as error:
+            raise APIError(str(error))
         
         # Lấy danh sách lớp học từ file đăng ký
-        simple_classes = get_simplified_classes(registered_file, id_header)
+        with timed("getLessons.registration"):
+            simple_classes = offload(get_simplified_classes, registered_file, id_header)
         if not simple_classes:
             return jsonify({'error': 'Không tìm thấy lớp học nào'}), 404
             
         # Lấy thông tin chi tiết các lớp từ TKB
-        detailed_classes = get_detailed_classes(schedule_file, [c.id for c in simple_classes], id_header)
+        with timed("getLessons.schedule"):
+            detailed_classes = offload(get_detailed_classes, schedule_file, [c.id for c in simple_classes], id_header)
         if not detailed_classes:
             return jsonify({'error': 'Không tìm thấy thông tin chi tiết lớp học'}), 404
 
-        # Tạo response chứa thông tin các tiết học
-        lessons_info = []
-        for class_ in detailed_classes:
-            class_info = {
-                'id': class_.id,
-                'subject': {
-                    'id': class_.subject.id,
-                    'name': class_.subject.name
-                },
-                'teacher': class_.teacher,
-                'lessons': []
-            }
-            
-            for lesson in class_.lessons:
-                lesson_info = {
-                    'weekday': lesson.weekday,
-                    'period': str(lesson.period),
-                    'location': lesson.location,
-                    'group': lesson.group,
-                    'is_practical': any(keyword in lesson.group for keyword in ["TH", "BT"])
-                }
-                class_info['lessons'].append(lesson_info)
-                
-            lessons_info.append(class_info)
-            
-        return jsonify({'classes': lessons_info})
+        # Giữ các lớp đã đọc cho getCalendar
+        handle = create_session(detailed_classes, registered_file, schedule_file, id_header, id_header)
+
+        # Tạo response chứa thông tin các tiết học, mã hóa JSON một lần
+        with timed("getLessons.serialize"):
+            payload = lessons_payload(detailed_classes, layout, class_fields, lesson_fields)
+            if handle is not None:
+                payload['handle'] = handle
+            return json_response(payload)
         
+    except APIError:
+        raise
     except Exception as e:
-        app.logger.error(f"Error getting lessons info: {str(e)}")
+        app.logger.error("Error getting lessons info: %s", e)
         return jsonify({'error': 'An internal error has occurred!'}), 500
\ No newline at end of file
@@ -0,0 +1,109 @@
+from flask import jsonify, current_app as app, Request
+from config import settings
+from utils.getClass import get_simplified_classes, get_detailed_classes
+from utils.serialize import lessons_payload, parse_fields, LAYOUTS
+from utils.executor import offload
+from utils.metrics import timed
+from utils.response import APIError, json_response
+from utils.upload import get_file_parameter
+from utils.sessionStore import create_session
+from utils import responseCache as response_cache
+from utils.makeCalendar import parse_calendar_options, export_calendar
+
+def handle_request(request: Request, args: dict, argv: dict):
+    """
+    Lấy thông tin các tiết học và file lịch iCalendar trong một request, chỉ đọc hai file một lần
+    (thay cho getLessons rồi getCalendar).
+
+    Args:
+        request (Request): Request object từ Flask
+        args (dict): Query parameters
+        argv (dict): Request body (JSON) với các trường:
+            registered_file (str): Đường dẫn đến file đăng ký học (hoặc file .html tải lên cùng tên)
+            schedule_file (str | list): Đường dẫn đến file thời khóa biểu (hoặc file .xlsx tải lên cùng tên),
+                hoặc danh sách file/sheet ({"file": str, "sheet": int | str | "*"}) được đọc và gộp lại
+            id_header (str, optional): Tên cột chứa Mã Lớp học phần trong file đăng ký. Mặc định: "Lớp môn học"
+            schedule_id_header (str, optional): Tên cột chứa Mã Lớp học phần trong thời khóa biểu. Mặc định: "Mã lớp"
+            fields (list[str] | str, optional): Như getLessons
+            layout (str, optional): Như getLessons. Mặc định: "nested"
+            start_date (str, optional): Ngày bắt đầu (YYYY-MM-DD). Nếu không có thì không tạo lịch,
+                có thể gọi getCalendar với handle sau khi người dùng chọn ngày
+            repeat, remind_before, practical_delay, practical_groups, renderer (optional): Như getCalendar
+
+    Returns:
+        Response: JSON response với các trường hợp:
+            - 200: Thành công
+                {
+                    "classes": [...],  # Như getLessons (hoặc các mảng của layout "columnar")
+                    "handle": str,  # Như getLessons (không có nếu SESSION_TTL_SECONDS = 0)
+                    "calendar": str  # Nội dung file .ics (chỉ có khi gửi start_date)
+                }
+            - 400: Tham số không hợp lệ
+            - 404: Không tìm thấy dữ liệu
+                {
+                    "error": str  # Thông báo lỗi
+                }
+            - 413/415: File tải lên quá lớn hoặc sai định dạng
+            - 500: Lỗi server
+                {
+                    "error": str  # Thông báo lỗi
+                }
+
+    Raises:
+        Exception: Khi có lỗi xảy ra trong quá trình xử lý
+    """
+    try:
+        registered_file = get_file_parameter(request, argv, 'registered_file', 'html')
+        schedule_file = get_file_parameter(request, argv, 'schedule_file', 'xlsx')
+        id_header = argv.get('id_header', 'Lớp môn học')
+        schedule_id_header = argv.get('schedule_id_header', 'Mã lớp')
+        layout = argv.get('layout', 'nested')
+        if layout not in LAYOUTS:
+            raise APIError(f'layout không hợp lệ: {layout!r}')
+        renderer = argv.get('renderer')
+        if renderer not in (None, 'direct', 'icalendar'):
+            raise APIError(f'renderer không hợp lệ: {renderer!r}')
+        try:
+            class_fields, lesson_fields = parse_fields(argv.get('fields'))
+            options = parse_calendar_options(argv) if 'start_date' in argv else None
+        except ValueError as error:
+            raise APIError(str(error))
+
+        # Đọc hai file một lần cho cả danh sách tiết học và file lịch
+        with timed("getLessonsCalendar.registration"):
+            simple_classes = offload(get_simplified_classes, registered_file, id_header)
+        if not simple_classes:
+            return jsonify({'error': 'Không tìm thấy lớp học nào'}), 404
+
+        with timed("getLessonsCalendar.schedule"):
+            detailed_classes = offload(get_detailed_classes, schedule_file, [c.id for c in simple_classes], schedule_id_header)
+        if not detailed_classes:
+            return jsonify({'error': 'Không tìm thấy thông tin chi tiết lớp học'}), 404
+
+        handle = create_session(detailed_classes, registered_file, schedule_file, id_header, schedule_id_header)
+
+        with timed("getLessonsCalendar.serialize"):
+            payload = lessons_payload(detailed_classes, layout, class_fields, lesson_fields)
+        if handle is not None:
+            payload['handle'] = handle
+
+        if options is not None:
+            # Dùng chung cache .ics với getCalendar
+            cache_key = response_cache.calendar_key(
+                registered_file, schedule_file, options, id_header, schedule_id_header
+            ) if settings.RESPONSE_CACHE_ENABLED else None
+            data = response_cache.get(cache_key) if cache_key else None
+            if data is None:
+                with timed("getLessonsCalendar.render"):
+                    data = offload(export_calendar, detailed_classes, renderer=renderer, **options).encode('utf-8')
+                if cache_key:
+                    response_cache.put(cache_key, data)
+            payload['calendar'] = data.decode('utf-8')
+
+        return json_response(payload)
+
+    except APIError:
+        raise
+    except Exception as e:
+        app.logger.error("Error getting lessons and calendar: %s", e)
+        return jsonify({'error': 'An internal error has occurred!'}), 500
@@ -0,0 +1,241 @@
+"""
+Chế độ phục vụ ASGI (async) cho cùng các route /api/v<version>/<name> của app Flask.
+
+Event loop chỉ nhận request, đọc body và gửi response. Việc xử lý của app Flask (WSGI)
+chạy trên một thread pool giới hạn ASYNC_MAX_CONCURRENCY luồng; các bước tốn CPU bên trong
+handler có thể được đẩy tiếp sang process pool qua CPU_EXECUTOR (utils/executor.py).
+Khi số request đang xử lý và đang chờ vượt quá ASYNC_MAX_CONCURRENCY + ASYNC_MAX_QUEUE,
+request mới được trả về 503 ngay mà không phải chờ. Body lớn hơn MAX_CONTENT_LENGTH bị trả về 413
+(ngay từ Content-Length nếu có, hoặc ngay khi số byte đã nhận vượt quá giới hạn).
+
+Chạy bằng một server ASGI bất kỳ, ví dụ (từ thư mục src):
+    uvicorn asgi:application
+"""
+import io
+import sys
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
+from utils.executor import shutdown_executor
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+class BodyTooLarge(Exception):
+    """
+    Body của request lớn hơn giới hạn cho phép.
+    """
+
+def _build_environ(scope: dict, body: bytes) -> dict:
+    """
+    Tạo WSGI environ (PEP 3333) từ scope của một HTTP request ASGI.
+
+    Args:
+        scope (dict): Scope ASGI (type "http")
+        body (bytes): Toàn bộ body của request
+
+    Returns:
+        dict: WSGI environ
+    """
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    client = scope.get("client")
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0] if client else "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+class AsgiApp:
+    """
+    Bọc một app WSGI thành app ASGI, xử lý request trên thread pool có giới hạn.
+
+    Attributes:
+        app: App WSGI (ví dụ: Flask app).
+        max_concurrency (int): Số request được xử lý đồng thời.
+        max_queue (int): Số request được phép chờ khi đã đủ max_concurrency.
+        max_body_bytes (int): Kích thước body tối đa (byte), mặc định MAX_CONTENT_LENGTH.
+    """
+    def __init__(
+        self,
+        app,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+        max_body_bytes: int | None = None
+    ):
+        self.app = app
+        self.max_concurrency = max_concurrency or settings.ASYNC_MAX_CONCURRENCY
+        self.max_queue = settings.ASYNC_MAX_QUEUE if max_queue is None else max_queue
+        self.max_body_bytes = settings.MAX_CONTENT_LENGTH if max_body_bytes is None else max_body_bytes
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="wsgi")
+        self._pending = 0  # request đang xử lý hoặc đang chờ (chỉ đổi trên event loop)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+
+    async def _handle_lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._pool.shutdown(wait=False)
+                shutdown_executor(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_http(self, scope: dict, receive, send) -> None:
+        if self._pending >= self.max_concurrency + self.max_queue:
+            logger.warning("Request queue is full (%d pending), rejecting %s", self._pending, scope['path'])
+            await _send_simple(send, 503, b'{"error": "Server is busy, please try again later"}')
+            return
+
+        self._pending += 1
+        try:
+            try:
+                body = await _read_body(receive, _content_length(scope), self.max_body_bytes)
+            except BodyTooLarge:
+                logger.warning("Request body is larger than %d bytes, rejecting %s", self.max_body_bytes, scope['path'])
+                await _send_simple(send, 413, b'{"error": "Request body is too large"}')
+                return
+            await self._run_wsgi(_build_environ(scope, body), send)
+        finally:
+            self._pending -= 1
+
+    async def _run_wsgi(self, environ: dict, send) -> None:
+        loop = asyncio.get_running_loop()
+        response: dict = {}
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info=None):
+            if exc_info and response.get("started"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"], response["headers"] = status, headers
+            return response.setdefault("written", []).append
+
+        def call_app():
+            result = self.app(environ, start_response)
+            chunks = iter(result)
+            # start_response có thể được gọi muộn, tới khi lấy phần đầu tiên của body
+            first = next(chunks, _DONE)
+            return result, chunks, first
+
+        try:
+            result, chunks, chunk = await loop.run_in_executor(self._pool, call_app)
+        except Exception:
+            logger.exception("Unhandled error in WSGI app")
+            await _send_simple(send, 500, b'{"error": "An internal error has occurred!"}')
+            return
+
+        try:
+            response["started"] = True
+            await send({
+                "type": "http.response.start",
+                "status": int(response["status"].split(" ", 1)[0]),
+                "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response["headers"]],
+            })
+            for written in response.get("written", []):
+                await send({"type": "http.response.body", "body": written, "more_body": True})
+            while chunk is not _DONE:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await loop.run_in_executor(self._pool, next, chunks, _DONE)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except Exception:
+            # Response đã bắt đầu gửi, chỉ có thể ghi log và ngắt kết nối
+            logger.exception("Error while streaming response")
+            raise
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                await loop.run_in_executor(self._pool, close)
+
+def _content_length(scope: dict) -> int | None:
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+async def _read_body(receive, content_length: int | None, limit: int) -> bytes:
+    """
+    Đọc body của request, dừng ngay khi vượt quá giới hạn.
+
+    Args:
+        receive: Hàm receive của ASGI
+        content_length (int | None): Giá trị header Content-Length (nếu có)
+        limit (int): Kích thước tối đa (byte)
+
+    Returns:
+        bytes: Toàn bộ body
+
+    Raises:
+        BodyTooLarge: Nếu Content-Length hoặc số byte đã nhận lớn hơn limit
+    """
+    if content_length is not None and content_length > limit:
+        raise BodyTooLarge()
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        if len(body) > limit:
+            raise BodyTooLarge()
+        if not message.get("more_body", False):
+            break
+    return bytes(body)
+
+async def _send_simple(send, status: int, body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body, "more_body": False})
+
+def create_application():
+    """
+    Tạo app ASGI từ app Flask trong main.py.
+
+    Returns:
+        AsgiApp: App ASGI
+    """
+    from main import app
+    return AsgiApp(app)
+
+application = create_application()
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Chế độ ASGI cần một server ASGI, ví dụ: pip install uvicorn")
+    uvicorn.run(application)
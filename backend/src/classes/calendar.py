@@ -1,7 +1,8 @@
 import os
-from subject import DetailedClass, Lesson
+from classes.subject import DetailedClass, Lesson
 from datetime import timedelta, date, datetime
 from icalendar import Event, Alarm, Calendar as ICalendar
+from utils.metrics import timed, count
 
 class Alarms(list[Alarm]):
     """
@@ -20,17 +21,16 @@ class Alarms(list[Alarm]):
         self.append(alarm)
         return self
     
-    def __new__(cls, remind_before: int | list[int]):
+    def __init__(self, remind_before: int | list[int]):
         """
         Args:
             remind_before (int | list[int]): Số phút trước khi sự kiện diễn ra để nhắc nhở.
         """
-        self = object().__new__(cls)
+        super().__init__()
         if not isinstance(remind_before, list):
             remind_before = [remind_before]
         for remind in remind_before:
             self.add_alarm(remind)
-        return self
 
 def _get_date_from_weekday(date_in_week: date, weekday: int) -> date:
     """
@@ -64,11 +64,29 @@ def _get_date_from_weekday(date_in_week: date, weekday: int) -> date:
     days_diff = weekday - current_weekday
     return date_in_week + timedelta(days=days_diff)
 
+def describe_lesson(class_: DetailedClass, lesson: Lesson) -> str:
+    """
+    Nội dung mô tả (DESCRIPTION) của sự kiện ứng với một buổi học.
+
+    Args:
+        class_ (DetailedClass): Lớp học đầy đủ thông tin
+        lesson (Lesson): Buổi học
+
+    Returns:
+        str: Nội dung mô tả
+    """
+    return f"\
+                Mã LHP: {class_.id}\n\
+                Giảng dạy: {class_.teacher}\
+                Giảng đường: {lesson.location}\n\
+                Nhóm: {lesson.group}\n\
+            "
+
 class Events(list[Event]):
     """
     Lớp đại diện cho danh sách các sự kiện (events).
     """
-    def __new__(cls, class_: DetailedClass, lessons: list[Lesson], start_first_week: date, repeat: int | date = 1):
+    def __init__(self, class_: DetailedClass, lessons: list[Lesson], start_first_week: date, repeat: int | date = 1):
         """
         Args:
             class_ (DetailedClass): Lớp học đầy đủ thông tin
@@ -76,18 +94,13 @@ class Events(list[Event]):
             start_first_week (date): Ngày bắt đầu của tuần học đầu tiên
             repeat (int | date, optional): Số lần lặp lại hoặc ngày kết thúc
         """
-        self = object().__new__(cls)
+        super().__init__()
         for lesson in lessons:
             weekday = lesson.weekday
             event_date = _get_date_from_weekday(start_first_week, weekday)
             event_start_datetime = datetime.combine(event_date, lesson.period.start)
             event_end_datetime = datetime.combine(event_date, lesson.period.end)
-            description = f"\
-                Mã LHP: {class_.id}\n\
-                Giảng dạy: {class_.teacher}\
-                Giảng đường: {lesson.location}\n\
-                Nhóm: {lesson.group}\n\
-            "
+            description = describe_lesson(class_, lesson)
 
             event = Event()
             event.add('summary', class_.subject.name)
@@ -101,7 +114,7 @@ class Events(list[Event]):
                 event.add('rrule', {'freq': 'weekly', 'until': repeat})
 
             self.append(event)
-        return self
+        count("ical_events_total", len(self), renderer="icalendar")
     
     def add_alarms(self, alarms: Alarms | list[Alarm]):
         """
@@ -137,7 +150,8 @@ class Calendar(ICalendar):
         Returns:
             str: Chuỗi dữ liệu ical .
         """
-        return self.to_ical().decode('utf-8')
+        with timed("ical.serialize"):
+            return self.to_ical().decode('utf-8')
 
     def export_ical(self, location: str, filename: str):
         """
@@ -0,0 +1,421 @@
+import sys
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+from classes.subject import DetailedClass, Subject, Lesson, Period, Timetable
+
+# Các cột cần thiết trong Thời khóa biểu (ngoài cột Mã Lớp học phần)
+SCHEDULE_COLUMNS = ("Mã học phần", "Học phần", "Giảng viên", "Thứ", "Giảng đường", "Nhóm", "Tiết")
+
+# Cột được mã hóa từ điển: (mã của từng dòng, danh sách giá trị phân biệt)
+Column = tuple[Sequence[int], list]
+
+@dataclass(slots=True, frozen=True)
+class ScheduleDiff:
+    """
+    Khác biệt giữa hai phiên bản Thời khóa biểu, theo mã lớp học phần.
+
+    Attributes:
+        added (frozenset[str]): Các lớp chỉ có trong phiên bản mới.
+        removed (frozenset[str]): Các lớp chỉ có trong phiên bản cũ.
+        changed (frozenset[str]): Các lớp có trong cả hai phiên bản nhưng khác thông tin hoặc buổi học.
+    """
+    added: frozenset[str]
+    removed: frozenset[str]
+    changed: frozenset[str]
+
+    @property
+    def stale(self) -> frozenset[str]:
+        """
+        Các lớp mà dữ liệu tạo từ phiên bản cũ không còn đúng (removed và changed).
+        """
+        return self.removed | self.changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+class Schedule:
+    """
+    Thời khóa biểu đã được đọc và đánh chỉ mục theo mã lớp học phần.
+
+    Dữ liệu được lưu theo cột, mỗi cột được mã hóa từ điển (mã của từng dòng trỏ tới
+    danh sách giá trị phân biệt). Cột "Thứ" và "Tiết" được phân tích một lần cho mỗi
+    giá trị phân biệt thay vì cho mỗi dòng.
+
+    Các DetailedClass chỉ được tạo khi được yêu cầu lần đầu rồi ghi nhớ lại, vì vậy
+    một Schedule có thể dùng chung cho nhiều request mà không phải đọc lại file.
+    Các đối tượng trả về được dùng chung, không nên sửa đổi trực tiếp.
+
+    Khi bật views, get_class trả về ClassView đọc thẳng từ các cột thay vì tạo và giữ
+    DetailedClass, nên bộ nhớ chỉ phụ thuộc vào số giá trị phân biệt của mỗi cột.
+
+    Attributes:
+        id_header (str): Tên cột chứa Mã Lớp học phần.
+        version (str | None): Phiên bản của file Thời khóa biểu (xem utils.getClass.get_schedule),
+            được gắn vào các DetailedClass để làm khóa cache.
+        views (bool): Trả về ClassView thay vì DetailedClass.
+    """
+    id_header: str
+    version: str | None
+    views: bool
+
+    def __init__(self, columns: dict[str, Column], index: dict[str, Sequence[int]], id_header: str, timetable: Timetable):
+        """
+        Args:
+            columns (dict[str, Column]): Các cột đã mã hóa từ điển, theo tên cột
+            index (dict[str, Sequence[int]]): Vị trí các dòng của từng lớp học phần, theo thứ tự trong file
+            id_header (str): Tên cột chứa Mã Lớp học phần
+            timetable (Timetable): Bảng tham chiếu thời gian tiết học
+
+        Raises:
+            ValueError: Nếu thiếu cột cần thiết
+        """
+        missing_columns = [name for name in SCHEDULE_COLUMNS if name not in columns]
+        if missing_columns:
+            raise ValueError(f"Không tìm thấy các cột: {', '.join(missing_columns)}")
+
+        self.id_header = id_header
+        self.version = None
+        self.views = False
+        # Các giá trị chuỗi được intern để dùng chung giữa các Thời khóa biểu đang được cache
+        columns = {name: (codes, [_intern(value) for value in values]) for name, (codes, values) in columns.items()}
+        self._columns = columns
+        self._index = index
+        self._classes: dict[str, DetailedClass] = {}
+
+        _, weekday_values = columns["Thứ"]
+        _, period_values = columns["Tiết"]
+        self._weekdays = [_try_parse(Lesson.parse_weekday, value) for value in weekday_values]
+        # Cả Thời khóa biểu dùng một phiên bản bảng tiết học, kể cả khi bảng được tải lại giữa chừng
+        reference = timetable.snapshot().reference
+        self._periods = [_try_parse(reference, value) for value in period_values]
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, id_header: str, timetable: Timetable) -> "Schedule":
+        """
+        Tạo Schedule từ DataFrame đã chuẩn hóa.
+
+        Args:
+            df (pd.DataFrame): DataFrame đã chuẩn hóa (header là tên cột)
+            id_header (str): Tên cột chứa Mã Lớp học phần
+            timetable (Timetable): Bảng tham chiếu thời gian tiết học
+
+        Returns:
+            Schedule: Thời khóa biểu đã đánh chỉ mục
+
+        Raises:
+            ValueError: Nếu thiếu cột cần thiết
+        """
+        columns: dict[str, Column] = {}
+        for name in (id_header, *SCHEDULE_COLUMNS):
+            if name in df.columns and name not in columns:
+                codes, uniques = pd.factorize(df[name], use_na_sentinel=False)
+                # Mã nhỏ nhất đủ chứa số giá trị phân biệt (thường là uint8/uint16 thay vì int64)
+                columns[name] = (codes.astype(np.min_scalar_type(max(len(uniques) - 1, 0))), uniques.tolist())
+
+        index = {}
+        if id_header in columns:
+            # Vị trí các dòng của mỗi lớp là một đoạn của cùng một mảng (giống snapshot)
+            codes, class_ids = columns[id_header]
+            positions = np.argsort(codes, kind="stable").astype(np.uint32)
+            bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(class_ids)))))
+            index = {
+                class_id: positions[bounds[code]:bounds[code + 1]]
+                for code, class_id in enumerate(class_ids)
+                if not pd.isna(class_id)
+            }
+        return cls(columns, index, id_header, timetable)
+
+    def __contains__(self, class_id: str) -> bool:
+        return class_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    @property
+    def columns(self) -> dict[str, Column]:
+        """
+        Các cột đã mã hóa từ điển, theo tên cột.
+        """
+        return self._columns
+
+    @property
+    def index(self) -> dict[str, Sequence[int]]:
+        """
+        Vị trí các dòng của từng lớp học phần.
+        """
+        return self._index
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Kích thước ước lượng của dữ liệu trong bộ nhớ (byte).
+        """
+        size = sum(np.asarray(positions).nbytes for positions in self._index.values())
+        for codes, values in self._columns.values():
+            size += np.asarray(codes).nbytes + sum(sys.getsizeof(value) for value in values)
+        return size
+
+    def get_class(self, class_id: str) -> "DetailedClass | ClassView":
+        """
+        Lấy thông tin chi tiết một lớp học phần.
+
+        Args:
+            class_id (str): Mã lớp học phần
+
+        Returns:
+            DetailedClass | ClassView: Lớp học phần tương ứng (ClassView nếu bật views)
+
+        Raises:
+            KeyError: Nếu không có lớp học phần này trong thời khóa biểu
+        """
+        if self.views:
+            return self._view_class(class_id)
+        class_ = self._classes.get(class_id)
+        if class_ is None:
+            class_ = self._build_class(class_id)
+            self._classes[class_id] = class_
+        return class_
+
+    def get_classes(self, id_list: list[str]) -> "list[DetailedClass | ClassView]":
+        """
+        Lấy thông tin chi tiết các lớp học phần, theo thứ tự xuất hiện trong thời khóa biểu.
+
+        Các mã không có trong thời khóa biểu sẽ bị bỏ qua.
+
+        Args:
+            id_list (list[str]): Danh sách mã lớp học phần
+
+        Returns:
+            list[DetailedClass | ClassView]: Danh sách chi tiết các lớp học phần
+        """
+        class_ids = [class_id for class_id in dict.fromkeys(id_list) if class_id in self._index]
+        class_ids.sort(key=lambda class_id: self._index[class_id][0])
+        return [self.get_class(class_id) for class_id in class_ids]
+
+    def subject_class_ids(self, subject_ids: list[str]) -> list[str]:
+        """
+        Mã các lớp học phần thuộc các môn học, theo thứ tự xuất hiện trong thời khóa biểu.
+
+        Args:
+            subject_ids (list[str]): Mã các môn học (Mã học phần)
+
+        Returns:
+            list[str]: Mã các lớp học phần
+        """
+        codes, values = self._columns["Mã học phần"]
+        wanted = set(subject_ids)
+        return [class_id for class_id, positions in self._index.items() if values[codes[positions[0]]] in wanted]
+
+    def diff(self, other: "Schedule") -> ScheduleDiff:
+        """
+        So sánh với một phiên bản khác (mới hơn) của Thời khóa biểu, theo mã lớp học phần.
+
+        Hai lớp cùng mã được coi là giống nhau nếu mọi dòng của lớp (theo thứ tự) có cùng giá trị
+        ở các cột cần thiết và cùng thời gian tiết học.
+
+        Args:
+            other (Schedule): Phiên bản mới
+
+        Returns:
+            ScheduleDiff: Các lớp được thêm, bị xóa và bị thay đổi
+        """
+        common = self._index.keys() & other._index.keys()
+        return ScheduleDiff(
+            added=frozenset(other._index.keys() - common),
+            removed=frozenset(self._index.keys() - common),
+            changed=frozenset(class_id for class_id in common if self._rows(class_id) != other._rows(class_id))
+        )
+
+    def rebind(self, timetable: Timetable) -> "Schedule":
+        """
+        Tạo Schedule dùng chung dữ liệu với Schedule này nhưng tham chiếu tiết học theo bảng khác
+        (ví dụ sau khi Timetable.reload).
+
+        Args:
+            timetable (Timetable): Bảng tham chiếu thời gian tiết học
+
+        Returns:
+            Schedule: Thời khóa biểu mới, cùng version và views
+        """
+        schedule = Schedule(self._columns, self._index, self.id_header, timetable)
+        schedule.version = self.version
+        schedule.views = self.views
+        return schedule
+
+    def _rows(self, class_id: str) -> list[tuple]:
+        columns = [self._columns[name] for name in SCHEDULE_COLUMNS]
+        period_codes = self._columns["Tiết"][0]
+        return [
+            (*(_comparable(values[codes[position]]) for codes, values in columns), _comparable(self._periods[period_codes[position]]))
+            for position in self._index[class_id]
+        ]
+
+    def _value(self, name: str, position: int):
+        codes, values = self._columns[name]
+        return values[codes[position]]
+
+    def _build_class(self, class_id: str) -> DetailedClass:
+        positions = self._index[class_id]
+        first = positions[0]
+        class_ = DetailedClass(
+            id=class_id,
+            subject=Subject(
+                id=self._value("Mã học phần", first),
+                name=self._value("Học phần", first)
+            ),
+            teacher=self._value("Giảng viên", first),
+            version=self.version
+        )
+
+        weekday_codes = self._columns["Thứ"][0]
+        period_codes = self._columns["Tiết"][0]
+        location_codes, locations = self._columns["Giảng đường"]
+        group_codes, groups = self._columns["Nhóm"]
+        for position in positions:
+            weekday = self._weekdays[weekday_codes[position]]
+            period = self._periods[period_codes[position]]
+            for parsed in (weekday, period):
+                if isinstance(parsed, Exception):
+                    raise parsed
+            class_.add_lesson(
+                Lesson(
+                    weekday=weekday,
+                    location=locations[location_codes[position]],
+                    group=groups[group_codes[position]],
+                    period=period
+                )
+            )
+        return class_
+
+    def _view_class(self, class_id: str) -> "ClassView":
+        positions = self._index[class_id]
+        weekday_codes = self._columns["Thứ"][0]
+        period_codes = self._columns["Tiết"][0]
+        # Báo lỗi ngay như khi tạo DetailedClass, thay vì khi đọc buổi học
+        for position in positions:
+            for parsed in (self._weekdays[weekday_codes[position]], self._periods[period_codes[position]]):
+                if isinstance(parsed, Exception):
+                    raise parsed
+        return ClassView(self, class_id)
+
+class LessonView:
+    """
+    Buổi học đọc thẳng từ các cột của Schedule, có cùng các thuộc tính với Lesson.
+    """
+    __slots__ = ("_schedule", "_position")
+
+    def __init__(self, schedule: Schedule, position: int):
+        self._schedule = schedule
+        self._position = position
+
+    @property
+    def weekday(self) -> int:
+        schedule = self._schedule
+        return schedule._weekdays[schedule._columns["Thứ"][0][self._position]]
+
+    @property
+    def period(self) -> Period:
+        schedule = self._schedule
+        return schedule._periods[schedule._columns["Tiết"][0][self._position]]
+
+    @property
+    def location(self) -> str:
+        return self._schedule._value("Giảng đường", self._position)
+
+    @property
+    def group(self) -> str:
+        return self._schedule._value("Nhóm", self._position)
+
+    def materialize(self) -> Lesson:
+        """
+        Tạo Lesson độc lập với Schedule.
+
+        Returns:
+            Lesson: Buổi học tương ứng
+        """
+        return Lesson(weekday=self.weekday, period=self.period, location=self.location, group=self.group)
+
+    def __reduce__(self):
+        return Lesson, (self.weekday, self.period, self.location, self.group)
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+class ClassView:
+    """
+    Lớp học phần đọc thẳng từ các cột của Schedule, có cùng các thuộc tính với DetailedClass.
+
+    Không sửa đổi được; khi pickle (ví dụ gửi sang tiến trình con) sẽ trở thành DetailedClass.
+    """
+    __slots__ = ("_schedule", "id")
+
+    def __init__(self, schedule: Schedule, class_id: str):
+        self._schedule = schedule
+        self.id = class_id
+
+    @property
+    def version(self) -> str | None:
+        return self._schedule.version
+
+    @property
+    def subject(self) -> Subject:
+        first = self._schedule._index[self.id][0]
+        return Subject(id=self._schedule._value("Mã học phần", first), name=self._schedule._value("Học phần", first))
+
+    @property
+    def teacher(self) -> str:
+        return self._schedule._value("Giảng viên", self._schedule._index[self.id][0])
+
+    @property
+    def lessons(self) -> list[LessonView]:
+        return [LessonView(self._schedule, position) for position in self._schedule._index[self.id]]
+
+    def materialize(self) -> DetailedClass:
+        """
+        Tạo DetailedClass độc lập với Schedule.
+
+        Returns:
+            DetailedClass: Lớp học phần tương ứng
+        """
+        return DetailedClass(
+            id=self.id,
+            subject=self.subject,
+            lessons=[lesson.materialize() for lesson in self.lessons],
+            teacher=self.teacher,
+            version=self.version
+        )
+
+    def __reduce__(self):
+        class_ = self.materialize()
+        return DetailedClass, (class_.id, class_.subject, class_.lessons, class_.teacher, class_.version)
+
+    def __repr__(self):
+        return repr(self.materialize())
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+def _comparable(value: Any) -> Any:
+    # NaN khác chính nó, lỗi phân tích so sánh theo đối tượng
+    if isinstance(value, Exception):
+        return repr(value)
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+def _try_parse(parse: Callable[[Any], Any], value: Any) -> Any:
+    """
+    Phân tích một giá trị phân biệt của cột, trả về lỗi thay vì raise.
+
+    Lỗi chỉ được raise khi một lớp học phần thực sự dùng tới dòng đó,
+    giống như khi phân tích từng dòng.
+    """
+    try:
+        return parse(value)
+    except Exception as error:
+        return error
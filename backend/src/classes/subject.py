@@ -1,9 +1,12 @@
 import re
-import pandas as pd
+import csv
+import threading
+from types import MappingProxyType
+from typing import Mapping
 from datetime import time, datetime, date, timedelta
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class Subject:
     """
     Một môn học.
@@ -12,13 +15,15 @@ class Subject:
         id (str): Mã môn học.
         name (str): Tên môn học.
     """
-    id: str
-    name: str
+    id: str = ""
+    name: str = ""
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Period:
     """
     Khoảng thời gian học liên tiếp cùng một môn. (ví dụ: 1, 1-3)
+
+    Mỗi khoảng tiết chỉ có một Period (xem Timetable.ranges), dùng chung giữa các buổi học.
     
     Attributes:
         start (time): Thời gian bắt đầu.
@@ -28,7 +33,7 @@ class Period:
     end: time
 
     def __repr__(self):
-        return f"{self.start.strftime('%H:%M')} -> {self.end.strftime('%H:%M')}" if self.start else super().__repr__()
+        return f"{self.start.strftime('%H:%M')} -> {self.end.strftime('%H:%M')}" if self.start else object.__repr__(self)
 
     def delta(self) -> timedelta:
         """
@@ -47,13 +52,63 @@ class Period:
         end_dt = datetime.combine(date.today(), self.end)
         return end_dt - start_dt
 
-class Timetable(dict[int, Period]):
+@dataclass(frozen=True, slots=True)
+class TimetableState:
+    """
+    Một phiên bản của bảng tiết học: thời gian các tiết, các khoảng tiết và bộ nhớ tra cứu.
+
+    Được tạo đầy đủ rồi mới gán vào Timetable trong một lần, và không bao giờ bị sửa sau đó
+    (trừ resolved, chỉ thêm các kết quả tra cứu của chính phiên bản này).
+
+    Attributes:
+        file (str): Đường dẫn tới file CSV chứa dữ liệu tham chiếu.
+        periods (MappingProxyType[int, Period]): Tiết -> thời gian.
+        ranges (MappingProxyType[tuple[int, int], Period]): Khoảng tiết (tiết bắt đầu, tiết kết thúc) -> thời gian.
+        resolved (dict[str, Period]): Chuỗi tiết học đã tra -> Period.
+    """
+    file: str
+    periods: MappingProxyType
+    ranges: MappingProxyType
+    resolved: dict = field(default_factory=dict)
+
+    def reference(self, period: str) -> Period:
+        """
+        Tham chiếu thời gian tiết học từ chuỗi định dạng, theo phiên bản này (xem Timetable.reference).
+        """
+        resolved = self.resolved.get(period)
+        if resolved is not None:
+            return resolved
+
+        match = Timetable.PATTERN.search(period) if isinstance(period, str) else None
+        if match is None:
+            raise ValueError(f"Không đọc được tiết học từ {period!r}")
+        start_period_num = int(match.group(1))
+        end_period_num = int(match.group(2) or start_period_num)
+
+        resolved = self.ranges.get((start_period_num, end_period_num))
+        if resolved is None:
+            raise ValueError(f"Tiết học không hợp lệ: {period!r} (không có trong {self.file})")
+        self.resolved[period] = resolved
+        return resolved
+
+class Timetable(Mapping[int, Period]):
     """
-    Thời gian học tập và giảng dạy.
+    Thời gian học tập và giảng dạy (tiết -> Period, chỉ đọc).
+
+    Mọi khoảng tiết hợp lệ (start <= end) được tính sẵn khi đọc file, nên việc tham chiếu
+    tiết học của từng dòng Thời khóa biểu chỉ là tra bảng. Các Period trả về được dùng chung,
+    không nên sửa trực tiếp.
+
+    Dữ liệu nằm trong một TimetableState không đổi; reload() tạo state mới rồi thay vào bằng một
+    phép gán, nên mỗi lần tra cứu hoặc duyệt (items(), max(...)) chỉ thấy một phiên bản.
+    Cần nhiều thao tác trên cùng một phiên bản thì dùng snapshot().
 
     Attributes:
         file (str): Đường dẫn tới file CSV chứa dữ liệu tham chiếu.
+        ranges (MappingProxyType[tuple[int, int], Period]): Khoảng tiết (tiết bắt đầu, tiết kết thúc) -> thời gian.
     """
+    PATTERN = re.compile(r"(\d+)(?:-(\d+))?")
+
     file: str
 
     def __init__(self, file_path: str):
@@ -63,19 +118,76 @@ class Timetable(dict[int, Period]):
         Args:
             file_path (str): Đường dẫn tới file CSV chứa dữ liệu tham chiếu.
         """
+        self.file = file_path
+        self._reload_lock = threading.Lock()
+        periods = self._read(file_path)
+        self._state = TimetableState(file_path, MappingProxyType(periods), self._build_ranges(periods, {}))
+
+    @staticmethod
+    def _read(file_path: str) -> dict[int, Period]:
+        """
+        Đọc thời gian các tiết học từ file CSV (module csv, không cần pandas).
+        """
         NUM_HEADER = "num"
         START_HEADER = "start"
         END_HEADER = "end"
         TIME_FORMAT = "%H:%M:%S"
     
-        df = pd.read_csv(file_path)
+        with open(file_path, newline="", encoding="utf-8-sig") as file:
+            rows = list(csv.DictReader(file, skipinitialspace=True))
 
-        self.file = file_path
-        for index, row in df.iterrows():
+        periods = {}
+        for row in rows:
             num = int(row[NUM_HEADER])
             start_time = datetime.strptime(row[START_HEADER], TIME_FORMAT).time()
             end_time = datetime.strptime(row[END_HEADER], TIME_FORMAT).time()
-            self[num] = Period(start=start_time, end=end_time)
+            periods[num] = Period(start=start_time, end=end_time)
+        return periods
+
+    @staticmethod
+    def _build_ranges(periods: Mapping[int, Period], previous: Mapping[tuple[int, int], Period]) -> MappingProxyType:
+        """
+        Tính mọi khoảng tiết hợp lệ, dùng lại Period của các khoảng không đổi trong previous.
+        """
+        ranges = {}
+        for start_num in periods:
+            for end_num in periods:
+                if start_num <= end_num:
+                    period = Period(periods[start_num].start, periods[end_num].end)
+                    old = previous.get((start_num, end_num))
+                    ranges[(start_num, end_num)] = old if old == period else period
+        return MappingProxyType(ranges)
+
+    def __getitem__(self, num: int) -> Period:
+        return self._state.periods[num]
+
+    def __iter__(self):
+        return iter(self._state.periods)
+
+    def __len__(self) -> int:
+        return len(self._state.periods)
+
+    def keys(self):
+        return self._state.periods.keys()
+
+    def items(self):
+        return self._state.periods.items()
+
+    def values(self):
+        return self._state.periods.values()
+
+    @property
+    def ranges(self) -> MappingProxyType:
+        return self._state.ranges
+
+    def snapshot(self) -> TimetableState:
+        """
+        Phiên bản hiện tại của bảng tiết học, không bị ảnh hưởng bởi các lần reload sau đó.
+
+        Returns:
+            TimetableState: Phiên bản hiện tại
+        """
+        return self._state
 
     def reference(self, period: str) -> Period:
         """
@@ -85,26 +197,41 @@ class Timetable(dict[int, Period]):
             period (str): Chuỗi định dạng tiết học (ví dụ: "1-3").
         
         Returns:
-            Period: Đối tượng Period tương ứng.
+            Period: Đối tượng Period tương ứng (dùng chung giữa các lần gọi).
+
+        Raises:
+            ValueError: Nếu chuỗi không chứa tiết học, hoặc khoảng tiết không có trong bảng
         """
-        PATTERN = r"\d+(-\d+)?"
-        match = re.search(PATTERN, period)
-        period = match.group()
+        return self._state.reference(period)
 
-        if "-" in period:
-            start_period_num, end_period_num = map(int, period.split("-"))
-        else:
-            start_period_num = end_period_num = int(period)
+    def reload(self) -> frozenset[int]:
+        """
+        Tải lại dữ liệu từ file, chỉ cập nhật các tiết đã thay đổi.
 
-        return Period(self[start_period_num].start, self[end_period_num].end)
+        Các khoảng tiết không đổi giữ nguyên đối tượng Period. Phiên bản mới (tiết, khoảng tiết,
+        bộ nhớ tra cứu rỗng) được tạo đầy đủ rồi thay vào bằng một phép gán, nên các lần tham chiếu
+        đang diễn ra vẫn dùng trọn vẹn phiên bản cũ.
 
-    def reload(self):
-        """
-        Tải lại dữ liệu từ file.
+        Returns:
+            frozenset[int]: Các tiết đã thay đổi (thêm, bớt hoặc đổi giờ), rỗng nếu file không đổi
         """
-        self.__init__(self.file)
+        with self._reload_lock:
+            current = self._state
+            periods = self._read(self.file)
+            changed = frozenset(
+                num for num in current.periods.keys() | periods.keys() if current.periods.get(num) != periods.get(num)
+            )
+            if not changed:
+                return changed
+
+            # Dùng lại Period của các tiết không đổi
+            periods = {num: period if num in changed else current.periods[num] for num, period in periods.items()}
+            self._state = TimetableState(
+                self.file, MappingProxyType(periods), self._build_ranges(periods, current.ranges)
+            )
+            return changed
 
-@dataclass
+@dataclass(slots=True)
 class Lesson:
     """
     Một buổi học.
@@ -116,19 +243,33 @@ class Lesson:
         group (str): Nhóm.
     """
     weekday: int
-    period = Period()
+    period: Period
     location: str
     group: str
 
     def __post_init__(self):
-        if isinstance(self.weekday, str):
-            self.weekday = 6 if self.weekday == "CN" else int(self.weekday) - 2
+        self.weekday = Lesson.parse_weekday(self.weekday)
+
+    @staticmethod
+    def parse_weekday(weekday: int | str) -> int:
+        """
+        Chuyển thứ từ định dạng trong Thời khóa biểu ("2" -> "7", "CN") sang dạng 0-based.
+
+        Args:
+            weekday (int | str): Thứ trong Thời khóa biểu, hoặc đã ở dạng 0-based
+
+        Returns:
+            int: Thứ ở dạng 0-based (0: Thứ 2, ..., 6: Chủ nhật)
+        """
+        if isinstance(weekday, str):
+            return 6 if weekday == "CN" else int(weekday) - 2
+        return weekday
 
     def __repr__(self):
         day_of_week = ["Thứ hai", "Thứ ba", "Thứ tư", "Thứ năm", "Thứ sáu", "Thứ bảy", "Chủ nhật"]
-        return f"({day_of_week[self.weekday]}) {self.period.__repr__()}" if self.period else super().__repr__()
+        return f"({day_of_week[self.weekday]}) {self.period.__repr__()}" if self.period else object.__repr__(self)
 
-@dataclass
+@dataclass(slots=True)
 class SimpleClass:
     """
     Lớp học đã đăng kí trên cổng Đăng kí môn.
@@ -139,10 +280,10 @@ class SimpleClass:
         id (str): Mã lớp học.
         subject (Subject): Môn học.
     """
-    id: str
-    subject = Subject()
+    id: str = ""
+    subject: Subject = field(default_factory=Subject)
 
-@dataclass
+@dataclass(slots=True)
 class DetailedClass(SimpleClass):
     """
     Lớp học đối chiếu từ Thời khóa biểu.
@@ -152,12 +293,14 @@ class DetailedClass(SimpleClass):
     Attributes:
         lessons (list[Lesson]): Danh sách các buổi học.
         teacher: str: Tên giảng viên.
+        version (str | None): Phiên bản Thời khóa biểu mà lớp được đọc từ (None nếu không rõ).
     """
     lessons: list[Lesson] = field(default_factory=list)
-    teacher: str
+    teacher: str = ""
+    version: str | None = field(default=None, compare=False)
 
     def __repr__(self):
-        return f"{self.id} ({len(self.lessons)})" if len(self.lessons) > 0 else super().__repr__()
+        return f"{self.id} ({len(self.lessons)})" if len(self.lessons) > 0 else SimpleClass.__repr__(self)
     
     def add_lesson(self, lesson: Lesson) -> None:
         """
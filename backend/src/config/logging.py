@@ -1,8 +1,13 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import random
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
 import os
 from datetime import datetime
 from colorama import Fore, Style, init
+from flask.logging import default_handler
+from config import settings
 
 # Khởi tạo colorama
 init(autoreset=True)
@@ -44,6 +49,33 @@ class ColoredFormatter(logging.Formatter):
             
         return formatted_message
 
+class InfoSamplingFilter(logging.Filter):
+    """
+    Chỉ giữ lại một phần log INFO (theo tỉ lệ), các mức khác được giữ nguyên.
+
+    Attributes:
+        rate (float): Tỉ lệ log INFO được giữ lại (0-1).
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno != logging.INFO or self.rate >= 1 or random.random() < self.rate
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler đưa LogRecord vào hàng đợi trong cùng tiến trình.
+
+    Message được ghép với các tham số ngay trên luồng gọi log (tham số có thể thay đổi hoặc
+    gắn với request sau đó), còn việc format theo formatter và traceback được để lại cho luồng
+    của QueueListener. Khác với QueueHandler mặc định, record không bị sao chép.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 def setup_logging(app):
     # Tạo đường dẫn tuyệt đối đến thư mục logs
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -75,19 +107,32 @@ def setup_logging(app):
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
     stream_handler.setLevel(logging.INFO)
-    
-    # Cấu hình cho app logger
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(stream_handler)
+
+    if settings.LOG_ASYNC:
+        # Ghi file/console trên luồng nền, luồng xử lý request chỉ đưa record vào hàng đợi
+        queue_handler = LazyQueueHandler(SimpleQueue())
+        queue_handler.setLevel(logging.INFO)
+        listener = QueueListener(queue_handler.queue, file_handler, stream_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        app.extensions['log_listener'] = listener
+        handlers = [queue_handler]
+    else:
+        handlers = [file_handler, stream_handler]
+
+    if settings.LOG_INFO_SAMPLE_RATE < 1:
+        sampling_filter = InfoSamplingFilter(settings.LOG_INFO_SAMPLE_RATE)
+        for handler in handlers:
+            handler.addFilter(sampling_filter)
+
+    # Gắn handler vào root logger để log của app và của các module (utils.*, asgi, ...) đều đi
+    # qua cùng một đường; bỏ handler mặc định của Flask để không ghi log hai lần
+    app.logger.removeHandler(default_handler)
+    root = logging.getLogger()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(logging.INFO)
     app.logger.setLevel(logging.INFO)
-    
+
     # Log startup message
     app.logger.info('Logging system initialized')
-
-    # Thêm handler cho các module khác
-    for logger_name in logging.root.manager.loggerDict:
-        if logger_name.startswith('src.'):
-            logger = logging.getLogger(logger_name)
-            logger.addHandler(stream_handler)
-            logger.addHandler(file_handler)
-            logger.setLevel(logging.INFO) 
\ No newline at end of file
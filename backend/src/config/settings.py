@@ -0,0 +1,140 @@
+import os
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Đọc một biến môi trường kiểu số nguyên.
+
+    Args:
+        name (str): Tên biến môi trường
+        default (int): Giá trị mặc định nếu biến không tồn tại
+
+    Returns:
+        int: Giá trị của biến môi trường
+
+    Raises:
+        ValueError: Nếu giá trị không phải số nguyên
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Biến môi trường {name} phải là số nguyên, nhận được: {value!r}")
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Đọc một biến môi trường kiểu boolean ("1", "true", "yes", "on" là True).
+
+    Args:
+        name (str): Tên biến môi trường
+        default (bool): Giá trị mặc định nếu biến không tồn tại
+
+    Returns:
+        bool: Giá trị của biến môi trường
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _env_float(name: str, default: float) -> float:
+    """
+    Đọc một biến môi trường kiểu số thực.
+
+    Args:
+        name (str): Tên biến môi trường
+        default (float): Giá trị mặc định nếu biến không tồn tại
+
+    Returns:
+        float: Giá trị của biến môi trường
+
+    Raises:
+        ValueError: Nếu giá trị không phải số
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Biến môi trường {name} phải là số, nhận được: {value!r}")
+
+# Bảng thời gian tiết học (utils/getClass.py), rỗng là config/time.csv của backend
+PERIOD_REFERENCE_FILE = os.environ.get("PERIOD_REFERENCE_FILE", "")
+
+# Import các handler khi khởi động (routes/api.py): "eager" (trước khi nhận request),
+# "background" (trên luồng nền sau khi khởi động) hoặc "off" (khi có request đầu tiên)
+STARTUP_WARMUP = os.environ.get("STARTUP_WARMUP", "background")
+
+# Cache thời khóa biểu đã đọc (utils/cache.py)
+SCHEDULE_CACHE_MAX_ENTRIES = _env_int("SCHEDULE_CACHE_MAX_ENTRIES", 8)
+SCHEDULE_CACHE_MAX_BYTES = _env_int("SCHEDULE_CACHE_MAX_BYTES", 512 * 1024 * 1024)  # 512MB
+SCHEDULE_CACHE_KEY = os.environ.get("SCHEDULE_CACHE_KEY", "stat")  # "stat" (mtime + size) hoặc "hash" (nội dung)
+
+# Snapshot dạng cột của Thời khóa biểu (utils/snapshot.py)
+SCHEDULE_SNAPSHOT_ENABLED = _env_bool("SCHEDULE_SNAPSHOT_ENABLED", True)
+SCHEDULE_SNAPSHOT_AUTO = _env_bool("SCHEDULE_SNAPSHOT_AUTO", False)  # Tự ghi snapshot sau khi đọc file .xlsx
+SCHEDULE_SNAPSHOT_DIR = os.environ.get("SCHEDULE_SNAPSHOT_DIR", "")  # Mặc định: cạnh file gốc
+
+# Đọc lại Thời khóa biểu và config/time.csv khi file thay đổi (utils/watcher.py): số giây giữa hai lần kiểm tra, 0 là tắt
+SCHEDULE_WATCH_INTERVAL = _env_float("SCHEDULE_WATCH_INTERVAL", 0.0)
+
+# Cách đọc Thời khóa biểu trong get_detailed_classes: "pandas" (đọc cả sheet, cache Schedule) hoặc
+# "stream" (đọc theo luồng, chỉ giữ các lớp cần lấy, không cache; utils/xlsxReader.py)
+SCHEDULE_READER = os.environ.get("SCHEDULE_READER", "pandas")
+
+# Số tiến trình con khi đọc nhiều file/sheet Thời khóa biểu (utils/getClass.py, get_merged_schedule)
+SCHEDULE_INGEST_MAX_WORKERS = _env_int("SCHEDULE_INGEST_MAX_WORKERS", os.cpu_count() or 1)
+
+# Trả về ClassView đọc thẳng từ các cột của Thời khóa biểu thay vì tạo và giữ DetailedClass (classes/schedule.py)
+SCHEDULE_CLASS_VIEWS = _env_bool("SCHEDULE_CLASS_VIEWS", False)
+
+# Cách đọc file Kết quả Đăng ký học: "stream" (utils/registration.py) hoặc "bs4" (BeautifulSoup)
+REGISTRATION_PARSER = os.environ.get("REGISTRATION_PARSER", "stream")
+
+# Số tiến trình con khi tạo lịch hàng loạt (utils/batchCalendar.py)
+BATCH_MAX_WORKERS = _env_int("BATCH_MAX_WORKERS", os.cpu_count() or 1)
+
+# Tự động xếp lịch (utils/autoScheduler.py)
+SCHEDULER_MAX_WORKERS = _env_int("SCHEDULER_MAX_WORKERS", os.cpu_count() or 1)
+SCHEDULER_MAX_NODES = _env_int("SCHEDULER_MAX_NODES", 2_000_000)  # Dừng sớm khi tổng số nút đã duyệt (mọi tiến trình) vượt quá số này
+SCHEDULER_SEQUENTIAL_NODES = _env_int("SCHEDULER_SEQUENTIAL_NODES", 20_000)  # Số nút duyệt tuần tự trước khi chia nhánh cho process pool
+
+# Cách xuất iCalendar mặc định: "direct" (utils/icalWriter.py) hoặc "icalendar"
+ICAL_RENDERER = os.environ.get("ICAL_RENDERER", "direct")
+ICAL_STREAM = _env_bool("ICAL_STREAM", False)  # Mặc định gửi dần file .ics (chunked) trong getCalendar
+# Cache VEVENT của từng lớp học phần, dùng chung giữa các sinh viên (0 là tắt)
+ICAL_FRAGMENT_CACHE_MAX_ENTRIES = _env_int("ICAL_FRAGMENT_CACHE_MAX_ENTRIES", 50000)
+ICAL_FRAGMENT_CACHE_MAX_BYTES = _env_int("ICAL_FRAGMENT_CACHE_MAX_BYTES", 64 * 1024 * 1024)  # 64MB
+
+# Nơi chạy các bước tốn CPU (utils/executor.py): "inline", "thread" hoặc "process"
+CPU_EXECUTOR = os.environ.get("CPU_EXECUTOR", "inline")
+CPU_MAX_WORKERS = _env_int("CPU_MAX_WORKERS", os.cpu_count() or 1)
+
+# Chế độ ASGI (asgi.py): số request xử lý đồng thời và số request được phép chờ
+ASYNC_MAX_CONCURRENCY = _env_int("ASYNC_MAX_CONCURRENCY", 16)
+ASYNC_MAX_QUEUE = _env_int("ASYNC_MAX_QUEUE", 64)  # Vượt quá thì trả về 503
+
+# Giới hạn file tải lên (utils/upload.py)
+MAX_UPLOAD_BYTES = _env_int("MAX_UPLOAD_BYTES", 32 * 1024 * 1024)  # Mỗi file
+MAX_CONTENT_LENGTH = _env_int("MAX_CONTENT_LENGTH", 64 * 1024 * 1024)  # Cả request
+
+# Đo thời gian từng bước, header Server-Timing và endpoint /metrics (utils/metrics.py)
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", False)
+
+# Logging (config/logging.py)
+LOG_ASYNC = _env_bool("LOG_ASYNC", True)  # Ghi log trên luồng nền qua hàng đợi
+LOG_INFO_SAMPLE_RATE = _env_float("LOG_INFO_SAMPLE_RATE", 1.0)  # Tỉ lệ log INFO được giữ lại (0-1)
+
+# Cache file .ics đã tạo, kèm ETag/304 (utils/responseCache.py)
+RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+RESPONSE_CACHE_MAX_BYTES = _env_int("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)  # Tầng bộ nhớ, 64MB
+RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", "")  # Tầng đĩa, rỗng là tắt
+RESPONSE_CACHE_DISK_BYTES = _env_int("RESPONSE_CACHE_DISK_BYTES", 1024 * 1024 * 1024)  # 1GB
+
+# Handle ngắn hạn giữ kết quả đọc file của getLessons/getLessonsCalendar cho getCalendar (utils/sessionStore.py)
+SESSION_TTL_SECONDS = _env_float("SESSION_TTL_SECONDS", 600)  # 0 là tắt
+SESSION_MAX_ENTRIES = _env_int("SESSION_MAX_ENTRIES", 1024)
+SESSION_MAX_BYTES = _env_int("SESSION_MAX_BYTES", 64 * 1024 * 1024)  # 64MB, theo kích thước ước lượng
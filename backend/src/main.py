@@ -1,15 +1,23 @@
 from flask import Flask
 from config.logging import setup_logging
 from middleware.error_handler import register_error_handlers
+from middleware.metrics import register_metrics
 from routes.api import register_api_routes
+from config import settings
+from utils.upload import UploadRequest
 
 app = Flask(__name__)
+app.request_class = UploadRequest  # Giữ file tải lên trong bộ nhớ
+app.config['MAX_CONTENT_LENGTH'] = settings.MAX_CONTENT_LENGTH
 setup_logging(app)  # Sử dụng cấu hình logging từ config
 logger = app.logger
 
 # Đăng ký các routes
 register_api_routes(app)
 
+# Đo thời gian từng bước (Server-Timing, /metrics)
+register_metrics(app)
+
 # Đăng ký error handlers
 register_error_handlers(app)
 
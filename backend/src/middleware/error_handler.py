@@ -1,4 +1,5 @@
 from flask import jsonify
+from werkzeug.exceptions import HTTPException
 from utils.response import APIError
 
 def register_error_handlers(app):
@@ -13,6 +14,15 @@ def register_error_handlers(app):
         }
         return jsonify(response), error.status_code
 
+    @app.errorhandler(HTTPException)
+    def handle_http_error(error):  # noqa
+        """Giữ nguyên mã lỗi HTTP của werkzeug (404, 405, 413, ...)"""
+        response = {
+            'error': error.description,
+            'status': error.code
+        }
+        return jsonify(response), error.code
+
     @app.errorhandler(Exception)
     def handle_generic_error(error):  # noqa
         """Xử lý các lỗi không mong muốn"""
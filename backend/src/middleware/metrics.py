@@ -0,0 +1,29 @@
+from flask import Response
+from config import settings
+from utils import metrics
+
+def register_metrics(app):
+    """
+    Gắn header Server-Timing vào response và đăng ký endpoint /metrics (định dạng Prometheus).
+
+    Không làm gì nếu METRICS_ENABLED tắt.
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def begin_timing():  # noqa
+        metrics.begin_request()
+
+    @app.after_request
+    def add_server_timing(response):  # noqa
+        server_timing = metrics.end_request()
+        if server_timing:
+            response.headers['Server-Timing'] = server_timing
+        metrics.count("http_responses_total", status=response.status_code)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def export_metrics():  # noqa
+        """Xuất số liệu theo định dạng text của Prometheus"""
+        return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
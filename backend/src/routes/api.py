@@ -1,32 +1,165 @@
+import os
+import re
+import time
+import logging
 import importlib
-from flask import request
+import pkgutil
+import threading
+from typing import Callable
+from flask import request, Response
+from config import settings
 from utils.response import make_response, APIError
+from utils.upload import get_form_parameters
+
+API_PACKAGE = 'api'
+_VERSION_PATTERN = re.compile(r'v(\w+)')
+# Thư viện được import trong lúc xử lý request (ví dụ engine của pd.read_excel), import trước khi warm-up
+WARMUP_MODULES = ('openpyxl',)
+
+class LazyHandler:
+    """
+    Handler của một module API, chỉ import module khi được gọi (hoặc load) lần đầu.
+
+    Attributes:
+        module (str): Tên module (ví dụ: "api.v1.getCalendar").
+    """
+    __slots__ = ("module", "_handler", "_lock")
+
+    def __init__(self, module: str):
+        self.module = module
+        self._handler: Callable | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Callable:
+        """
+        Import module và lấy hàm handle_request.
+
+        Returns:
+            Callable: Hàm handle_request của module
+
+        Raises:
+            ImportError: Nếu không import được module hoặc module không có handle_request
+        """
+        handler = self._handler
+        if handler is None:
+            with self._lock:
+                if self._handler is None:
+                    handler = getattr(importlib.import_module(self.module), 'handle_request', None)
+                    if not callable(handler):
+                        raise ImportError(f"{self.module} không có hàm handle_request")
+                    self._handler = handler
+                handler = self._handler
+        return handler
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+def discover_handlers(package: str = API_PACKAGE, lazy: bool = False) -> dict[str, dict[str, Callable]]:
+    """
+    Tìm tất cả handler trong package API (api/v<version>/<name>.py).
+
+    Mặc định các module được import ngay, nên các thư viện nặng mà handler dùng
+    (pandas, icalendar, ...) cũng được nạp sẵn trước request đầu tiên. Với lazy=True,
+    chỉ tìm tên module (không import) và trả về LazyHandler, để khởi động nhanh.
+
+    Args:
+        package (str): Tên package chứa các phiên bản API
+        lazy (bool): Trả về LazyHandler thay vì import module
+
+    Returns:
+        dict[str, dict[str, Callable]]: Bảng handler theo phiên bản, rồi theo tên API
+
+    Raises:
+        ImportError: Nếu không import được một handler (khi lazy=False)
+    """
+    root = importlib.import_module(package)
+    handlers: dict[str, dict[str, Callable]] = {}
+    for path in root.__path__:
+        for entry in sorted(os.listdir(path)):
+            match = _VERSION_PATTERN.fullmatch(entry)
+            if match is None or not os.path.isdir(os.path.join(path, entry)):
+                continue
+            version_handlers = handlers.setdefault(match.group(1), {})
+            for module_info in pkgutil.iter_modules([os.path.join(path, entry)]):
+                module_name = f'{package}.{entry}.{module_info.name}'
+                if lazy:
+                    version_handlers.setdefault(module_info.name, LazyHandler(module_name))
+                    continue
+                handler = getattr(importlib.import_module(module_name), 'handle_request', None)
+                if callable(handler):
+                    version_handlers.setdefault(module_info.name, handler)
+    return handlers
+
+def warm_up(handlers: dict[str, dict[str, Callable]], logger: logging.Logger | None = None) -> float:
+    """
+    Import trước các handler lazy và các thư viện chỉ được import khi đọc file (openpyxl).
+
+    Args:
+        handlers (dict[str, dict[str, Callable]]): Bảng handler (xem discover_handlers)
+        logger (logging.Logger | None): Logger để ghi lỗi và thời gian
+
+    Returns:
+        float: Thời gian đã dùng (giây)
+    """
+    start = time.perf_counter()
+    for version_handlers in handlers.values():
+        for handler in version_handlers.values():
+            if isinstance(handler, LazyHandler):
+                try:
+                    handler.load()
+                except ImportError:
+                    if logger is not None:
+                        logger.exception("Không import được %s", handler.module)
+    for module in WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    elapsed = time.perf_counter() - start
+    if logger is not None:
+        logger.info("Warm-up finished in %.0f ms", elapsed * 1000)
+    return elapsed
 
 def register_api_routes(app):
     logger = app.logger
-    
+
+    if settings.STARTUP_WARMUP not in ("eager", "background", "off"):
+        raise ValueError(f"STARTUP_WARMUP không hợp lệ: {settings.STARTUP_WARMUP}")
+    handlers = discover_handlers(lazy=settings.STARTUP_WARMUP != "eager")
+    logger.info(
+        "Registered API handlers: %s",
+        ", ".join(f"v{version}/{name}" for version, names in handlers.items() for name in names)
+    )
+    if settings.STARTUP_WARMUP == "background":
+        threading.Thread(target=warm_up, args=(handlers, logger), name="warm-up", daemon=True).start()
+
     @app.route('/api/v<version>/<string:name>', methods=['GET', 'POST'])
     def handle_api_request(version, name):  # noqa
         """Xử lý các API request"""
-        logger.info(f"Processing {request.method} request for API v{version}/{name}")
-        
+        logger.info("Processing %s request for API v%s/%s", request.method, version, name)
+
         # Xác định handler cho API
-        module_name = f'API.v{version}.{name}'
-        logger.debug(f"Importing module: {module_name}")
-        
-        try:
-            module = importlib.import_module(module_name)
-        except ModuleNotFoundError:
-            logger.error(f"API not found: {module_name}")
+        handler = handlers.get(version, {}).get(name)
+        if handler is None:
+            logger.error("API not found: v%s/%s", version, name)
             raise APIError(f"API v{version}/{name} not found", status_code=404)
-            
+
         # Lấy tham số từ request
         args = request.args
-        argv = request.json if request.method == 'POST' else {}
-        logger.debug(f"Request parameters - args: {args}, body: {argv}")
+        if request.method != 'POST':
+            argv = {}
+        elif request.mimetype == 'multipart/form-data':
+            # File tải lên nằm trong request.files, các tham số khác trong trường "json"
+            argv = get_form_parameters(request)
+        else:
+            argv = request.json
+        logger.debug("Request parameters - args: %s, body: %s", args, argv)
 
         # Gọi hàm xử lý request
         logger.info("Calling handler function")
-        result = module.handle_request(request, args, argv)
-        
-        return make_response(result) 
\ No newline at end of file
+        result = handler(request, args, argv)
+
+        # Handler đã tự tạo response (file, stream, (body, status, headers)): trả về nguyên vẹn
+        if isinstance(result, (Response, tuple)):
+            return result
+        return make_response(result)
\ No newline at end of file
@@ -0,0 +1,479 @@
+"""
+Tự động xếp lịch: tìm các cách chọn lớp học phần (và nhóm TH/BT) cho một danh sách môn học
+sao cho không có buổi học nào trùng giờ, rồi xếp hạng theo ưu tiên của người dùng.
+
+Lịch học trong tuần của mỗi lựa chọn được mã hóa thành một bitset (int), mỗi bit là một tiết
+của một thứ (theo bảng tiết học config/time.csv), nên kiểm tra trùng giờ chỉ là một phép AND.
+
+Tìm kiếm theo chiều sâu:
+    - Môn có ít lựa chọn nhất được xét trước
+    - Sau mỗi lựa chọn, bỏ nhánh nếu còn môn nào không còn lựa chọn hợp lệ
+    - Chỉ giữ top_k phương án tốt nhất; bỏ nhánh nếu cận trên của điểm không vượt qua phương án kém nhất
+    - Các nhánh ở mức trên cùng được chia cho một process pool dùng chung (tạo khi dùng lần đầu)
+"""
+import atexit
+import heapq
+import math
+import uuid
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from classes.subject import DetailedClass, Lesson, Timetable
+from config import settings
+
+WEEKDAYS = 7
+# Nhóm học chung của cả lớp; các nhóm khác (TH/BT) chỉ chọn một
+COMMON_GROUPS = ("CL", "")
+
+@dataclass(slots=True)
+class Preferences:
+    """
+    Trọng số các ưu tiên khi xếp hạng phương án (không âm).
+
+    Điểm = free_day * số ngày trống
+           - early_start * tổng số tiết tính từ tiết bắt đầu tới tiết cuối cùng của bảng tiết học, trên mỗi ngày học
+           - gap * tổng số tiết trống giữa các buổi trong ngày
+           - avoid_day * số ngày trong avoid_days phải đi học
+
+    Attributes:
+        free_day (float): Thưởng cho mỗi ngày không phải đi học.
+        early_start (float): Phạt cho việc bắt đầu sớm (mỗi tiết sớm hơn tiết cuối cùng của bảng tiết học).
+        gap (float): Phạt cho mỗi tiết trống giữa hai buổi học trong cùng một ngày.
+        avoid_day (float): Phạt cho mỗi ngày trong avoid_days phải đi học.
+        avoid_days (tuple[int, ...]): Các thứ muốn được nghỉ (0: Thứ 2, ..., 6: Chủ nhật).
+    """
+    free_day: float = 1.0
+    early_start: float = 0.05
+    gap: float = 0.2
+    avoid_day: float = 2.0
+    avoid_days: tuple[int, ...] = ()
+
+    def __post_init__(self):
+        for name in ("free_day", "early_start", "gap", "avoid_day"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"Trọng số {name} không được âm")
+        self.avoid_days = tuple(sorted(set(self.avoid_days)))
+        if any(not 0 <= day < WEEKDAYS for day in self.avoid_days):
+            raise ValueError(f"avoid_days không hợp lệ: {self.avoid_days}")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Preferences":
+        """
+        Đọc ưu tiên từ request body.
+
+        Args:
+            data (dict): Các trọng số và avoid_days (thiếu thì dùng mặc định)
+
+        Returns:
+            Preferences: Ưu tiên đã kiểm tra
+
+        Raises:
+            ValueError: Nếu có trường lạ, trọng số âm hoặc thứ không hợp lệ
+        """
+        known = {"free_day", "early_start", "gap", "avoid_day", "avoid_days"}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Ưu tiên không hợp lệ: {', '.join(sorted(unknown))}")
+        values = {name: float(value) for name, value in data.items() if name != "avoid_days"}
+        return cls(**values, avoid_days=tuple(int(day) for day in data.get("avoid_days", ())))
+
+@dataclass(slots=True, frozen=True)
+class Option:
+    """
+    Một lựa chọn cho một môn học: lớp học phần và nhóm TH/BT.
+
+    Attributes:
+        class_id (str): Mã lớp học phần.
+        group (str | None): Nhóm TH/BT đã chọn, None nếu lớp không chia nhóm.
+        mask (int): Các tiết phải đi học trong tuần (bitset).
+    """
+    class_id: str
+    group: str | None
+    mask: int
+
+@dataclass(slots=True)
+class Candidate:
+    """
+    Một phương án xếp lịch không trùng giờ.
+
+    Attributes:
+        score (float): Điểm theo Preferences (càng cao càng tốt).
+        options (tuple[Option, ...]): Lựa chọn cho từng môn, theo thứ tự của subject_ids.
+        occupancy (int): Các tiết phải đi học trong tuần (bitset).
+    """
+    score: float
+    options: tuple[Option, ...]
+    occupancy: int
+
+@dataclass(slots=True)
+class SearchResult:
+    """
+    Kết quả tìm kiếm.
+
+    Attributes:
+        candidates (list[Candidate]): Các phương án tốt nhất, điểm giảm dần.
+        nodes (int): Số nút đã duyệt.
+        complete (bool): False nếu dừng sớm vì vượt quá max_nodes.
+        missing_subjects (list[str]): Các môn không có lớp học phần hợp lệ nào.
+    """
+    candidates: list[Candidate] = field(default_factory=list)
+    nodes: int = 0
+    complete: bool = True
+    missing_subjects: list[str] = field(default_factory=list)
+
+class OccupancyEncoder:
+    """
+    Mã hóa buổi học thành bitset theo bảng tiết học: bit (thứ * số tiết + tiết - 1).
+    """
+    def __init__(self, timetable: Timetable):
+        """
+        Args:
+            timetable (Timetable): Bảng tham chiếu thời gian tiết học
+        """
+        periods = timetable.snapshot().periods
+        self.periods = max(periods)
+        self._slots = sorted((num - 1, period.start, period.end) for num, period in periods.items())
+        self._cache: dict[tuple, int] = {}
+
+    def lesson_mask(self, lesson: Lesson) -> int:
+        """
+        Các tiết mà buổi học chiếm (mọi tiết có thời gian giao với buổi học).
+        """
+        key = (lesson.weekday, lesson.period.start, lesson.period.end)
+        mask = self._cache.get(key)
+        if mask is None:
+            offset = lesson.weekday * self.periods
+            mask = 0
+            for index, start, end in self._slots:
+                if start < lesson.period.end and lesson.period.start < end:
+                    mask |= 1 << (offset + index)
+            self._cache[key] = mask
+        return mask
+
+    def class_options(self, class_: DetailedClass) -> list[Option]:
+        """
+        Các lựa chọn của một lớp học phần: buổi học chung kèm từng nhóm TH/BT.
+
+        Lựa chọn có buổi học tự trùng giờ với nhau bị bỏ qua.
+        """
+        common, groups = 0, {}
+        valid = True
+        for lesson in class_.lessons:
+            mask = self.lesson_mask(lesson)
+            if not isinstance(lesson.group, str) or lesson.group in COMMON_GROUPS:
+                valid = valid and not common & mask
+                common |= mask
+            else:
+                groups.setdefault(lesson.group, []).append(mask)
+        if not valid:
+            return []
+        if not groups:
+            return [Option(class_.id, None, common)]
+
+        options = []
+        for group, masks in groups.items():
+            occupancy = common
+            for mask in masks:
+                if occupancy & mask:
+                    break
+                occupancy |= mask
+            else:
+                options.append(Option(class_.id, group, occupancy))
+        return options
+
+def _evaluate(occupancy: int, periods: int, preferences: Preferences, bound: bool = False) -> float:
+    """
+    Điểm của một lịch học trong tuần.
+
+    Với bound=True trả về cận trên của điểm mọi lịch chứa lịch này: số ngày trống chỉ giảm,
+    phạt bắt đầu sớm và phạt ngày muốn nghỉ chỉ tăng khi thêm buổi học, còn phạt tiết trống
+    có thể giảm nên được bỏ qua.
+    """
+    full = (1 << periods) - 1
+    free_days = early = gaps = avoided = 0
+    for day in range(WEEKDAYS):
+        bits = (occupancy >> (day * periods)) & full
+        if not bits:
+            free_days += 1
+            continue
+        first = (bits & -bits).bit_length() - 1
+        early += periods - 1 - first
+        if not bound:
+            gaps += bits.bit_length() - first - bits.bit_count()
+        if day in preferences.avoid_days:
+            avoided += 1
+    # Làm tròn để các phương án bằng điểm không lệch nhau vì sai số dấu phẩy động
+    return round(
+        preferences.free_day * free_days
+        - preferences.early_start * early
+        - preferences.gap * gaps
+        - preferences.avoid_day * avoided,
+        9
+    )
+
+class _Scorer:
+    """
+    Tính điểm bằng bảng tra: điểm của mỗi ngày chỉ phụ thuộc vào các bit của ngày đó.
+    """
+    # Bảng tra có 2^periods phần tử cho mỗi loại ngày
+    MAX_TABLE_PERIODS = 16
+
+    def __init__(self, periods: int, preferences: Preferences):
+        self.periods = periods
+        self.preferences = preferences
+        self._full = (1 << periods) - 1
+        self._days = [(day * periods, day in preferences.avoid_days) for day in range(WEEKDAYS)]
+        self._tables: dict[tuple[bool, bool], list[float]] = {}
+        if periods > self.MAX_TABLE_PERIODS:
+            return
+
+        early_penalties = [0.0] * (1 << periods)
+        gap_penalties = [0.0] * (1 << periods)
+        for bits in range(1, 1 << periods):
+            first = (bits & -bits).bit_length() - 1
+            early_penalties[bits] = preferences.early_start * (periods - 1 - first)
+            gap_penalties[bits] = preferences.gap * (bits.bit_length() - first - bits.bit_count())
+        for avoided in {avoided for _, avoided in self._days}:
+            busy_penalty = preferences.avoid_day if avoided else 0.0
+            bound_table = [-early - busy_penalty for early in early_penalties]
+            bound_table[0] = preferences.free_day
+            score_table = [early - gap for early, gap in zip(bound_table, gap_penalties)]
+            score_table[0] = preferences.free_day
+            self._tables[(avoided, True)] = bound_table
+            self._tables[(avoided, False)] = score_table
+
+    def __call__(self, occupancy: int, bound: bool = False) -> float:
+        if not self._tables:
+            return _evaluate(occupancy, self.periods, self.preferences, bound)
+        full = self._full
+        tables = self._tables
+        return sum(tables[(avoided, bound)][(occupancy >> shift) & full] for shift, avoided in self._days)
+
+class _Search:
+    """
+    Tìm kiếm theo chiều sâu trên các môn đã sắp xếp (chạy trong tiến trình chính hoặc tiến trình con).
+
+    Ở mỗi mức, các lựa chọn có cận trên cao hơn được thử trước để sớm có phương án tốt, giúp
+    cắt được nhiều nhánh hơn. floor là điểm tối thiểu đã biết của top_k (từ lần tìm trước),
+    các nhánh có cận trên thấp hơn floor bị bỏ qua ngay.
+    """
+    def __init__(self, masks: list[list[int]], scorer: _Scorer, top_k: int, max_nodes: int, floor: float = -math.inf):
+        self.masks = masks
+        self.scorer = scorer
+        self.top_k = top_k
+        self.max_nodes = max_nodes
+        self.floor = floor
+        self.nodes = 0
+        self.complete = True
+        self._heap: list[tuple[float, tuple[int, ...], int]] = []
+
+    def run(self, prefix: tuple[int, ...], occupancy: int) -> list[tuple[float, tuple[int, ...], int]]:
+        self._visit(len(prefix), list(prefix), occupancy)
+        return self._heap
+
+    def _pruned(self, bound: float) -> bool:
+        heap = self._heap
+        return bound < self.floor or (len(heap) >= self.top_k and bound <= heap[0][0])
+
+    def _visit(self, depth: int, chosen: list[int], occupancy: int) -> None:
+        if self.nodes >= self.max_nodes:
+            self.complete = False
+            return
+        self.nodes += 1
+        # Mọi môn còn lại phải còn ít nhất một lựa chọn không trùng giờ
+        for options in self.masks[depth + 1:]:
+            if all(occupancy & mask for mask in options):
+                return
+        heap = self._heap
+        if depth == len(self.masks):
+            entry = (self.scorer(occupancy), tuple(chosen), occupancy)
+            if entry[0] < self.floor:
+                return
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+            return
+
+        children = []
+        for index, mask in enumerate(self.masks[depth]):
+            if occupancy & mask:
+                continue
+            next_occupancy = occupancy | mask
+            bound = self.scorer(next_occupancy, bound=True)
+            children.append((-bound, index, next_occupancy))
+        children.sort()
+
+        for negative_bound, index, next_occupancy in children:
+            if self._pruned(-negative_bound):
+                # Các lựa chọn sau có cận trên không cao hơn
+                return
+            chosen.append(index)
+            self._visit(depth + 1, chosen, next_occupancy)
+            chosen.pop()
+            if not self.complete:
+                return
+
+# Process pool dùng chung cho mọi lần tìm kiếm, SCHEDULER_MAX_WORKERS tiến trình
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=settings.SCHEDULER_MAX_WORKERS)
+    return _pool
+
+def shutdown_pool(wait: bool = True) -> None:
+    """
+    Dừng process pool dùng chung (nếu đã tạo).
+
+    Args:
+        wait (bool): Chờ các nhánh đang tìm hoàn tất
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+atexit.register(shutdown_pool, False)
+
+# Các bài toán gần đây trong mỗi tiến trình con (mã lần tìm -> masks, _Scorer), để không tạo lại
+# bảng tra của _Scorer cho từng nhánh của cùng một lần tìm
+_worker_problems: dict[str, tuple[list[list[int]], _Scorer]] = {}
+_WORKER_PROBLEMS_MAX = 4
+
+def _search_branch(
+    token: str,
+    problem: tuple[list[list[int]], int, Preferences],
+    top_k: int,
+    floor: float,
+    max_nodes: int,
+    prefix: tuple[int, ...],
+    occupancy: int
+) -> tuple[list, int, bool]:
+    cached = _worker_problems.get(token)
+    if cached is None:
+        masks, periods, preferences = problem
+        cached = (masks, _Scorer(periods, preferences))
+        if len(_worker_problems) >= _WORKER_PROBLEMS_MAX:
+            _worker_problems.pop(next(iter(_worker_problems)))
+        _worker_problems[token] = cached
+    search = _Search(cached[0], cached[1], top_k, max_nodes, floor)
+    heap = search.run(prefix, occupancy)
+    return heap, search.nodes, search.complete
+
+def _split(masks: list[list[int]], target: int) -> list[tuple[tuple[int, ...], int]]:
+    """
+    Chia cây tìm kiếm thành các nhánh (tiền tố lựa chọn) cho tới khi có ít nhất target nhánh.
+    """
+    branches: list[tuple[tuple[int, ...], int]] = [((), 0)]
+    depth = 0
+    while len(branches) < target and depth < len(masks):
+        branches = [
+            (prefix + (index,), occupancy | mask)
+            for prefix, occupancy in branches
+            for index, mask in enumerate(masks[depth])
+            if not occupancy & mask
+        ]
+        depth += 1
+    return branches
+
+def find_combinations(
+    classes: list[DetailedClass],
+    subject_ids: list[str],
+    timetable: Timetable,
+    preferences: Preferences | None = None,
+    top_k: int = 10,
+    max_workers: int | None = None,
+    max_nodes: int | None = None
+) -> SearchResult:
+    """
+    Tìm các phương án chọn lớp học phần không trùng giờ cho các môn học.
+
+    Args:
+        classes (list[DetailedClass]): Các lớp học phần của các môn cần xếp
+        subject_ids (list[str]): Mã các môn học (Mã học phần)
+        timetable (Timetable): Bảng tham chiếu thời gian tiết học
+        preferences (Preferences | None): Trọng số ưu tiên, mặc định Preferences()
+        top_k (int): Số phương án tốt nhất cần giữ
+        max_workers (int | None): Số tiến trình con dự kiến, dùng để chia nhánh, mặc định SCHEDULER_MAX_WORKERS
+            (1 là không dùng pool). Các nhánh chạy trên process pool dùng chung có SCHEDULER_MAX_WORKERS tiến trình
+        max_nodes (int | None): Tổng số nút tối đa được duyệt (cả bước tuần tự và mọi nhánh),
+            mặc định SCHEDULER_MAX_NODES
+
+    Returns:
+        SearchResult: Các phương án tốt nhất (điểm giảm dần; cùng điểm thì theo thứ tự duyệt)
+
+    Raises:
+        ValueError: Nếu top_k không dương
+    """
+    if top_k <= 0:
+        raise ValueError("top_k phải lớn hơn 0")
+    preferences = preferences or Preferences()
+    max_workers = max_workers or settings.SCHEDULER_MAX_WORKERS
+    max_nodes = max_nodes or settings.SCHEDULER_MAX_NODES
+    encoder = OccupancyEncoder(timetable)
+
+    subject_ids = list(dict.fromkeys(subject_ids))
+    options_by_subject: dict[str, list[Option]] = {subject_id: [] for subject_id in subject_ids}
+    for class_ in classes:
+        if class_.subject.id in options_by_subject:
+            options_by_subject[class_.subject.id].extend(encoder.class_options(class_))
+
+    result = SearchResult(missing_subjects=[subject_id for subject_id, options in options_by_subject.items() if not options])
+    if result.missing_subjects or not subject_ids:
+        return result
+
+    # Môn có ít lựa chọn nhất được xét trước
+    order = sorted(range(len(subject_ids)), key=lambda index: len(options_by_subject[subject_ids[index]]))
+    options = [options_by_subject[subject_ids[index]] for index in order]
+    masks = [[option.mask for option in subject_options] for subject_options in options]
+
+    # Tìm tuần tự trước với ít nút: bài toán nhỏ xong ngay (không tốn chi phí gửi sang process pool),
+    # bài toán lớn có sẵn điểm sàn để các nhánh song song cắt bớt
+    parallel = max_workers > 1
+    sequential_nodes = min(max_nodes, settings.SCHEDULER_SEQUENTIAL_NODES) if parallel else max_nodes
+    search = _Search(masks, _Scorer(encoder.periods, preferences), top_k, sequential_nodes)
+    heap = search.run((), 0)
+    result.nodes, result.complete = search.nodes, search.complete
+
+    branches = _split(masks, max_workers * 4) if parallel and not search.complete and sequential_nodes < max_nodes else []
+    if branches:
+        floor = heap[0][0] if len(heap) >= top_k else -math.inf
+        # Chia số nút còn lại cho các nhánh, để tổng số nút không vượt quá max_nodes;
+        # nhánh không còn nút nào thì không được duyệt (kết quả không đầy đủ)
+        remaining = max_nodes - search.nodes
+        share, extra = divmod(remaining, len(branches))
+        budgets = [share + (index < extra) for index in range(len(branches))]
+        # Giữ các ứng viên đã tìm được ở bước tuần tự, gộp thêm kết quả của các nhánh
+        result.complete = all(budgets)
+        branches = [branch for branch, budget in zip(branches, budgets) if budget]
+        budgets = [budget for budget in budgets if budget]
+        count = len(branches)
+        for branch_heap, nodes, complete in _get_pool().map(
+            _search_branch,
+            [uuid.uuid4().hex] * count, [(masks, encoder.periods, preferences)] * count, [top_k] * count,
+            [floor] * count, budgets, *zip(*branches),
+            chunksize=max(1, count // (max_workers * 4))
+        ):
+            heap.extend(branch_heap)
+            result.nodes += nodes
+            result.complete = result.complete and complete
+
+        # Các nhánh có thể tìm lại những tổ hợp đã có từ bước tuần tự
+        heap = list({chosen: (score, chosen, occupancy) for score, chosen, occupancy in heap}.values())
+
+    # Điểm dùng khi tìm kiếm (bảng tra) có thể lệch vài ulp so với _evaluate, nên làm tròn khi xếp hạng
+    heap.sort(key=lambda entry: (-round(entry[0], 6), entry[1]))
+    position = {subject_index: depth for depth, subject_index in enumerate(order)}
+    for _, chosen, occupancy in heap[:top_k]:
+        result.candidates.append(Candidate(
+            score=_evaluate(occupancy, encoder.periods, preferences),
+            options=tuple(options[position[index]][chosen[position[index]]] for index in range(len(subject_ids))),
+            occupancy=occupancy
+        ))
+    return result
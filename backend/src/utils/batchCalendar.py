@@ -0,0 +1,159 @@
+"""
+Tạo lịch hàng loạt cho nhiều sinh viên dùng chung một file Thời khóa biểu.
+
+File Thời khóa biểu chỉ được đọc một lần ở tiến trình chính. Các lớp học phần được gửi
+một lần cho mỗi tiến trình con (qua initializer), sau đó việc đọc file đăng ký, đối chiếu
+lớp học và xuất iCalendar của từng sinh viên được chia ra một process pool.
+"""
+import os
+import json
+import zipfile
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
+from classes.subject import DetailedClass
+from config import settings
+from utils.getClass import get_schedule, get_simplified_classes
+from utils.makeCalendar import export_calendar
+
+@dataclass
+class BatchItem:
+    """
+    Kết quả tạo lịch cho một file đăng ký.
+
+    Attributes:
+        name (str): Tên file .ics (không trùng nhau trong một batch).
+        registered_file (str): Đường dẫn đến file đăng ký học.
+        data (bytes | None): Nội dung file .ics, None nếu có lỗi.
+        error (str | None): Thông báo lỗi, None nếu thành công.
+    """
+    name: str
+    registered_file: str
+    data: bytes | None = None
+    error: str | None = None
+
+# Dữ liệu dùng chung trong mỗi tiến trình con
+_worker_classes: dict[str, DetailedClass | Exception] = {}
+_worker_order: dict[str, int] = {}
+_worker_options: dict = {}
+
+def _init_worker(classes: dict[str, DetailedClass | Exception], order: dict[str, int], options: dict) -> None:
+    global _worker_classes, _worker_order, _worker_options
+    _worker_classes, _worker_order, _worker_options = classes, order, options
+
+def _render(registered_file: str, registered_id_header: str) -> bytes:
+    """
+    Tạo file .ics cho một file đăng ký (chạy trong tiến trình con).
+
+    Raises:
+        ValueError: Nếu không tìm thấy lớp học trong file đăng ký hoặc thời khóa biểu
+    """
+    simple_classes = get_simplified_classes(registered_file, registered_id_header)
+    if not simple_classes:
+        raise ValueError('Không tìm thấy thông tin lớp học trong file đăng ký')
+
+    class_ids = [class_id for class_id in dict.fromkeys(class_.id for class_ in simple_classes) if class_id in _worker_classes]
+    class_ids.sort(key=_worker_order.__getitem__)
+    detailed_classes = []
+    for class_id in class_ids:
+        class_ = _worker_classes[class_id]
+        if isinstance(class_, Exception):
+            raise class_
+        detailed_classes.append(class_)
+    if not detailed_classes:
+        raise ValueError('Không tìm thấy thông tin lớp học trong file thời khóa biểu')
+
+    return export_calendar(detailed_classes, **_worker_options).encode("utf-8")
+
+def _render_safely(registered_file: str, registered_id_header: str) -> tuple[bytes | None, str | None]:
+    try:
+        return _render(registered_file, registered_id_header), None
+    except Exception as error:
+        return None, f"{type(error).__name__}: {error}"
+
+def _unique_names(registered_files: list[str]) -> list[str]:
+    names, used = [], set()
+    for registered_file in registered_files:
+        base = os.path.splitext(os.path.basename(registered_file))[0] or "calendar"
+        name, suffix = f"{base}.ics", 1
+        while name in used:
+            suffix += 1
+            name = f"{base}_{suffix}.ics"
+        used.add(name)
+        names.append(name)
+    return names
+
+def generate_calendars(
+    schedule_file: str | list,
+    registered_files: list[str],
+    options: dict,
+    schedule_id_header: str = "Mã lớp",
+    registered_id_header: str = "Lớp môn học",
+    max_workers: int | None = None
+) -> list[BatchItem]:
+    """
+    Tạo lịch cho nhiều file đăng ký học dùng chung một file Thời khóa biểu.
+
+    Lỗi của từng file được ghi vào BatchItem.error thay vì làm dừng cả batch.
+
+    Args:
+        schedule_file (str | list): Đường dẫn đến file Thời khóa biểu, hoặc danh sách file/sheet (xem get_schedule)
+        registered_files (list[str]): Danh sách đường dẫn đến các file đăng ký học
+        options (dict): Tham số tạo lịch (xem utils.makeCalendar.parse_calendar_options)
+        schedule_id_header (str): Tên cột chứa Mã Lớp học phần trong Thời khóa biểu
+        registered_id_header (str): Tên cột chứa Mã Lớp học phần trong file đăng ký
+        max_workers (int | None): Số tiến trình con, mặc định BATCH_MAX_WORKERS
+
+    Returns:
+        list[BatchItem]: Kết quả theo đúng thứ tự của registered_files
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file Thời khóa biểu
+        ValueError: Nếu file Thời khóa biểu không hợp lệ
+    """
+    schedule = get_schedule(schedule_file, schedule_id_header)
+    classes: dict[str, DetailedClass | Exception] = {}
+    order: dict[str, int] = {}
+    for position, class_id in enumerate(sorted(schedule, key=lambda class_id: schedule.index[class_id][0])):
+        order[class_id] = position
+        try:
+            classes[class_id] = schedule.get_class(class_id)
+        except Exception as error:
+            classes[class_id] = error
+
+    items = [
+        BatchItem(name=name, registered_file=registered_file)
+        for name, registered_file in zip(_unique_names(registered_files), registered_files)
+    ]
+    workers = min(max_workers or settings.BATCH_MAX_WORKERS, len(items))
+    if workers <= 1:
+        _init_worker(classes, order, options)
+        results = [_render_safely(item.registered_file, registered_id_header) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(classes, order, options)) as executor:
+            results = list(executor.map(
+                _render_safely,
+                [item.registered_file for item in items],
+                [registered_id_header] * len(items),
+                chunksize=max(1, len(items) // (workers * 4))
+            ))
+
+    for item, (data, error) in zip(items, results):
+        item.data, item.error = data, error
+    return items
+
+def write_zip(items: list[BatchItem], file: str | BinaryIO) -> None:
+    """
+    Ghi kết quả batch ra file zip: mỗi sinh viên một file .ics, kèm errors.json nếu có lỗi.
+
+    Args:
+        items (list[BatchItem]): Kết quả của generate_calendars
+        file (str | BinaryIO): Đường dẫn hoặc file object để ghi
+    """
+    errors = {item.name: {'registered_file': item.registered_file, 'error': item.error} for item in items if item.error}
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for item in items:
+            if item.data is not None:
+                archive.writestr(item.name, item.data)
+        if errors:
+            archive.writestr("errors.json", json.dumps(errors, ensure_ascii=False, indent=2))
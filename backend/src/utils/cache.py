@@ -0,0 +1,258 @@
+import os
+import hashlib
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+def file_fingerprint(file_path: str, mode: str = "stat") -> tuple:
+    """
+    Tạo dấu vân tay (fingerprint) của một file để làm khóa cache.
+
+    Args:
+        file_path (str): Đường dẫn đến file
+        mode (str): "stat" để dùng mtime + kích thước, "hash" để băm toàn bộ nội dung
+
+    Returns:
+        tuple: (đường dẫn tuyệt đối, mtime_ns, kích thước) hoặc (đường dẫn tuyệt đối, mã băm nội dung)
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu mode không hợp lệ
+    """
+    path = os.path.abspath(file_path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Không tìm thấy file: {file_path}")
+
+    if mode == "stat":
+        return (path, stat.st_mtime_ns, stat.st_size)
+    if mode == "hash":
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return (path, digest.hexdigest())
+    raise ValueError(f"Chế độ fingerprint không hợp lệ: {mode}")
+
+def content_fingerprint(data: bytes) -> tuple:
+    """
+    Tạo dấu vân tay cho nội dung file không có đường dẫn (ví dụ: file tải lên).
+
+    Args:
+        data (bytes): Nội dung file
+
+    Returns:
+        tuple: ("<content>", mã băm nội dung)
+    """
+    return ("<content>", hashlib.blake2b(data, digest_size=16).hexdigest())
+
+class LRUCache:
+    """
+    Cache LRU an toàn luồng, giới hạn theo số phần tử và tổng kích thước (byte).
+
+    Mỗi phần tử có một kích thước ước lượng; khi vượt quá một trong hai giới hạn,
+    các phần tử ít được dùng gần đây nhất sẽ bị loại bỏ.
+
+    Attributes:
+        max_entries (int): Số phần tử tối đa.
+        max_bytes (int): Tổng kích thước tối đa (byte).
+        hits (int): Số lần tìm thấy trong cache.
+        misses (int): Số lần không tìm thấy trong cache.
+        evictions (int): Số phần tử đã bị loại bỏ.
+    """
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Lấy giá trị theo khóa và đánh dấu là vừa được sử dụng.
+
+        Args:
+            key (Hashable): Khóa cần tìm
+            default (Any): Giá trị trả về nếu không tìm thấy
+
+        Returns:
+            Any: Giá trị trong cache hoặc default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """
+        Thêm hoặc thay thế một phần tử.
+
+        Phần tử có kích thước lớn hơn max_bytes sẽ không được lưu.
+
+        Args:
+            key (Hashable): Khóa
+            value (Any): Giá trị
+            size (int): Kích thước ước lượng của giá trị (byte)
+        """
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            self._entries[key] = (value, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], tuple[Any, int]]) -> Any:
+        """
+        Lấy giá trị theo khóa, nếu không có thì gọi loader để tạo và lưu lại.
+
+        Loader được gọi ngoài khóa (lock) để không chặn các request khác trong lúc đọc file.
+
+        Args:
+            key (Hashable): Khóa
+            loader (Callable[[], tuple[Any, int]]): Hàm trả về (giá trị, kích thước)
+
+        Returns:
+            Any: Giá trị tương ứng với khóa
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        value, size = loader()
+        self.put(key, value, size)
+        return value
+
+    def discard_if(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Xóa các phần tử có khóa thỏa mãn điều kiện.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Điều kiện trên khóa
+
+        Returns:
+            int: Số phần tử đã xóa
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    def discard(self, key: Hashable) -> bool:
+        """
+        Xóa một phần tử.
+
+        Args:
+            key (Hashable): Khóa
+
+        Returns:
+            bool: True nếu phần tử tồn tại
+        """
+        with self._lock:
+            found = key in self._entries
+            self._discard(key)
+            return found
+
+    def items(self) -> list[tuple[Hashable, Any, int]]:
+        """
+        Các phần tử hiện có, từ ít tới nhiều được dùng gần đây (không tính là hit).
+
+        Returns:
+            list[tuple[Hashable, Any, int]]: Các bộ (khóa, giá trị, kích thước)
+        """
+        with self._lock:
+            return [(key, value, size) for key, (value, size) in self._entries.items()]
+
+    def clear(self) -> None:
+        """
+        Xóa toàn bộ cache (không đặt lại bộ đếm).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        Thống kê hoạt động của cache.
+
+        Returns:
+            dict: Số phần tử, tổng kích thước, số lần hit/miss và số phần tử đã bị loại bỏ
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+class ExpiringCache:
+    """
+    Cache LRU mà mỗi phần tử hết hạn sau ttl giây kể từ khi được thêm.
+
+    Phần tử hết hạn bị xóa khi được đọc tới, hoặc bị loại bỏ theo LRU như LRUCache.
+
+    Attributes:
+        ttl (float): Thời gian sống của mỗi phần tử (giây).
+    """
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Lấy giá trị theo khóa nếu chưa hết hạn.
+
+        Args:
+            key (Hashable): Khóa cần tìm
+            default (Any): Giá trị trả về nếu không tìm thấy hoặc đã hết hạn
+
+        Returns:
+            Any: Giá trị trong cache hoặc default
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if time.monotonic() >= expires:
+            self._cache.discard(key)
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """
+        Thêm hoặc thay thế một phần tử, hết hạn sau ttl giây.
+
+        Args:
+            key (Hashable): Khóa
+            value (Any): Giá trị
+            size (int): Kích thước ước lượng của giá trị (byte)
+        """
+        self._cache.put(key, (time.monotonic() + self.ttl, value), size)
@@ -0,0 +1,155 @@
+"""
+Chỉ mục khoảng thời gian theo từng thứ trong tuần, để tìm các buổi học trùng giờ và trả lời
+câu hỏi "có rảnh vào thứ X từ T1 đến T2 không".
+
+- conflicts(): quét các buổi học đã sắp theo giờ bắt đầu, O(n log n + k) với k cặp buổi học giao nhau
+- is_free(): tìm nhị phân trên các khoảng bận đã gộp, O(log n)
+- free_slots(): các khoảng trống trong một ngày
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import time
+from classes.subject import DetailedClass, Lesson
+
+DAY_START = time(0, 0)
+DAY_END = time(23, 59, 59)
+
+@dataclass(slots=True, frozen=True)
+class Booking:
+    """
+    Một buổi học trong chỉ mục.
+
+    Attributes:
+        class_ (DetailedClass): Lớp học phần.
+        lesson (Lesson): Buổi học.
+    """
+    class_: DetailedClass
+    lesson: Lesson
+
+    @property
+    def start(self) -> time:
+        return self.lesson.period.start
+
+    @property
+    def end(self) -> time:
+        return self.lesson.period.end
+
+@dataclass(slots=True, frozen=True)
+class Conflict:
+    """
+    Hai buổi học của hai lớp khác nhau có thời gian giao nhau.
+
+    Attributes:
+        weekday (int): Thứ (0: Thứ 2, ..., 6: Chủ nhật).
+        first (Booking): Buổi học bắt đầu trước.
+        second (Booking): Buổi học bắt đầu sau (hoặc cùng lúc).
+    """
+    weekday: int
+    first: Booking
+    second: Booking
+
+class TimetableIndex:
+    """
+    Chỉ mục các buổi học theo thứ, sắp theo giờ bắt đầu.
+
+    Các buổi học của cùng một lớp (ví dụ các nhóm TH khác nhau) không được coi là trùng nhau.
+    Giờ kết thúc của buổi này trùng giờ bắt đầu của buổi kia không phải là trùng giờ.
+    """
+    def __init__(self, detailed_classes: list[DetailedClass]):
+        """
+        Args:
+            detailed_classes (list[DetailedClass]): Danh sách chi tiết các lớp học phần
+        """
+        self._bookings: dict[int, list[Booking]] = {}
+        for class_ in detailed_classes:
+            for lesson in class_.lessons:
+                self._bookings.setdefault(lesson.weekday, []).append(Booking(class_, lesson))
+
+        # Các khoảng bận đã gộp (rời nhau, tăng dần) của mỗi thứ, cho is_free/free_slots
+        self._busy_starts: dict[int, list[time]] = {}
+        self._busy_ends: dict[int, list[time]] = {}
+        for weekday, bookings in self._bookings.items():
+            bookings.sort(key=lambda booking: (booking.start, booking.end))
+            starts, ends = [], []
+            for booking in bookings:
+                if ends and booking.start <= ends[-1]:
+                    ends[-1] = max(ends[-1], booking.end)
+                else:
+                    starts.append(booking.start)
+                    ends.append(booking.end)
+            self._busy_starts[weekday] = starts
+            self._busy_ends[weekday] = ends
+
+    def bookings(self, weekday: int) -> list[Booking]:
+        """
+        Các buổi học của một thứ, sắp theo giờ bắt đầu.
+        """
+        return list(self._bookings.get(weekday, []))
+
+    def conflicts(self) -> list[Conflict]:
+        """
+        Tìm mọi cặp buổi học trùng giờ.
+
+        Returns:
+            list[Conflict]: Các cặp trùng giờ, theo thứ rồi theo giờ bắt đầu
+        """
+        result: list[Conflict] = []
+        for weekday in sorted(self._bookings):
+            # Các buổi đang diễn ra, theo giờ bắt đầu. Mỗi buổi còn lại sau khi lọc đều giao với buổi
+            # đang xét, nên mỗi lần lọc tốn O(số cặp giao nhau + số buổi bị bỏ đi)
+            active: list[Booking] = []
+            for booking in self._bookings[weekday]:
+                active = [other for other in active if other.end > booking.start]
+                for other in active:
+                    if other.class_.id != booking.class_.id:
+                        result.append(Conflict(weekday, other, booking))
+                active.append(booking)
+        return result
+
+    def is_free(self, weekday: int, start: time, end: time) -> bool:
+        """
+        Kiểm tra khoảng thời gian [start, end) trong một thứ có trống không.
+
+        Args:
+            weekday (int): Thứ (0: Thứ 2, ..., 6: Chủ nhật)
+            start (time): Giờ bắt đầu
+            end (time): Giờ kết thúc
+
+        Returns:
+            bool: True nếu không có buổi học nào giao với khoảng thời gian này
+
+        Raises:
+            ValueError: Nếu start không trước end
+        """
+        if start >= end:
+            raise ValueError(f"Khoảng thời gian không hợp lệ: {start} -> {end}")
+        starts = self._busy_starts.get(weekday, [])
+        # Khoảng bận cuối cùng bắt đầu trước end là khoảng duy nhất có thể giao với [start, end)
+        index = bisect_left(starts, end) - 1
+        return index < 0 or self._busy_ends[weekday][index] <= start
+
+    def free_slots(self, weekday: int, day_start: time = DAY_START, day_end: time = DAY_END) -> list[tuple[time, time]]:
+        """
+        Các khoảng trống trong một thứ, giữa day_start và day_end.
+
+        Args:
+            weekday (int): Thứ (0: Thứ 2, ..., 6: Chủ nhật)
+            day_start (time): Đầu ngày
+            day_end (time): Cuối ngày
+
+        Returns:
+            list[tuple[time, time]]: Các khoảng trống (bắt đầu, kết thúc), tăng dần
+        """
+        starts = self._busy_starts.get(weekday, [])
+        ends = self._busy_ends.get(weekday, [])
+        slots = []
+        cursor = day_start
+        for index in range(bisect_right(ends, day_start), len(starts)):
+            if starts[index] >= day_end:
+                break
+            if starts[index] > cursor:
+                slots.append((cursor, starts[index]))
+            cursor = max(cursor, ends[index])
+        if cursor < day_end:
+            slots.append((cursor, day_end))
+        return slots
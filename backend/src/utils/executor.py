@@ -0,0 +1,88 @@
+"""
+Chạy các bước tốn CPU (đọc file Thời khóa biểu, file đăng ký, xuất iCalendar) trên một executor riêng.
+
+CPU_EXECUTOR quyết định nơi chạy:
+    - "inline": chạy ngay trong luồng xử lý request (mặc định, giống server Flask đồng bộ)
+    - "thread": chạy trên thread pool, giới hạn số bước nặng chạy đồng thời
+    - "process": chạy trên process pool, không bị GIL chặn các request khác
+"""
+import atexit
+import threading
+from contextvars import copy_context
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, TypeVar
+from config import settings
+
+T = TypeVar("T")
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> Executor | None:
+    """
+    Executor dùng chung cho các bước tốn CPU (tạo khi dùng lần đầu).
+
+    Returns:
+        Executor | None: Executor theo CPU_EXECUTOR, None nếu chạy inline
+
+    Raises:
+        ValueError: Nếu CPU_EXECUTOR không hợp lệ
+    """
+    global _executor
+    mode = settings.CPU_EXECUTOR
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"CPU_EXECUTOR không hợp lệ: {mode}")
+    if mode == "inline":
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if mode == "thread":
+                    _executor = ThreadPoolExecutor(max_workers=settings.CPU_MAX_WORKERS, thread_name_prefix="cpu")
+                else:
+                    _executor = ProcessPoolExecutor(max_workers=settings.CPU_MAX_WORKERS)
+    return _executor
+
+def offload(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Chạy func trên executor tốn CPU và chờ kết quả.
+
+    Với "thread", func chạy trong bản sao context của luồng gọi, nên các bước timed() bên trong
+    vẫn được ghi vào Server-Timing của request. Với "process", func và các tham số phải pickle được,
+    các bước timed() bên trong không được ghi lại (chỉ có thời gian của cả bước ở luồng gọi), và mỗi
+    tiến trình con giữ cache riêng (utils.getClass.SCHEDULE_CACHE), nên Thời khóa biểu chỉ được đọc
+    lại lần đầu ở mỗi tiến trình.
+
+    Args:
+        func (Callable[..., T]): Hàm cần chạy
+        *args, **kwargs: Tham số của func
+
+    Returns:
+        T: Kết quả của func
+
+    Raises:
+        Exception: Lỗi do func raise được raise lại ở luồng gọi
+    """
+    executor = get_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    if isinstance(executor, ThreadPoolExecutor):
+        return executor.submit(copy_context().run, func, *args, **kwargs).result()
+    return executor.submit(func, *args, **kwargs).result()
+
+def shutdown_executor(wait: bool = True) -> None:
+    """
+    Dừng executor dùng chung (nếu đã tạo).
+
+    Args:
+        wait (bool): Chờ các bước đang chạy hoàn tất
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+atexit.register(shutdown_executor, False)
@@ -1,24 +1,158 @@
+import io
+import os
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
-from bs4.element import Tag, ResultSet
-from classes.subject import SimpleClass, DetailedClass, Subject, Lesson, Timetable
+from classes.subject import SimpleClass, DetailedClass, Timetable
+from classes.schedule import Schedule, ScheduleDiff, SCHEDULE_COLUMNS
+from config import settings
+from utils.cache import LRUCache, file_fingerprint, content_fingerprint
+from utils.registration import parse_registration, make_simple_class
+from utils.snapshot import snapshot_path, read_snapshot, write_snapshot
+from utils.upload import XLSX_MAGIC
+from utils.watcher import FileWatcher
+from utils.xlsxReader import read_schedule_rows
+from utils import metrics
+from utils.metrics import timed
 
-PERIOD_REFERENCE_FILEPATH = "../../config/time.csv"
+logger = logging.getLogger(__name__)
+
+# Không phụ thuộc thư mục làm việc
+PERIOD_REFERENCE_FILEPATH = settings.PERIOD_REFERENCE_FILE or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "config", "time.csv")
+)
 PERIOD_REFERENCE = Timetable(PERIOD_REFERENCE_FILEPATH)
 
-def get_simplified_classes(file_path: str, id_header: str) -> list[SimpleClass]:
+# Một file/sheet trong danh sách Thời khóa biểu: file (sheet đầu tiên), (file, sheet) hoặc
+# {"file": ..., "sheet": ...}; sheet là thứ tự, tên sheet hoặc "*" (mọi sheet có cột mã lớp)
+ScheduleSource = str | bytes | tuple[str | bytes, int | str] | dict
+ALL_SHEETS = "*"
+
+# Cache các thời khóa biểu đã đọc, khóa theo (fingerprint của file, id_header)
+SCHEDULE_CACHE = LRUCache(
+    max_entries=settings.SCHEDULE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.SCHEDULE_CACHE_MAX_BYTES
+)
+metrics.register_collector(lambda: [
+    ("schedule_cache_hits_total", "counter", {}, SCHEDULE_CACHE.hits),
+    ("schedule_cache_misses_total", "counter", {}, SCHEDULE_CACHE.misses),
+    ("schedule_cache_evictions_total", "counter", {}, SCHEDULE_CACHE.evictions),
+    ("schedule_cache_entries", "gauge", {}, len(SCHEDULE_CACHE)),
+])
+
+# Các hàm được gọi với phiên bản cũ khi một file Thời khóa biểu thay đổi
+_schedule_listeners: list[Callable[[str], None]] = []
+
+def on_schedule_replaced(listener: Callable[[str], None]) -> None:
+    """
+    Đăng ký hàm được gọi khi một phiên bản Thời khóa biểu bị thay thế (file đã thay đổi),
+    ví dụ để xóa các dữ liệu đã cache theo phiên bản đó.
+
+    Args:
+        listener (Callable[[str], None]): Hàm nhận phiên bản cũ (Schedule.version)
+    """
+    _schedule_listeners.append(listener)
+
+# Các hàm được gọi khi một Thời khóa biểu được thay bằng phiên bản mới của cùng file
+_change_listeners: list[Callable[[str, str, ScheduleDiff], None]] = []
+
+def on_schedule_changed(listener: Callable[[str, str, ScheduleDiff], None]) -> None:
+    """
+    Đăng ký hàm được gọi khi một Thời khóa biểu được thay bằng phiên bản mới của cùng file
+    (cùng cột mã lớp), kèm các lớp đã thay đổi, để chỉ xóa những dữ liệu đã cache của các lớp đó.
+
+    Hàm được gọi trước khi phiên bản mới được đưa vào cache. Phiên bản cũ và mới có thể giống nhau
+    khi chỉ có bảng tiết học thay đổi.
+
+    Args:
+        listener (Callable[[str, str, ScheduleDiff], None]): Hàm nhận (phiên bản cũ, phiên bản mới, khác biệt)
+    """
+    _change_listeners.append(listener)
+
+def _notify_changed(old: Schedule, new: Schedule) -> ScheduleDiff:
+    with timed("schedule.diff"):
+        diff = old.diff(new)
+    logger.info(
+        "Thời khóa biểu %s -> %s: thêm %d, xóa %d, thay đổi %d lớp",
+        old.version, new.version, len(diff.added), len(diff.removed), len(diff.changed)
+    )
+    metrics.count("schedule_classes_changed_total", len(diff.stale))
+    for listener in _change_listeners:
+        listener(old.version, new.version, diff)
+    return diff
+
+def schedule_version(fingerprint: tuple, id_header: str) -> str:
+    """
+    Phiên bản của một Thời khóa biểu đã đọc, tính từ fingerprint của file và cột mã lớp.
+
+    Args:
+        fingerprint (tuple): Kết quả của file_fingerprint hoặc content_fingerprint
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        str: Phiên bản (hex)
+    """
+    return hashlib.blake2b(repr((fingerprint, id_header)).encode("utf-8"), digest_size=8).hexdigest()
+
+def get_simplified_classes(file_path: str | bytes | BinaryIO, id_header: str) -> list[SimpleClass]:
     """
     Lấy danh sách các lớp học phần từ file Kết quả Đăng ký học
 
+    Mặc định đọc file theo kiểu luồng (utils/registration.py) và dừng ngay khi bảng cần tìm
+    kết thúc; nếu không tìm thấy bảng thì dùng BeautifulSoup như trước.
+
     Parameters:
-        file_path (str): Đường dẫn đến file Kết quả Đăng ký học
+        file_path (str | bytes | BinaryIO): Đường dẫn, nội dung (ví dụ: file tải lên) hoặc file object
+            của file Kết quả Đăng ký học
         id_header (str): Tên cột chứa Mã Lớp học phần
 
     Returns:
         list[SimpleClass]: Thông tin các lớp học phần đã đăng ký
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        html = file.read()
+    start = file_path.tell() if hasattr(file_path, "seekable") and file_path.seekable() else None
+    if settings.REGISTRATION_PARSER == "stream":
+        with timed("registration.parse"):
+            class_list = parse_registration(file_path, id_header)
+        if class_list is not None:
+            metrics.count("registration_classes_parsed_total", len(class_list))
+            return class_list
+        logger.debug("Không tìm thấy bảng '%s' khi đọc theo kiểu luồng, chuyển sang BeautifulSoup", id_header)
+        if not isinstance(file_path, (str, bytes, bytearray, memoryview)):
+            # File object đã bị đọc: chỉ đọc lại được nếu seek được
+            if start is None:
+                return []
+            file_path.seek(start)
+    with timed("registration.parse_bs4"):
+        class_list = _get_simplified_classes_bs4(file_path, id_header)
+    metrics.count("registration_classes_parsed_total", len(class_list))
+    return class_list
+
+def _get_simplified_classes_bs4(file_path: str | bytes | BinaryIO, id_header: str) -> list[SimpleClass]:
+    """
+    Lấy danh sách các lớp học phần từ file Kết quả Đăng ký học bằng cách dựng cả cây BeautifulSoup.
+
+    Parameters:
+        file_path (str | bytes | BinaryIO): Đường dẫn, nội dung hoặc file object của file Kết quả Đăng ký học
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        list[SimpleClass]: Thông tin các lớp học phần đã đăng ký
+    """
+    # Chỉ dùng khi đọc theo kiểu luồng không được, nên chỉ import khi cần
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag, ResultSet
+
+    if isinstance(file_path, str):
+        with open(file_path, "r", encoding="utf-8") as file:
+            html = file.read()
+    else:
+        data = file_path if isinstance(file_path, (bytes, bytearray, memoryview)) else file_path.read()
+        html = bytes(data).decode("utf-8") if not isinstance(data, str) else data
     soup = BeautifulSoup(html, 'html.parser')
     
     tables: ResultSet[Tag] = soup.find_all('table')
@@ -30,30 +164,13 @@ def get_simplified_classes(file_path: str, id_header: str) -> list[SimpleClass]:
     rows: ResultSet[Tag] = table.find_all('tr')
     headers: list[str] = [header_tag.get_text(strip=True) for header_tag in rows[0].find_all('th')]
 
-    # Sử dụng dict để map header với attribute
-    header_mapping = {
-        "Mã môn học": "subject.id",
-        "Môn học": "subject.name", 
-        "Lớp môn học": "id"
-    }
-
     class_list: list[SimpleClass] = []
     for row in rows[1:]:
-        class_ = SimpleClass()
-        for index, cell in enumerate(row.find_all('td')):
+        cells: list[str] = []
+        for cell in row.find_all('td'):
             assert isinstance(cell, Tag)
-            cell_text = cell.get_text(strip=True)
-            header = headers[index]
-            
-            if header in header_mapping:
-                attr = header_mapping[header]
-                if "." in attr:
-                    obj_name, attr_name = attr.split(".")
-                    setattr(getattr(class_, obj_name), attr_name, cell_text)
-                else:
-                    setattr(class_, attr, cell_text)
-                    
-        class_list.append(class_)
+            cells.append(cell.get_text(strip=True))
+        class_list.append(make_simple_class(headers, cells))
     return class_list
 
 def _standardize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -80,12 +197,13 @@ def _standardize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         df = df.iloc[:, :first_isna_after_notna]
     return df
 
-def _read_excel_file(file_path: str) -> pd.DataFrame:
+def _read_excel_file(file_path: str | BinaryIO, sheet: int | str = 0) -> pd.DataFrame:
     """
     Đọc file Excel và xử lý lỗi.
     
     Args:
-        file_path (str): Đường dẫn đến file Excel
+        file_path (str | BinaryIO): Đường dẫn đến file Excel hoặc file object (ví dụ: io.BytesIO)
+        sheet (int | str): Thứ tự hoặc tên sheet
         
     Returns:
         pd.DataFrame: DataFrame từ file Excel
@@ -95,7 +213,7 @@ def _read_excel_file(file_path: str) -> pd.DataFrame:
         ValueError: Nếu file không phải định dạng Excel
     """
     try:
-        return pd.read_excel(file_path, header=None)
+        return pd.read_excel(file_path, sheet_name=sheet, header=None)
     except FileNotFoundError:
         raise FileNotFoundError(f"Không tìm thấy file: {file_path}")
     except Exception as e:
@@ -115,20 +233,379 @@ def _find_header_row(df: pd.DataFrame, id_header: str) -> int:
     Raises:
         ValueError: Nếu không tìm thấy header
     """
-    header_row_index = next(
-        (row_index for row_index, row in df.iterrows() if id_header in row.values), 
-        None
-    )
-    if header_row_index is None:
+    matches = np.flatnonzero(df.isin([id_header]).any(axis=1).to_numpy())
+    if len(matches) == 0:
         raise ValueError(f"Không tìm thấy cột '{id_header}' trong file")
-    return header_row_index
+    return int(matches[0])
 
-def get_detailed_classes(file_path: str, id_list: list[str], id_header: str) -> list[DetailedClass]:
+def _parse_schedule(file_path: str | BinaryIO, id_header: str) -> Schedule:
     """
-    Lấy thông tin chi tiết các lớp học phần.
+    Đọc file Thời khóa biểu (.xlsx) và đánh chỉ mục theo mã lớp học phần.
+
+    Args:
+        file_path (str | BinaryIO): Đường dẫn đến file Thời khóa biểu hoặc file object
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        Schedule: Thời khóa biểu đã đọc
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    with timed("schedule.read_excel"):
+        df = _read_excel_file(file_path)
+    with timed("schedule.header"):
+        header_row_index = _find_header_row(df, id_header)
+        df.columns = df.iloc[header_row_index]
+        df = df.iloc[header_row_index + 1:].reset_index(drop=True)
+        df = _standardize_dataframe(df)
+    with timed("schedule.index"):
+        schedule = Schedule.from_dataframe(df, id_header, PERIOD_REFERENCE)
+    metrics.count("schedule_rows_parsed_total", len(df))
+    return schedule
+
+def _load_schedule(file_path: str, id_header: str, source: list) -> Schedule:
+    """
+    Đọc Thời khóa biểu (không qua cache), ưu tiên snapshot nếu có và còn mới.
+
+    Args:
+        file_path (str): Đường dẫn đến file Thời khóa biểu
+        id_header (str): Tên cột chứa Mã Lớp học phần
+        source (list): Fingerprint hiện tại của file (không gồm đường dẫn)
+
+    Returns:
+        Schedule: Thời khóa biểu đã đọc
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    if settings.SCHEDULE_SNAPSHOT_ENABLED:
+        path = snapshot_path(file_path)
+        try:
+            with timed("schedule.snapshot"):
+                schedule = read_snapshot(path, id_header, PERIOD_REFERENCE, source)
+        except ValueError:
+            logger.warning("Bỏ qua snapshot không hợp lệ: %s", path, exc_info=True)
+            schedule = None
+        if schedule is not None:
+            return schedule
+
+    schedule = _parse_schedule(file_path, id_header)
+    if settings.SCHEDULE_SNAPSHOT_ENABLED and settings.SCHEDULE_SNAPSHOT_AUTO:
+        try:
+            write_snapshot(schedule, snapshot_path(file_path), source)
+        except OSError:
+            logger.warning("Không ghi được snapshot cho %s", file_path, exc_info=True)
+    return schedule
+
+def compile_schedule_snapshot(file_path: str, id_header: str, output: str | None = None) -> str:
+    """
+    Biên dịch file Thời khóa biểu thành snapshot dạng cột.
+
+    Args:
+        file_path (str): Đường dẫn đến file Thời khóa biểu
+        id_header (str): Tên cột chứa Mã Lớp học phần
+        output (str | None): Đường dẫn file snapshot, mặc định là snapshot_path(file_path)
+
+    Returns:
+        str: Đường dẫn file snapshot đã ghi
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    source = file_fingerprint(file_path, settings.SCHEDULE_CACHE_KEY)[1:]
+    schedule = _parse_schedule(file_path, id_header)
+    return write_snapshot(schedule, output or snapshot_path(file_path), source)
+
+def get_schedule(file_path: str | bytes | BinaryIO | list[ScheduleSource], id_header: str) -> Schedule:
+    """
+    Lấy thời khóa biểu đã đọc từ cache, hoặc đọc file nếu chưa có (hay file đã thay đổi).
+
+    Nội dung truyền trực tiếp (bytes, file object) được đọc trong bộ nhớ và cache theo mã băm nội dung.
+    Danh sách nhiều file/sheet được đọc song song và gộp lại (xem get_merged_schedule).
+
+    Args:
+        file_path (str | bytes | BinaryIO | list[ScheduleSource]): Đường dẫn, nội dung (ví dụ: file tải lên),
+            file object của file Thời khóa biểu, hoặc danh sách các file/sheet
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        Schedule: Thời khóa biểu đã đọc
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    if isinstance(file_path, list):
+        return _get_merged_schedule(file_path, id_header)
+    if not isinstance(file_path, str):
+        data = bytes(file_path) if isinstance(file_path, (bytes, bytearray, memoryview)) else file_path.read()
+        if not data.startswith(XLSX_MAGIC):
+            raise ValueError("Nội dung không phải file Excel (.xlsx)")
+
+        fingerprint = content_fingerprint(data)
+
+        def load_content() -> tuple[Schedule, int]:
+            schedule = _parse_schedule(io.BytesIO(data), id_header)
+            schedule.version = schedule_version(fingerprint, id_header)
+            schedule.views = settings.SCHEDULE_CLASS_VIEWS
+            return schedule, schedule.nbytes
+
+        return SCHEDULE_CACHE.get_or_load((fingerprint, id_header), load_content)
+
+    fingerprint = file_fingerprint(file_path, settings.SCHEDULE_CACHE_KEY)
+    path = fingerprint[0]
+
+    def load() -> tuple[Schedule, int]:
+        schedule = _load_schedule(file_path, id_header, fingerprint[1:])
+        schedule.version = schedule_version(fingerprint, id_header)
+        schedule.views = settings.SCHEDULE_CLASS_VIEWS
+
+        # File đã thay đổi: bỏ các phiên bản cũ của cùng đường dẫn. Các request đang dùng
+        # phiên bản cũ vẫn giữ đối tượng Schedule của chúng cho tới khi xong.
+        def is_replaced(key) -> bool:
+            return key[0][0] == path and key[0] != fingerprint
+
+        replaced = [(key, old) for key, old, _ in SCHEDULE_CACHE.items() if is_replaced(key)]
+        SCHEDULE_CACHE.discard_if(is_replaced)
+        for key, old in replaced:
+            if key[1] == id_header:
+                _notify_changed(old, schedule)
+            else:
+                for listener in _schedule_listeners:
+                    listener(old.version)
+        return schedule, schedule.nbytes
+
+    schedule = SCHEDULE_CACHE.get_or_load((fingerprint, id_header), load)
+    if settings.SCHEDULE_WATCH_INTERVAL > 0:
+        watch_schedule(path, id_header)
+    return schedule
+
+def normalize_sources(sources: list) -> list[tuple[str | bytes, int | str]]:
+    """
+    Chuẩn hóa danh sách file/sheet thành các bộ (file, sheet).
+
+    Raises:
+        ValueError: Nếu phần tử không hợp lệ
+    """
+    normalized = []
+    for source in sources:
+        if isinstance(source, dict):
+            file, sheet = source.get("file"), source.get("sheet", 0)
+        elif isinstance(source, (tuple, list)) and len(source) == 2:
+            file, sheet = source
+        else:
+            file, sheet = source, 0
+        if isinstance(file, (bytearray, memoryview)):
+            file = bytes(file)
+        if not isinstance(file, (str, bytes)) or not isinstance(sheet, (int, str)):
+            raise ValueError(f"File Thời khóa biểu không hợp lệ: {source!r}")
+        if isinstance(file, bytes) and not file.startswith(XLSX_MAGIC):
+            raise ValueError("Nội dung không phải file Excel (.xlsx)")
+        normalized.append((file, sheet))
+    return normalized
+
+def _expand_sheets(sources: list[tuple[str | bytes, int | str]]) -> list[tuple[str | bytes, int | str, bool]]:
+    """
+    Thay sheet "*" bằng mọi sheet của file.
+
+    Returns:
+        list[tuple[str | bytes, int | str, bool]]: Các bộ (file, sheet, bắt buộc có cột mã lớp)
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu file không phải định dạng Excel
+    """
+    from openpyxl import load_workbook
+
+    sheets = []
+    for file, sheet in sources:
+        if sheet != ALL_SHEETS:
+            sheets.append((file, sheet, True))
+            continue
+        try:
+            workbook = load_workbook(io.BytesIO(file) if isinstance(file, bytes) else file, read_only=True)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Không tìm thấy file: {file}")
+        except Exception as e:
+            raise ValueError(f"Lỗi khi đọc file Excel: {str(e)}")
+        sheets.extend((file, name, False) for name in workbook.sheetnames)
+        workbook.close()
+    return sheets
+
+def _read_sheet(file: str | bytes, sheet: int | str, id_header: str, required: bool) -> pd.DataFrame | None:
+    """
+    Đọc bảng Thời khóa biểu của một sheet (chạy được trong tiến trình con), chỉ giữ các cột cần thiết.
+
+    Returns:
+        pd.DataFrame | None: DataFrame đã chuẩn hóa, None nếu sheet không có cột mã lớp và không bắt buộc
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    df = _read_excel_file(io.BytesIO(file) if isinstance(file, bytes) else file, sheet)
+    try:
+        header_row_index = _find_header_row(df, id_header)
+    except ValueError:
+        if required:
+            raise ValueError(f"Không tìm thấy cột '{id_header}' trong sheet {sheet!r}")
+        return None
+    df.columns = df.iloc[header_row_index]
+    df = _standardize_dataframe(df.iloc[header_row_index + 1:].reset_index(drop=True))
+    # Bỏ các cột không dùng tới để gửi về tiến trình chính ít dữ liệu hơn
+    names = [name for name in dict.fromkeys((id_header, *SCHEDULE_COLUMNS)) if name in df.columns]
+    return df.loc[:, ~df.columns.duplicated()][names]
+
+def _merge_sheets(frames: list[tuple[str, pd.DataFrame]], id_header: str) -> pd.DataFrame:
+    """
+    Gộp các bảng theo thứ tự. Một lớp học phần có trong nhiều sheet chỉ được lấy từ sheet đầu tiên,
+    các sheet sau bị bỏ qua lớp đó (kèm cảnh báo).
+    """
+    seen: set = set()
+    merged = []
+    for label, df in frames:
+        ids = df[id_header]
+        duplicated = ids.isin(seen) & ids.notna()
+        if duplicated.any():
+            duplicates = sorted(map(str, ids[duplicated].unique()))
+            logger.warning(
+                "Bỏ qua %d lớp học phần đã có trong sheet trước khi đọc %s: %s",
+                len(duplicates), label, ", ".join(duplicates[:10]) + (", ..." if len(duplicates) > 10 else "")
+            )
+            metrics.count("schedule_duplicate_classes_total", len(duplicates))
+            df = df[~duplicated]
+        seen.update(ids[ids.notna()].unique())
+        merged.append(df)
+    return pd.concat(merged, ignore_index=True) if merged else pd.DataFrame(columns=[id_header, *SCHEDULE_COLUMNS])
+
+def get_merged_schedule(sources: list, id_header: str, max_workers: int | None = None) -> Schedule:
+    """
+    Đọc nhiều file/sheet Thời khóa biểu (ví dụ mỗi khoa một sheet) và gộp thành một Schedule.
+
+    Mỗi sheet được tìm header riêng và đọc song song trong process pool. Các lớp giữ thứ tự
+    theo danh sách sheet rồi theo thứ tự trong sheet; lớp có trong nhiều sheet chỉ lấy từ sheet đầu tiên.
+    Kết quả không dùng snapshot và không được theo dõi thay đổi (SCHEDULE_WATCH_INTERVAL).
+
+    Args:
+        sources (list[ScheduleSource]): Các file/sheet cần đọc
+        id_header (str): Tên cột chứa Mã Lớp học phần
+        max_workers (int | None): Số tiến trình con, mặc định SCHEDULE_INGEST_MAX_WORKERS
+
+    Returns:
+        Schedule: Thời khóa biểu đã gộp
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    sheets = _expand_sheets(normalize_sources(sources))
+    with timed("schedule.read_sheets"):
+        workers = min(max_workers or settings.SCHEDULE_INGEST_MAX_WORKERS, len(sheets))
+        arguments = [[file for file, _, _ in sheets], [sheet for _, sheet, _ in sheets],
+                     [id_header] * len(sheets), [required for _, _, required in sheets]]
+        if workers <= 1 or multiprocessing.parent_process() is not None:
+            frames = list(map(_read_sheet, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(_read_sheet, *arguments))
+
+    labels = [f"{file if isinstance(file, str) else '<upload>'}[{sheet!r}]" for file, sheet, _ in sheets]
+    with timed("schedule.index"):
+        df = _merge_sheets([(label, df) for label, df in zip(labels, frames) if df is not None], id_header)
+        schedule = Schedule.from_dataframe(df, id_header, PERIOD_REFERENCE)
+    metrics.count("schedule_rows_parsed_total", len(df))
+    return schedule
+
+def _get_merged_schedule(sources: list, id_header: str) -> Schedule:
+    """
+    get_merged_schedule qua SCHEDULE_CACHE, khóa theo fingerprint của từng file và sheet.
+    """
+    sheets = []
+    for file, sheet in normalize_sources(sources):
+        if isinstance(file, str):
+            sheets.append((file_fingerprint(file, settings.SCHEDULE_CACHE_KEY), sheet))
+        else:
+            sheets.append((content_fingerprint(file), sheet))
+    fingerprint = ("merged", *sheets)
+
+    def load() -> tuple[Schedule, int]:
+        schedule = get_merged_schedule(sources, id_header)
+        schedule.version = schedule_version(fingerprint, id_header)
+        schedule.views = settings.SCHEDULE_CLASS_VIEWS
+        return schedule, schedule.nbytes
+
+    return SCHEDULE_CACHE.get_or_load((fingerprint, id_header), load)
+
+# Theo dõi các file Thời khóa biểu đã đọc và bảng tiết học, chỉ ở tiến trình chính
+# (các tiến trình con của process pool dùng Thời khóa biểu được gửi sang hoặc tự đọc theo request)
+WATCHER = FileWatcher(settings.SCHEDULE_WATCH_INTERVAL)
+_watched_headers: dict[str, set[str]] = {}
+_watch_lock = threading.Lock()
+
+def watch_schedule(file_path: str, id_header: str) -> bool:
+    """
+    Đọc lại Thời khóa biểu trên luồng nền mỗi khi file thay đổi (xem SCHEDULE_WATCH_INTERVAL),
+    để request sau đó không phải đợi đọc file.
 
     Args:
         file_path (str): Đường dẫn đến file Thời khóa biểu
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        bool: False nếu không theo dõi (đã tắt, hoặc đang ở tiến trình con)
+    """
+    if settings.SCHEDULE_WATCH_INTERVAL <= 0 or multiprocessing.parent_process() is not None:
+        return False
+    path = os.path.abspath(file_path)
+    if id_header in _watched_headers.get(path, ()):
+        return True
+    with _watch_lock:
+        if path not in _watched_headers:
+            _watched_headers[path] = set()
+            WATCHER.watch(path, _reload_schedule)
+            if not WATCHER.is_watching(PERIOD_REFERENCE.file):
+                WATCHER.watch(PERIOD_REFERENCE.file, _reload_period_reference)
+            WATCHER.start()
+        _watched_headers[path].add(id_header)
+    return True
+
+def _reload_schedule(path: str) -> None:
+    for id_header in list(_watched_headers.get(path, ())):
+        get_schedule(path, id_header)
+
+def _reload_period_reference(path: str) -> None:
+    """
+    Tải lại bảng tiết học; nếu có tiết thay đổi thì tham chiếu lại tiết học của các Thời khóa biểu
+    đang được cache (không đọc lại file Thời khóa biểu).
+    """
+    changed = PERIOD_REFERENCE.reload()
+    if not changed:
+        return
+    logger.info("Bảng tiết học đã thay đổi các tiết: %s", sorted(changed))
+    for key, old, size in SCHEDULE_CACHE.items():
+        schedule = old.rebind(PERIOD_REFERENCE)
+        _notify_changed(old, schedule)
+        SCHEDULE_CACHE.put(key, schedule, size)
+
+def get_detailed_classes(
+    file_path: str | bytes | BinaryIO | list[ScheduleSource], id_list: list[str], id_header: str
+) -> list[DetailedClass]:
+    """
+    Lấy thông tin chi tiết các lớp học phần.
+
+    Thời khóa biểu được cache theo nội dung file (xem get_schedule), các đối tượng
+    DetailedClass trả về được dùng chung giữa các request nên không được sửa đổi.
+    Khi SCHEDULE_READER là "stream", file được đọc theo luồng và chỉ giữ các lớp cần lấy
+    (trừ khi đọc nhiều file/sheet, xem get_merged_schedule).
+    Khi bật SCHEDULE_CLASS_VIEWS, các phần tử là ClassView (cùng thuộc tính, chỉ đọc).
+
+    Args:
+        file_path (str | bytes | BinaryIO | list[ScheduleSource]): Đường dẫn, nội dung hoặc file object
+            của file Thời khóa biểu, hoặc danh sách các file/sheet
         id_list (list[str]): Danh sách mã của các lớp học phần cần lấy thông tin
         id_header (str): Tên cột chứa Mã Lớp học phần
         
@@ -139,37 +616,51 @@ def get_detailed_classes(file_path: str, id_list: list[str], id_header: str) ->
         FileNotFoundError: Nếu không tìm thấy file
         ValueError: Nếu dữ liệu không hợp lệ
     """
-    df = _read_excel_file(file_path)
-    header_row_index = _find_header_row(df, id_header)
-    
-    df.columns = df.iloc[header_row_index]
-    df = df.iloc[header_row_index + 1:].reset_index(drop=True)
-    df = _standardize_dataframe(df)
-    df = df[df[id_header].isin(id_list)]
-    
-    if df.empty:
-        return []
+    if settings.SCHEDULE_READER not in ("pandas", "stream"):
+        raise ValueError(f"SCHEDULE_READER không hợp lệ: {settings.SCHEDULE_READER}")
+    if settings.SCHEDULE_READER == "stream" and not isinstance(file_path, list):
+        return _stream_detailed_classes(file_path, id_list, id_header)
 
-    classes: dict[str, DetailedClass] = {}
-    for _, row in df.iterrows():
-        class_id = row[id_header]
-        if class_id not in classes:
-            classes[class_id] = DetailedClass(
-                id=class_id,
-                subject=Subject(
-                    id=row["Mã học phần"],
-                    name=row["Học phần"]
-                ),
-                teacher=row["Giảng viên"]
-            )
-        
-        classes[class_id].add_lesson(
-            Lesson(
-                weekday=row["Thứ"],
-                location=row["Giảng đường"],
-                group=row["Nhóm"],
-                period=PERIOD_REFERENCE.reference(row["Tiết"])
-            )
-        )
-    
-    return list(classes.values())
\ No newline at end of file
+    schedule = get_schedule(file_path, id_header)
+    with timed("schedule.lessons"):
+        return schedule.get_classes(id_list)
+
+def _stream_detailed_classes(file_path: str | bytes | BinaryIO, id_list: list[str], id_header: str) -> list[DetailedClass]:
+    """
+    Lấy thông tin chi tiết các lớp học phần bằng cách đọc file theo luồng (utils/xlsxReader.py),
+    chỉ giữ các dòng của các lớp cần lấy. Dùng Thời khóa biểu đã cache nếu có, nhưng không cache
+    kết quả (và không dùng snapshot).
+
+    Args:
+        file_path (str | bytes | BinaryIO): Đường dẫn, nội dung hoặc file object của file Thời khóa biểu
+        id_list (list[str]): Danh sách mã của các lớp học phần cần lấy thông tin
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        list[DetailedClass]: Danh sách chi tiết các lớp học phần
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu dữ liệu không hợp lệ
+    """
+    if isinstance(file_path, str):
+        fingerprint = file_fingerprint(file_path, settings.SCHEDULE_CACHE_KEY)
+        source = file_path
+    else:
+        data = bytes(file_path) if isinstance(file_path, (bytes, bytearray, memoryview)) else file_path.read()
+        if not data.startswith(XLSX_MAGIC):
+            raise ValueError("Nội dung không phải file Excel (.xlsx)")
+        fingerprint = content_fingerprint(data)
+        source = io.BytesIO(data)
+
+    schedule = SCHEDULE_CACHE.get((fingerprint, id_header))
+    if schedule is None:
+        with timed("schedule.stream"):
+            df = read_schedule_rows(source, id_header, id_list, SCHEDULE_COLUMNS)
+            schedule = Schedule.from_dataframe(df, id_header, PERIOD_REFERENCE)
+        metrics.count("schedule_rows_parsed_total", len(df))
+        # Cùng phiên bản với khi đọc cả file, nên dùng chung được cache fragment VEVENT
+        schedule.version = schedule_version(fingerprint, id_header)
+        schedule.views = settings.SCHEDULE_CLASS_VIEWS
+    with timed("schedule.lessons"):
+        return schedule.get_classes(id_list)
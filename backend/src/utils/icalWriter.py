@@ -0,0 +1,342 @@
+"""
+Xuất iCalendar (RFC 5545) trực tiếp từ DetailedClass/Lesson.
+
+Mỗi VEVENT của lịch có cùng một cấu trúc cố định (SUMMARY, DTSTART, DTEND, RRULE,
+DESCRIPTION, LOCATION và các VALARM), nên thay vì dựng cây component của icalendar rồi
+gọi to_ical(), module này ghép thẳng các dòng văn bản theo đúng thứ tự thuộc tính,
+cách escape và cách gập dòng (75 octet) mà icalendar dùng.
+
+Các VEVENT của một nhóm buổi học chỉ phụ thuộc vào lớp học phần, các buổi học, tuần bắt đầu,
+số lần lặp và các lần nhắc, nên được cache (FRAGMENT_CACHE) và dùng chung cho mọi sinh viên
+học cùng lớp. Khóa cache gồm phiên bản Thời khóa biểu (DetailedClass.version); khi file
+Thời khóa biểu thay đổi, các fragment của những lớp không đổi được chuyển sang phiên bản mới,
+còn lại bị xóa.
+"""
+import sys
+from datetime import date, datetime, timedelta
+from typing import Hashable, Iterable, Iterator
+from classes.calendar import describe_lesson, _get_date_from_weekday
+from classes.subject import DetailedClass, Lesson
+from classes.schedule import ScheduleDiff
+from config import settings
+from utils import metrics
+from utils.cache import LRUCache
+from utils.getClass import on_schedule_replaced, on_schedule_changed
+from utils.metrics import count
+
+CRLF = "\r\n"
+LINE_LIMIT = 75  # octet, không tính CRLF
+_FOLD_SEPARATOR = CRLF + " "
+
+# Cache VEVENT đã xuất, khóa theo (phiên bản TKB, mã lớp, các buổi học, tuần bắt đầu, lặp lại, nhắc trước)
+FRAGMENT_CACHE = LRUCache(
+    max_entries=settings.ICAL_FRAGMENT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.ICAL_FRAGMENT_CACHE_MAX_BYTES
+)
+metrics.register_collector(lambda: [
+    ("ical_fragment_cache_hits_total", "counter", {}, FRAGMENT_CACHE.hits),
+    ("ical_fragment_cache_misses_total", "counter", {}, FRAGMENT_CACHE.misses),
+    ("ical_fragment_cache_evictions_total", "counter", {}, FRAGMENT_CACHE.evictions),
+    ("ical_fragment_cache_entries", "gauge", {}, len(FRAGMENT_CACHE)),
+    ("ical_fragment_cache_hit_ratio", "gauge", {},
+     FRAGMENT_CACHE.hits / (FRAGMENT_CACHE.hits + FRAGMENT_CACHE.misses or 1)),
+])
+
+def discard_fragments(version: str) -> int:
+    """
+    Xóa các fragment của một phiên bản Thời khóa biểu.
+
+    Args:
+        version (str): Phiên bản Thời khóa biểu (DetailedClass.version)
+
+    Returns:
+        int: Số fragment đã xóa
+    """
+    return FRAGMENT_CACHE.discard_if(lambda key: key[0] == version)
+
+def carry_over_fragments(old_version: str, new_version: str, diff: ScheduleDiff) -> int:
+    """
+    Chuyển các fragment của những lớp không thay đổi sang phiên bản Thời khóa biểu mới,
+    xóa fragment của các lớp đã thay đổi hoặc bị xóa.
+
+    Args:
+        old_version (str): Phiên bản cũ
+        new_version (str): Phiên bản mới
+        diff (ScheduleDiff): Khác biệt giữa hai phiên bản
+
+    Returns:
+        int: Số fragment được giữ lại
+    """
+    entries = [(key, fragment, size) for key, fragment, size in FRAGMENT_CACHE.items() if key[0] == old_version]
+    discard_fragments(old_version)
+    stale = diff.stale
+    kept = 0
+    for key, fragment, size in entries:
+        if key[1] not in stale:
+            FRAGMENT_CACHE.put((new_version, *key[1:]), fragment, size)
+            kept += 1
+    return kept
+
+on_schedule_replaced(discard_fragments)
+on_schedule_changed(carry_over_fragments)
+
+def escape_text(value) -> str:
+    """
+    Escape giá trị kiểu TEXT theo RFC 5545 (mục 3.3.11).
+
+    Args:
+        value: Giá trị cần escape (được chuyển sang str)
+
+    Returns:
+        str: Giá trị đã escape
+    """
+    return (
+        str(value).replace(r"\N", "\n")
+        .replace("\\", "\\\\")
+        .replace(";", r"\;")
+        .replace(",", r"\,")
+        .replace("\r\n", r"\n")
+        .replace("\n", r"\n")
+        .replace("\r", r"\n")
+    )
+
+def fold_line(line: str) -> str:
+    """
+    Gập một content line dài thành nhiều dòng, mỗi dòng không quá 75 octet.
+
+    Không cắt giữa một ký tự UTF-8 nhiều byte, và không tách dấu "\\" khỏi ký tự được escape.
+
+    Args:
+        line (str): Content line (không chứa ký tự xuống dòng)
+
+    Returns:
+        str: Content line đã gập
+    """
+    if len(line) < LINE_LIMIT and (line.isascii() or len(line.encode("utf-8")) < LINE_LIMIT):
+        return line
+
+    folded_lines: list[str] = []
+    current_chars: list[str] = []
+    byte_count = 0
+    for char in line:
+        char_byte_len = 1 if char < "\x80" else len(char.encode("utf-8"))
+        if current_chars and byte_count + char_byte_len >= LINE_LIMIT:
+            if len(current_chars) > 1 and current_chars[-1] in "\\^":
+                escaped_prefix = current_chars.pop()
+                folded_lines.append("".join(current_chars))
+                current_chars = [escaped_prefix]
+                byte_count = len(escaped_prefix)
+            else:
+                folded_lines.append("".join(current_chars))
+                current_chars = []
+                byte_count = 0
+        current_chars.append(char)
+        byte_count += char_byte_len
+
+    if current_chars:
+        folded_lines.append("".join(current_chars))
+    return _FOLD_SEPARATOR.join(folded_lines)
+
+def format_duration(delta: timedelta) -> str:
+    """
+    Định dạng khoảng thời gian theo kiểu DURATION của RFC 5545 (ví dụ: -PT15M, P1DT2H).
+
+    Args:
+        delta (timedelta): Khoảng thời gian
+
+    Returns:
+        str: Chuỗi DURATION
+    """
+    sign = ""
+    if delta.days < 0:
+        sign = "-"
+        delta = -delta
+    timepart = ""
+    if delta.seconds:
+        timepart = "T"
+        hours = delta.seconds // 3600
+        minutes = delta.seconds % 3600 // 60
+        seconds = delta.seconds % 60
+        if hours:
+            timepart += f"{hours}H"
+        if minutes or (hours and seconds):
+            timepart += f"{minutes}M"
+        if seconds:
+            timepart += f"{seconds}S"
+    if delta.days == 0 and timepart:
+        return f"{sign}P{timepart}"
+    return f"{sign}P{abs(delta.days)}D{timepart}"
+
+def format_rrule(repeat: int | date) -> str:
+    """
+    Dòng RRULE lặp lại hằng tuần (rỗng nếu không lặp).
+
+    Args:
+        repeat (int | date): Số lần lặp lại hoặc ngày kết thúc
+
+    Returns:
+        str: Content line RRULE (kèm CRLF) hoặc chuỗi rỗng
+    """
+    if isinstance(repeat, int):
+        return f"RRULE:FREQ=WEEKLY;COUNT={repeat}{CRLF}"
+    if isinstance(repeat, datetime):
+        return f"RRULE:FREQ=WEEKLY;UNTIL={repeat:%Y%m%dT%H%M%S}{CRLF}"
+    if isinstance(repeat, date):
+        return f"RRULE:FREQ=WEEKLY;UNTIL={repeat:%Y%m%d}{CRLF}"
+    return ""
+
+def format_alarms(remind_before: list[int]) -> str:
+    """
+    Các VALARM nhắc trước sự kiện.
+
+    Args:
+        remind_before (list[int]): Danh sách số phút nhắc trước
+
+    Returns:
+        str: Các component VALARM (kèm CRLF)
+    """
+    return "".join(
+        f"BEGIN:VALARM{CRLF}ACTION:DISPLAY{CRLF}TRIGGER:{format_duration(timedelta(minutes=-remind))}{CRLF}END:VALARM{CRLF}"
+        for remind in remind_before
+    )
+
+def _text_line(name: str, value) -> str:
+    return fold_line(f"{name}:{escape_text(value)}") + CRLF
+
+def render_events(
+    class_: DetailedClass,
+    lessons: list[Lesson],
+    start_first_week: date,
+    repeat: int | date = 1,
+    remind_before: list[int] | None = None
+) -> str:
+    """
+    Xuất các VEVENT của một nhóm buổi học (tương đương Events + add_alarms).
+
+    Args:
+        class_ (DetailedClass): Lớp học đầy đủ thông tin
+        lessons (list[Lesson]): Danh sách các buổi học cần tạo event
+        start_first_week (date): Ngày bắt đầu của tuần học đầu tiên
+        repeat (int | date, optional): Số lần lặp lại hoặc ngày kết thúc
+        remind_before (list[int] | None, optional): Danh sách số phút nhắc trước
+
+    Returns:
+        str: Các component VEVENT (kèm CRLF)
+    """
+    summary = _text_line("SUMMARY", class_.subject.name)
+    rrule = format_rrule(repeat)
+    alarms = format_alarms(remind_before or [])
+
+    parts = []
+    for lesson in lessons:
+        event_date = _get_date_from_weekday(start_first_week, lesson.weekday)
+        start = datetime.combine(event_date, lesson.period.start)
+        end = datetime.combine(event_date, lesson.period.end)
+        parts.append(
+            f"BEGIN:VEVENT{CRLF}"
+            f"{summary}"
+            f"DTSTART:{start:%Y%m%dT%H%M%S}{CRLF}"
+            f"DTEND:{end:%Y%m%dT%H%M%S}{CRLF}"
+            f"{rrule}"
+            f"{_text_line('DESCRIPTION', describe_lesson(class_, lesson))}"
+            f"{_text_line('LOCATION', lesson.location)}"
+            f"{alarms}"
+            f"END:VEVENT{CRLF}"
+        )
+    return "".join(parts)
+
+def _fragment_key(
+    class_: DetailedClass,
+    lessons: list[Lesson],
+    start_first_week: date,
+    repeat: int | date,
+    remind_before: list[int] | None
+) -> Hashable:
+    return (
+        class_.version,
+        class_.id,
+        tuple((lesson.weekday, lesson.period.start, lesson.period.end, lesson.location, lesson.group) for lesson in lessons),
+        start_first_week,
+        repeat,
+        tuple(remind_before or ())
+    )
+
+def render_events_cached(
+    class_: DetailedClass,
+    lessons: list[Lesson],
+    start_first_week: date,
+    repeat: int | date = 1,
+    remind_before: list[int] | None = None
+) -> str:
+    """
+    Như render_events, nhưng dùng lại fragment đã xuất trong FRAGMENT_CACHE.
+
+    Chỉ cache các lớp đọc từ Thời khóa biểu đã có phiên bản (DetailedClass.version),
+    vì khi đó mã lớp xác định toàn bộ thông tin của lớp.
+
+    Args:
+        class_ (DetailedClass): Lớp học đầy đủ thông tin
+        lessons (list[Lesson]): Danh sách các buổi học cần tạo event
+        start_first_week (date): Ngày bắt đầu của tuần học đầu tiên
+        repeat (int | date, optional): Số lần lặp lại hoặc ngày kết thúc
+        remind_before (list[int] | None, optional): Danh sách số phút nhắc trước
+
+    Returns:
+        str: Các component VEVENT (kèm CRLF)
+    """
+    if class_.version is None or FRAGMENT_CACHE.max_entries <= 0:
+        return render_events(class_, lessons, start_first_week, repeat, remind_before)
+
+    key = _fragment_key(class_, lessons, start_first_week, repeat, remind_before)
+    fragment = FRAGMENT_CACHE.get(key)
+    if fragment is None:
+        fragment = render_events(class_, lessons, start_first_week, repeat, remind_before)
+        FRAGMENT_CACHE.put(key, fragment, sys.getsizeof(fragment))
+    return fragment
+
+def iter_calendar(
+    event_groups: Iterable[tuple[DetailedClass, list[Lesson], date]],
+    repeat: int | date = 15,
+    remind_before: list[int] | None = None
+) -> Iterator[str]:
+    """
+    Xuất lịch VCALENDAR theo từng phần: header, VEVENT của từng nhóm buổi học, rồi footer.
+
+    Các nhóm buổi học chỉ được xử lý khi phần tương ứng được lấy ra, nên có thể gửi dần
+    cho client mà không cần giữ cả lịch trong bộ nhớ.
+
+    Args:
+        event_groups (Iterable[tuple[DetailedClass, list[Lesson], date]]): Các nhóm buổi học
+            (xem utils.makeCalendar.split_lessons)
+        repeat (int | date, optional): Số lần lặp lại hoặc ngày kết thúc
+        remind_before (list[int] | None, optional): Danh sách số phút nhắc trước
+
+    Yields:
+        str: Từng phần của dữ liệu iCalendar
+    """
+    yield f"BEGIN:VCALENDAR{CRLF}"
+    events = 0
+    for class_, lessons, start_first_week in event_groups:
+        yield render_events_cached(class_, lessons, start_first_week, repeat, remind_before)
+        events += len(lessons)
+    count("ical_events_total", events, renderer="direct")
+    yield f"END:VCALENDAR{CRLF}"
+
+def render_calendar(
+    event_groups: Iterable[tuple[DetailedClass, list[Lesson], date]],
+    repeat: int | date = 15,
+    remind_before: list[int] | None = None
+) -> str:
+    """
+    Xuất cả lịch VCALENDAR.
+
+    Args:
+        event_groups (Iterable[tuple[DetailedClass, list[Lesson], date]]): Các nhóm buổi học
+            (xem utils.makeCalendar.split_lessons)
+        repeat (int | date, optional): Số lần lặp lại hoặc ngày kết thúc
+        remind_before (list[int] | None, optional): Danh sách số phút nhắc trước
+
+    Returns:
+        str: Dữ liệu iCalendar
+    """
+    return "".join(iter_calendar(event_groups, repeat, remind_before))
@@ -0,0 +1,176 @@
+from datetime import datetime, date, timedelta
+from typing import Iterator
+from classes.calendar import Calendar, Events, Alarms
+from classes.subject import DetailedClass, Lesson
+from config import settings
+from utils.icalWriter import render_calendar, iter_calendar
+
+def parse_calendar_options(argv: dict) -> dict:
+    """
+    Đọc các tham số tạo lịch từ request body.
+
+    Args:
+        argv (dict): Request body (JSON) với các trường:
+            start_date (str): Ngày bắt đầu (YYYY-MM-DD)
+            repeat (int | str, optional): Số tuần hoặc ngày kết thúc (YYYY-MM-DD). Mặc định: 15
+            remind_before (list[int], optional): Danh sách số phút nhắc trước. Mặc định: [15]
+            practical_delay (int, optional): Số tuần delay tiết TH/BT. Mặc định: 1
+            practical_groups (list[str], optional): Danh sách nhóm TH/BT cần delay. Mặc định: []
+
+    Returns:
+        dict: Các tham số của make_calendar (trừ detailed_classes)
+
+    Raises:
+        KeyError: Nếu thiếu start_date
+        ValueError: Nếu ngày không đúng định dạng
+    """
+    start_date = datetime.strptime(argv['start_date'], '%Y-%m-%d').date()
+
+    repeat = argv.get('repeat', 15)
+    if isinstance(repeat, str):
+        repeat = datetime.strptime(repeat, '%Y-%m-%d').date()
+
+    remind_before = argv.get('remind_before', [15])
+    if not isinstance(remind_before, list):
+        remind_before = [remind_before]
+
+    return {
+        'start_date': start_date,
+        'repeat': repeat,
+        'remind_before': remind_before,
+        'practical_delay': argv.get('practical_delay', 1),  # Mặc định delay 1 tuần
+        'practical_groups': argv.get('practical_groups', [])  # Danh sách nhóm TH/BT cần delay
+    }
+
+def split_lessons(
+    detailed_classes: list[DetailedClass],
+    start_date: date,
+    practical_delay: int = 1,
+    practical_groups: list[str] | None = None
+) -> Iterator[tuple[DetailedClass, list[Lesson], date]]:
+    """
+    Tách các buổi học của từng lớp thành tiết lý thuyết và tiết TH/BT (bắt đầu muộn hơn).
+
+    Args:
+        detailed_classes (list[DetailedClass]): Danh sách chi tiết các lớp học phần
+        start_date (date): Ngày bắt đầu của tuần học đầu tiên
+        practical_delay (int, optional): Số tuần delay tiết TH/BT. Mặc định: 1
+        practical_groups (list[str] | None, optional): Danh sách nhóm TH/BT cần delay. Mặc định: []
+
+    Yields:
+        tuple[DetailedClass, list[Lesson], date]: (lớp học, các buổi học, ngày bắt đầu tuần đầu tiên), bỏ qua nhóm rỗng
+    """
+    if practical_groups is None:
+        practical_groups = []
+    practical_start = start_date + timedelta(weeks=practical_delay)
+
+    for class_ in detailed_classes:
+        theory_lessons = []
+        practical_lessons = []
+        for lesson in class_.lessons:
+            # Kiểm tra nếu là tiết TH/BT dựa theo nhóm được chọn
+            if lesson.group in practical_groups:
+                practical_lessons.append(lesson)
+            else:
+                theory_lessons.append(lesson)
+
+        if theory_lessons:
+            yield class_, theory_lessons, start_date
+        if practical_lessons:
+            yield class_, practical_lessons, practical_start
+
+def make_calendar(
+    detailed_classes: list[DetailedClass],
+    start_date: date,
+    repeat: int | date = 15,
+    remind_before: list[int] | None = None,
+    practical_delay: int = 1,
+    practical_groups: list[str] | None = None
+) -> Calendar:
+    """
+    Tạo lịch (cây component của icalendar) từ danh sách các lớp học phần.
+
+    Các tiết thuộc nhóm TH/BT trong practical_groups được bắt đầu muộn hơn practical_delay tuần.
+
+    Args:
+        detailed_classes (list[DetailedClass]): Danh sách chi tiết các lớp học phần
+        start_date (date): Ngày bắt đầu của tuần học đầu tiên
+        repeat (int | date, optional): Số tuần hoặc ngày kết thúc. Mặc định: 15
+        remind_before (list[int] | None, optional): Danh sách số phút nhắc trước. Mặc định: [15]
+        practical_delay (int, optional): Số tuần delay tiết TH/BT. Mặc định: 1
+        practical_groups (list[str] | None, optional): Danh sách nhóm TH/BT cần delay. Mặc định: []
+
+    Returns:
+        Calendar: Lịch đã tạo
+    """
+    if remind_before is None:
+        remind_before = [15]
+
+    calendar = Calendar()
+    for class_, lessons, start_first_week in split_lessons(detailed_classes, start_date, practical_delay, practical_groups):
+        events = Events(
+            class_=class_,
+            lessons=lessons,
+            start_first_week=start_first_week,
+            repeat=repeat
+        )
+        if remind_before:
+            events.add_alarms(Alarms(remind_before))
+        calendar.add_events(events)
+    return calendar
+
+def export_calendar(
+    detailed_classes: list[DetailedClass],
+    start_date: date,
+    repeat: int | date = 15,
+    remind_before: list[int] | None = None,
+    practical_delay: int = 1,
+    practical_groups: list[str] | None = None,
+    renderer: str | None = None
+) -> str:
+    """
+    Tạo lịch và xuất ra dữ liệu iCalendar.
+
+    Args:
+        detailed_classes, start_date, repeat, remind_before, practical_delay, practical_groups: Giống make_calendar
+        renderer (str | None): "direct" (utils/icalWriter.py) hoặc "icalendar", mặc định ICAL_RENDERER
+
+    Returns:
+        str: Dữ liệu iCalendar
+
+    Raises:
+        ValueError: Nếu renderer không hợp lệ
+    """
+    if remind_before is None:
+        remind_before = [15]
+    renderer = renderer or settings.ICAL_RENDERER
+    if renderer == "direct":
+        event_groups = split_lessons(detailed_classes, start_date, practical_delay, practical_groups)
+        return render_calendar(event_groups, repeat, remind_before)
+    if renderer == "icalendar":
+        return make_calendar(
+            detailed_classes, start_date, repeat, remind_before, practical_delay, practical_groups
+        ).export_ical_as_str()
+    raise ValueError(f"renderer không hợp lệ: {renderer}")
+
+def stream_calendar(
+    detailed_classes: list[DetailedClass],
+    start_date: date,
+    repeat: int | date = 15,
+    remind_before: list[int] | None = None,
+    practical_delay: int = 1,
+    practical_groups: list[str] | None = None
+) -> Iterator[str]:
+    """
+    Xuất lịch iCalendar theo từng phần (header, VEVENT của từng lớp, footer) bằng writer trực tiếp.
+
+    Args:
+        detailed_classes, start_date, repeat, remind_before, practical_delay, practical_groups: Giống make_calendar
+
+    Returns:
+        Iterator[str]: Các phần của dữ liệu iCalendar
+    """
+    if remind_before is None:
+        remind_before = [15]
+    event_groups = split_lessons(detailed_classes, start_date, practical_delay, practical_groups)
+    return iter_calendar(event_groups, repeat, remind_before)
@@ -0,0 +1,203 @@
+"""
+Đo thời gian từng bước xử lý và đếm số liệu (số dòng đã đọc, số sự kiện đã xuất, cache hit, ...).
+
+- timed(stage): đo thời gian một bước, ghi vào histogram và vào header Server-Timing của request hiện tại
+- count(name, value, **labels): tăng một counter
+- render_prometheus(): xuất tất cả số liệu theo định dạng text của Prometheus
+
+Khi METRICS_ENABLED tắt, timed() trả về một context manager rỗng dùng chung và count() không làm gì.
+"""
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator
+from config import settings
+
+# Các mốc (giây) của histogram thời gian, giống mặc định của Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_METRIC = "stage_duration_seconds"
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_histograms: dict[tuple[str, tuple], "Histogram"] = {}
+_counters: dict[tuple[str, tuple], float] = {}
+_collectors: list[Callable[[], Iterable[tuple[str, str, dict, float]]]] = []
+_request_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar("request_timings", default=None)
+
+class Histogram:
+    """
+    Histogram với các mốc cố định.
+
+    Attributes:
+        buckets (tuple[float, ...]): Các mốc (cận trên) của histogram.
+        counts (list[int]): Số giá trị trong từng khoảng (không cộng dồn), phần tử cuối là +Inf.
+        total (float): Tổng các giá trị.
+        count (int): Số giá trị.
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted(labels.items()))
+
+def observe(name: str, value: float, **labels) -> None:
+    """
+    Ghi một giá trị vào histogram.
+
+    Args:
+        name (str): Tên số liệu
+        value (float): Giá trị
+        **labels: Nhãn của số liệu
+    """
+    if not settings.METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """
+    Tăng một counter.
+
+    Args:
+        name (str): Tên counter (nên kết thúc bằng _total)
+        value (float): Giá trị cần cộng thêm
+        **labels: Nhãn của counter
+    """
+    if not settings.METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+@contextmanager
+def _timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(STAGE_METRIC, elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+def timed(stage: str):
+    """
+    Đo thời gian một bước xử lý.
+
+    Ví dụ:
+        with timed("schedule.read_excel"):
+            df = pd.read_excel(...)
+
+    Args:
+        stage (str): Tên bước
+
+    Returns:
+        Context manager đo thời gian, hoặc context manager rỗng nếu METRICS_ENABLED tắt
+    """
+    if not settings.METRICS_ENABLED:
+        return _NOOP
+    return _timer(stage)
+
+def begin_request() -> None:
+    """
+    Bắt đầu ghi thời gian các bước cho request hiện tại (dùng cho header Server-Timing).
+    """
+    if settings.METRICS_ENABLED:
+        _request_timings.set([])
+
+def end_request() -> str | None:
+    """
+    Kết thúc ghi thời gian các bước của request hiện tại.
+
+    Returns:
+        str | None: Giá trị header Server-Timing, None nếu không có bước nào được đo
+    """
+    timings = _request_timings.get()
+    _request_timings.set(None)
+    if not timings:
+        return None
+    return ", ".join(f"{stage};dur={elapsed * 1000:.2f}" for stage, elapsed in timings)
+
+def register_collector(collector: Callable[[], Iterable[tuple[str, str, dict, float]]]) -> None:
+    """
+    Đăng ký một hàm trả về các số liệu được tính khi xuất (ví dụ: số hit của cache).
+
+    Args:
+        collector (Callable): Hàm trả về các bộ (tên, loại "counter"/"gauge", nhãn, giá trị)
+    """
+    _collectors.append(collector)
+
+def reset() -> None:
+    """
+    Xóa tất cả số liệu đã ghi.
+    """
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+def _escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Iterable[tuple[str, object]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus() -> str:
+    """
+    Xuất tất cả số liệu theo định dạng text của Prometheus (version 0.0.4).
+
+    Returns:
+        str: Nội dung cho endpoint /metrics
+    """
+    with _lock:
+        histograms = {key: (histogram.buckets, list(histogram.counts), histogram.total, histogram.count)
+                      for key, histogram in _histograms.items()}
+        counters = dict(_counters)
+
+    lines: list[str] = []
+    typed: set[str] = set()
+
+    def declare(name: str, kind: str) -> None:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(counters.items()):
+        declare(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for collector in _collectors:
+        for name, kind, labels, value in collector():
+            declare(name, kind)
+            lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+
+    for (name, labels), (buckets, counts, total, observations) in sorted(histograms.items()):
+        declare(name, "histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {observations}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,171 @@
+"""
+Đọc file Kết quả Đăng ký học theo kiểu luồng (streaming).
+
+Trang "Kết quả đăng ký học" chứa rất nhiều markup bố cục quanh một bảng nhỏ. Thay vì dựng
+cả cây BeautifulSoup, parser ở đây xử lý HTML theo sự kiện (html.parser.HTMLParser), chỉ
+giữ lại bảng đang đọc và dừng ngay khi bảng chứa cột Mã Lớp học phần kết thúc.
+"""
+import codecs
+from html.parser import HTMLParser
+from typing import BinaryIO, TextIO
+from classes.subject import SimpleClass
+
+# Map header của bảng với thuộc tính của SimpleClass
+HEADER_MAPPING = {
+    "Mã môn học": "subject.id",
+    "Môn học": "subject.name",
+    "Lớp môn học": "id"
+}
+
+CHUNK_SIZE = 64 * 1024
+
+def make_simple_class(headers: list[str], cells: list[str]) -> SimpleClass:
+    """
+    Tạo SimpleClass từ một dòng của bảng Kết quả Đăng ký học.
+
+    Args:
+        headers (list[str]): Header của bảng
+        cells (list[str]): Nội dung các ô của dòng (đã strip)
+
+    Returns:
+        SimpleClass: Lớp học phần tương ứng
+    """
+    class_ = SimpleClass()
+    for header, cell_text in zip(headers, cells):
+        if header in HEADER_MAPPING:
+            attr = HEADER_MAPPING[header]
+            if "." in attr:
+                obj_name, attr_name = attr.split(".")
+                setattr(getattr(class_, obj_name), attr_name, cell_text)
+            else:
+                setattr(class_, attr, cell_text)
+    return class_
+
+class _Table:
+    """
+    Trạng thái của một bảng đang được đọc.
+    """
+    def __init__(self):
+        self.rows: list[tuple[list[str], list[str]]] = []  # (nội dung th, nội dung td) của từng dòng
+        self.raw_headers: list[str] = []  # nội dung các th chưa strip, dùng để so khớp id_header
+
+class RegistrationTableParser(HTMLParser):
+    """
+    Parser theo sự kiện, tìm bảng có header chứa id_header và dừng khi bảng đó kết thúc.
+
+    Attributes:
+        id_header (str): Tên cột chứa Mã Lớp học phần.
+        done (bool): Đã đọc xong bảng cần tìm.
+        headers (list[str]): Header của bảng tìm được.
+        rows (list[list[str]]): Nội dung các ô của từng dòng dữ liệu.
+    """
+    def __init__(self, id_header: str):
+        super().__init__(convert_charrefs=True)
+        self.id_header = id_header
+        self.done = False
+        self.headers: list[str] = []
+        self.rows: list[list[str]] = []
+        self._tables: list[_Table] = []
+        self._cell: list[str] | None = None  # các đoạn text của ô đang đọc
+        self._cell_tag: str | None = None
+        self._text: list[str] = []  # text liên tiếp chưa được tách theo thẻ
+
+    def _flush_text(self) -> None:
+        if self._text and self._cell is not None:
+            self._cell.append("".join(self._text))
+        self._text = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if self.done:
+            return
+        self._flush_text()
+        if tag == "table":
+            self._close_cell()
+            self._tables.append(_Table())
+        elif not self._tables:
+            return
+        elif tag == "tr":
+            self._close_cell()
+            self._tables[-1].rows.append(([], []))
+        elif tag in ("th", "td"):
+            self._close_cell()
+            table = self._tables[-1]
+            if not table.rows:
+                table.rows.append(([], []))
+            self._cell, self._cell_tag = [], tag
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.done:
+            return
+        self._flush_text()
+        if tag in ("th", "td", "tr"):
+            self._close_cell()
+        elif tag == "table" and self._tables:
+            self._close_cell()
+            table = self._tables.pop()
+            if self.id_header in table.raw_headers:
+                self.headers = table.rows[0][0]
+                self.rows = [cells for _, cells in table.rows[1:]]
+                self.done = True
+
+    def handle_data(self, data: str) -> None:
+        if not self.done and self._cell is not None:
+            self._text.append(data)
+
+    def _close_cell(self) -> None:
+        if self._cell is None:
+            return
+        raw = "".join(self._cell)
+        text = "".join(part.strip() for part in self._cell)
+        table = self._tables[-1]
+        headers, cells = table.rows[-1]
+        if self._cell_tag == "th":
+            headers.append(text)
+            table.raw_headers.append(raw)
+        else:
+            cells.append(text)
+        self._cell, self._cell_tag = None, None
+
+def parse_registration(source: str | bytes | BinaryIO | TextIO, id_header: str) -> list[SimpleClass] | None:
+    """
+    Đọc bảng lớp học phần từ trang Kết quả Đăng ký học theo kiểu luồng.
+
+    Dữ liệu được đọc từng khối và ngừng đọc ngay khi bảng cần tìm kết thúc.
+
+    Args:
+        source (str | bytes | BinaryIO | TextIO): Đường dẫn file, nội dung HTML (bytes) hoặc file object
+        id_header (str): Tên cột chứa Mã Lớp học phần
+
+    Returns:
+        list[SimpleClass] | None: Các lớp học phần, hoặc None nếu không tìm thấy bảng
+    """
+    parser = RegistrationTableParser(id_header)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(chunk: str | bytes) -> bool:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        parser.feed(text)
+        return parser.done
+
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            _feed_stream(file, feed)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), CHUNK_SIZE):
+            if feed(bytes(view[start:start + CHUNK_SIZE])):
+                break
+    else:
+        _feed_stream(source, feed)
+
+    if not parser.done:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    if not parser.done:
+        return None
+    return [make_simple_class(parser.headers, cells) for cells in parser.rows]
+
+def _feed_stream(stream: BinaryIO | TextIO, feed) -> None:
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        if not chunk or feed(chunk):
+            break
@@ -1,6 +1,13 @@
-from flask import jsonify
+import json
+import math
+from flask import jsonify, Response
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson không bắt buộc, dùng json của thư viện chuẩn
+    orjson = None
+
 class APIError(Exception):
     """Custom exception cho API errors"""
     def __init__(self, message: str, status_code: int = 400):
@@ -28,4 +35,48 @@ def make_response(data: Any, status: int = 200, message: Optional[str] = None) -
     if message:
         response['message'] = message
         
-    return jsonify(response) 
\ No newline at end of file
+    return jsonify(response) 
+
+def dumps(data: Any) -> bytes:
+    """
+    Mã hóa JSON (UTF-8) bằng orjson nếu có, nếu không thì dùng json.
+
+    NaN và ±inf được mã hóa thành null ở cả hai cách (giống orjson), để kết quả không phụ thuộc
+    vào việc có cài orjson hay không.
+
+    Args:
+        data: Dữ liệu cần mã hóa
+
+    Returns:
+        bytes: JSON đã mã hóa
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    try:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        # Hiếm gặp: chỉ duyệt lại dữ liệu khi thật sự có số không hữu hạn
+        text = json.dumps(_finite(data), ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+def _finite(value: Any) -> Any:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def json_response(data: Any, status: int = 200) -> Response:
+    """
+    Tạo response JSON trong một lần mã hóa (thay cho jsonify với payload lớn).
+
+    Args:
+        data: Dữ liệu trả về
+        status: HTTP status code
+
+    Returns:
+        Response: Response với Content-Type application/json
+    """
+    return Response(dumps(data), status=status, mimetype="application/json")
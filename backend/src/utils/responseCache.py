@@ -0,0 +1,242 @@
+"""
+Cache file .ics đã tạo, theo nội dung của hai file đầu vào và các tham số tạo lịch.
+
+Kết quả của getCalendar chỉ phụ thuộc vào file đăng ký, file Thời khóa biểu, bảng tiết học và các tham số
+(start_date, repeat, remind_before, practical_delay, practical_groups), nên mã băm của chúng
+vừa là khóa cache vừa là ETag (strong): client gửi lại If-None-Match được trả về 304 mà
+không cần đọc file hay tạo lịch.
+
+Có hai tầng: bộ nhớ (LRU, giới hạn theo byte) và thư mục trên đĩa (RESPONSE_CACHE_DIR, xóa
+các file dùng lâu nhất khi vượt quá RESPONSE_CACHE_DISK_BYTES).
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import date
+from typing import BinaryIO
+from config import settings
+from utils import metrics
+from utils.cache import LRUCache
+from utils.getClass import PERIOD_REFERENCE, normalize_sources
+
+logger = logging.getLogger(__name__)
+
+# Tăng khi cách tạo file .ics thay đổi, để không dùng lại kết quả cũ
+CACHE_VERSION = 1
+_SUFFIX = ".ics"
+
+MEMORY_CACHE = LRUCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES
+)
+
+# Mã băm nội dung theo (đường dẫn, mtime_ns, kích thước), để không phải băm lại file chưa đổi
+_digests: dict[str, tuple[int, int, str]] = {}
+_digests_lock = threading.Lock()
+_disk_lock = threading.Lock()
+
+def content_digest(source: str | bytes | BinaryIO | list) -> str:
+    """
+    Mã băm nội dung của một file đầu vào.
+
+    Args:
+        source (str | bytes | BinaryIO | list): Đường dẫn, nội dung, file object (seek được)
+            hoặc danh sách file/sheet Thời khóa biểu
+
+    Returns:
+        str: Mã băm (hex)
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+    """
+    if isinstance(source, list):
+        # Nhiều file/sheet Thời khóa biểu (xem utils.getClass.ScheduleSource)
+        parts = [[content_digest(file), sheet] for file, sheet in normalize_sources(source)]
+        return hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.blake2b(source, digest_size=16).hexdigest()
+    if not isinstance(source, str):
+        start = source.tell()
+        digest = hashlib.blake2b(source.read(), digest_size=16).hexdigest()
+        source.seek(start)
+        return digest
+
+    path = os.path.abspath(source)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Không tìm thấy file: {source}")
+    cached = _digests.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    with _digests_lock:
+        _digests[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+def _normalize(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def calendar_key(
+    registered_file: str | bytes | BinaryIO,
+    schedule_file: str | bytes | BinaryIO,
+    options: dict,
+    id_header: str = "Lớp môn học",
+    schedule_id_header: str = "Mã lớp"
+) -> str:
+    """
+    Khóa cache (và ETag) của một file .ics.
+
+    Args:
+        registered_file (str | bytes | BinaryIO): File đăng ký học
+        schedule_file (str | bytes | BinaryIO): File Thời khóa biểu
+        options (dict): Tham số tạo lịch (xem utils.makeCalendar.parse_calendar_options)
+        id_header (str): Tên cột mã lớp trong file đăng ký đã dùng để đọc các lớp
+        schedule_id_header (str): Tên cột mã lớp trong Thời khóa biểu đã dùng để đọc các lớp
+
+    Returns:
+        str: Mã băm của nội dung hai file và các tham số đã chuẩn hóa
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+    """
+    return calendar_key_from_digests(
+        content_digest(registered_file), content_digest(schedule_file), options, id_header, schedule_id_header
+    )
+
+def calendar_key_from_digests(
+    registered_digest: str,
+    schedule_digest: str,
+    options: dict,
+    id_header: str = "Lớp môn học",
+    schedule_id_header: str = "Mã lớp"
+) -> str:
+    """
+    Như calendar_key, với mã băm nội dung (content_digest) của hai file đã tính trước.
+
+    Args:
+        registered_digest (str): content_digest của file đăng ký học
+        schedule_digest (str): content_digest của file Thời khóa biểu
+        options (dict): Tham số tạo lịch (xem utils.makeCalendar.parse_calendar_options)
+        id_header (str): Tên cột mã lớp trong file đăng ký
+        schedule_id_header (str): Tên cột mã lớp trong Thời khóa biểu
+
+    Returns:
+        str: Khóa cache, giống calendar_key với cùng nội dung file và tham số
+    """
+    parameters = {
+        'start_date': _normalize(options['start_date']),
+        'repeat': _normalize(options.get('repeat', 15)),
+        # Thứ tự nhắc trước ảnh hưởng thứ tự VALARM trong file, nên giữ nguyên
+        'remind_before': list(options.get('remind_before') or []),
+        'practical_delay': options.get('practical_delay', 1),
+        'practical_groups': sorted(set(options.get('practical_groups') or [])),
+    }
+    payload = json.dumps(
+        [
+            # Cùng nội dung file nhưng khác cột mã lớp có thể cho các lớp khác nhau
+            CACHE_VERSION, registered_digest, schedule_digest, [id_header, schedule_id_header],
+            # Bảng tiết học có thể được tải lại khi đang chạy (SCHEDULE_WATCH_INTERVAL)
+            content_digest(PERIOD_REFERENCE.file), parameters
+        ],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+def make_etag(key: str) -> str:
+    return f'"{key}"'
+
+def _disk_path(key: str) -> str | None:
+    if not settings.RESPONSE_CACHE_DIR:
+        return None
+    return os.path.join(settings.RESPONSE_CACHE_DIR, key + _SUFFIX)
+
+def get(key: str) -> bytes | None:
+    """
+    Lấy file .ics đã cache (bộ nhớ trước, rồi tới đĩa).
+
+    Args:
+        key (str): Khóa cache
+
+    Returns:
+        bytes | None: Nội dung file .ics, None nếu chưa có
+    """
+    data = MEMORY_CACHE.get(key)
+    if data is not None:
+        metrics.count("response_cache_hits_total", tier="memory")
+        return data
+
+    path = _disk_path(key)
+    if path is not None:
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # Đánh dấu vừa dùng, để xóa sau cùng
+        except FileNotFoundError:
+            data = None
+        except OSError:
+            logger.warning("Không đọc được cache %s", path, exc_info=True)
+            data = None
+        if data is not None:
+            metrics.count("response_cache_hits_total", tier="disk")
+            MEMORY_CACHE.put(key, data, len(data))
+            return data
+
+    metrics.count("response_cache_misses_total")
+    return None
+
+def put(key: str, data: bytes) -> None:
+    """
+    Lưu file .ics vào cache (bộ nhớ và đĩa nếu có RESPONSE_CACHE_DIR).
+
+    Args:
+        key (str): Khóa cache
+        data (bytes): Nội dung file .ics
+    """
+    MEMORY_CACHE.put(key, data, len(data))
+    path = _disk_path(key)
+    if path is None:
+        return
+    try:
+        os.makedirs(settings.RESPONSE_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=settings.RESPONSE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        _evict_disk(settings.RESPONSE_CACHE_DIR, settings.RESPONSE_CACHE_DISK_BYTES)
+    except OSError:
+        logger.warning("Không ghi được cache %s", path, exc_info=True)
+
+def _evict_disk(directory: str, max_bytes: int) -> None:
+    """
+    Xóa các file cache dùng lâu nhất cho tới khi tổng kích thước không vượt quá max_bytes.
+    """
+    with _disk_lock:
+        entries = []
+        total = 0
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                if entry.is_file() and entry.name.endswith(_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,198 @@
+"""
+Chuyển các lớp học phần và buổi học sang dạng JSON của API.
+
+Có hai dạng:
+- nested (mặc định): mỗi lớp là một object, các buổi học nằm trong "lessons"
+- columnar: mỗi thuộc tính là một mảng (theo lớp hoặc theo buổi học), các chuỗi được mã hóa
+  từ điển thành chỉ số trong "strings", để payload nhỏ hơn với Thời khóa biểu lớn
+
+Có thể chỉ lấy một số trường (fields), ví dụ "id,subject.id,lessons.weekday,lessons.period".
+"""
+from functools import lru_cache
+from classes.subject import DetailedClass, Lesson, Period
+
+LESSON_FIELDS = ("weekday", "period", "location", "group", "is_practical")
+CLASS_FIELDS = ("id", "subject.id", "subject.name", "teacher")
+PRACTICAL_KEYWORDS = ("TH", "BT")
+LAYOUTS = ("nested", "columnar")
+
+@lru_cache(maxsize=4096)
+def is_practical(group) -> bool:
+    """
+    Nhóm có phải nhóm TH/BT không (kết quả được nhớ lại theo giá trị nhóm).
+    """
+    return isinstance(group, str) and any(keyword in group for keyword in PRACTICAL_KEYWORDS)
+
+@lru_cache(maxsize=4096)
+def period_text(period: Period) -> str:
+    """
+    str(period), được nhớ lại vì các Period được dùng chung giữa các buổi học.
+    """
+    return str(period)
+
+def parse_fields(fields: str | list[str] | None) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Đọc tham số fields.
+
+    Args:
+        fields (str | list[str] | None): Danh sách trường (hoặc chuỗi cách nhau bởi dấu phẩy).
+            Trường của lớp: id, subject (= subject.id, subject.name), subject.id, subject.name, teacher;
+            trường của buổi học: lessons (mọi trường), lessons.weekday, lessons.period, lessons.location,
+            lessons.group, lessons.is_practical. None là lấy tất cả.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[str, ...]]: Các trường của lớp và các trường của buổi học, theo thứ tự chuẩn
+
+    Raises:
+        ValueError: Nếu có trường không hợp lệ
+    """
+    if fields is None:
+        return CLASS_FIELDS, LESSON_FIELDS
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        raise ValueError("fields phải là danh sách tên trường")
+
+    class_fields, lesson_fields = set(), set()
+    for field in (field.strip() for field in fields):
+        if field == "subject":
+            class_fields.update(("subject.id", "subject.name"))
+        elif field in CLASS_FIELDS:
+            class_fields.add(field)
+        elif field == "lessons":
+            lesson_fields.update(LESSON_FIELDS)
+        elif field.startswith("lessons.") and field[len("lessons."):] in LESSON_FIELDS:
+            lesson_fields.add(field[len("lessons."):])
+        elif field:
+            raise ValueError(f"Trường không hợp lệ: {field!r}")
+    return (
+        tuple(field for field in CLASS_FIELDS if field in class_fields),
+        tuple(field for field in LESSON_FIELDS if field in lesson_fields)
+    )
+
+def _lesson_value(lesson: Lesson, field: str):
+    if field == "period":
+        return period_text(lesson.period)
+    if field == "is_practical":
+        return is_practical(lesson.group)
+    return getattr(lesson, field)
+
+def lesson_to_dict(lesson: Lesson, fields: tuple[str, ...] = LESSON_FIELDS) -> dict:
+    """
+    Thông tin một buổi học (xem getLessons).
+
+    Args:
+        lesson (Lesson): Buổi học
+        fields (tuple[str, ...]): Các trường cần lấy
+
+    Returns:
+        dict: weekday, period, location, group, is_practical (hoặc các trường trong fields)
+    """
+    return {field: _lesson_value(lesson, field) for field in fields}
+
+def class_to_dict(
+    class_: DetailedClass,
+    class_fields: tuple[str, ...] = CLASS_FIELDS,
+    lesson_fields: tuple[str, ...] = LESSON_FIELDS
+) -> dict:
+    """
+    Thông tin một lớp học phần kèm các buổi học (xem getLessons).
+
+    Args:
+        class_ (DetailedClass): Lớp học đầy đủ thông tin
+        class_fields (tuple[str, ...]): Các trường của lớp cần lấy
+        lesson_fields (tuple[str, ...]): Các trường của buổi học cần lấy, rỗng là bỏ "lessons"
+
+    Returns:
+        dict: id, subject, teacher, lessons (hoặc các trường được chọn)
+    """
+    result = {}
+    for field in class_fields:
+        if field == "subject.id":
+            result.setdefault('subject', {})['id'] = class_.subject.id
+        elif field == "subject.name":
+            result.setdefault('subject', {})['name'] = class_.subject.name
+        else:
+            result[field] = getattr(class_, field)
+    if lesson_fields:
+        result['lessons'] = [lesson_to_dict(lesson, lesson_fields) for lesson in class_.lessons]
+    return result
+
+def classes_to_columns(
+    classes: list[DetailedClass],
+    class_fields: tuple[str, ...] = CLASS_FIELDS,
+    lesson_fields: tuple[str, ...] = LESSON_FIELDS
+) -> dict:
+    """
+    Các lớp học phần ở dạng cột: mỗi trường là một mảng, chuỗi được thay bằng chỉ số trong "strings".
+
+    Args:
+        classes (list[DetailedClass]): Các lớp học phần
+        class_fields (tuple[str, ...]): Các trường của lớp cần lấy
+        lesson_fields (tuple[str, ...]): Các trường của buổi học cần lấy, rỗng là bỏ "lessons"
+
+    Returns:
+        dict: {
+            "strings": list[str],  # Bảng chuỗi
+            "classes": {"<trường>": list},  # Chỉ số trong strings (null nếu trống), theo thứ tự lớp
+            "lessons": {
+                "class": list[int],  # Vị trí lớp của buổi học trong "classes"
+                "<trường>": list  # weekday (int) và is_practical (bool) giữ nguyên, còn lại là chỉ số trong strings
+            }
+        }
+    """
+    strings: dict[str, int] = {}
+
+    def encode(value):
+        if not isinstance(value, str):
+            return None
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    class_columns = {field: [] for field in class_fields}
+    for class_ in classes:
+        for field in class_fields:
+            if field == "subject.id":
+                value = class_.subject.id
+            elif field == "subject.name":
+                value = class_.subject.name
+            else:
+                value = getattr(class_, field)
+            class_columns[field].append(encode(value))
+    result = {'classes': class_columns}
+
+    if lesson_fields:
+        lesson_columns = {'class': [], **{field: [] for field in lesson_fields}}
+        for position, class_ in enumerate(classes):
+            for lesson in class_.lessons:
+                lesson_columns['class'].append(position)
+                for field in lesson_fields:
+                    value = _lesson_value(lesson, field)
+                    lesson_columns[field].append(value if field in ("weekday", "is_practical") else encode(value))
+        result['lessons'] = lesson_columns
+    result['strings'] = list(strings)
+    return result
+
+def lessons_payload(
+    classes: list[DetailedClass],
+    layout: str = "nested",
+    class_fields: tuple[str, ...] = CLASS_FIELDS,
+    lesson_fields: tuple[str, ...] = LESSON_FIELDS
+) -> dict:
+    """
+    Nội dung response của getLessons với layout đã chọn.
+
+    Args:
+        classes (list[DetailedClass]): Các lớp học phần
+        layout (str): "nested" hoặc "columnar"
+        class_fields (tuple[str, ...]): Các trường của lớp cần lấy
+        lesson_fields (tuple[str, ...]): Các trường của buổi học cần lấy
+
+    Returns:
+        dict: {"classes": [...]} hoặc {"layout": "columnar", ...} (xem classes_to_columns)
+    """
+    if layout == "columnar":
+        return {'layout': 'columnar', **classes_to_columns(classes, class_fields, lesson_fields)}
+    return {'classes': [class_to_dict(class_, class_fields, lesson_fields) for class_ in classes]}
@@ -0,0 +1,94 @@
+"""
+Handle ngắn hạn giữ kết quả đọc file đăng ký học và Thời khóa biểu của một phiên người dùng.
+
+Frontend thường gọi getLessons rồi getCalendar với cùng hai file, nên mỗi phiên phải đọc hai file hai lần.
+getLessons (và getLessonsCalendar) lưu các lớp đã đọc vào đây và trả về một handle ngẫu nhiên; getCalendar
+nhận handle thay cho hai file để không phải đọc lại. Handle hết hạn sau SESSION_TTL_SECONDS giây, và chỉ
+có trong bộ nhớ của tiến trình đã tạo ra nó: khi không tìm thấy handle, client gửi lại hai file như cũ.
+"""
+import secrets
+from dataclasses import dataclass
+from config import settings
+from utils import metrics
+from utils import responseCache as response_cache
+from utils.cache import ExpiringCache
+from classes.subject import DetailedClass
+
+# Kích thước ước lượng mỗi buổi học (byte), để giới hạn SESSION_MAX_BYTES
+_LESSON_SIZE = 256
+
+SESSIONS = ExpiringCache(
+    ttl=settings.SESSION_TTL_SECONDS,
+    max_entries=settings.SESSION_MAX_ENTRIES,
+    max_bytes=settings.SESSION_MAX_BYTES
+)
+
+@dataclass(frozen=True, slots=True)
+class ParsedSession:
+    """
+    Kết quả đọc file của một phiên.
+
+    Attributes:
+        classes (tuple[DetailedClass, ...]): Các lớp học phần đã đăng ký, đầy đủ thông tin
+        registered_digest (str | None): content_digest của file đăng ký học (None nếu không tính)
+        schedule_digest (str | None): content_digest của file Thời khóa biểu (None nếu không tính)
+        id_header (str): Tên cột mã lớp đã dùng để đọc file đăng ký
+        schedule_id_header (str): Tên cột mã lớp đã dùng để đọc Thời khóa biểu
+    """
+    classes: tuple[DetailedClass, ...]
+    registered_digest: str | None = None
+    schedule_digest: str | None = None
+    id_header: str = "Lớp môn học"
+    schedule_id_header: str = "Mã lớp"
+
+def create_session(
+    classes: list[DetailedClass],
+    registered_file: str | bytes | None = None,
+    schedule_file: str | bytes | list | None = None,
+    id_header: str = "Lớp môn học",
+    schedule_id_header: str = "Mã lớp"
+) -> str | None:
+    """
+    Lưu các lớp đã đọc và tạo handle cho chúng.
+
+    Args:
+        classes (list[DetailedClass]): Các lớp học phần đã đăng ký, đầy đủ thông tin
+        registered_file (str | bytes | None): File đăng ký học đã đọc. Khi bật RESPONSE_CACHE_ENABLED,
+            mã băm của hai file được lưu lại để getCalendar theo handle dùng chung cache .ics
+        schedule_file (str | bytes | list | None): File Thời khóa biểu đã đọc
+        id_header (str): Tên cột mã lớp đã dùng để đọc file đăng ký (là một phần của khóa cache .ics)
+        schedule_id_header (str): Tên cột mã lớp đã dùng để đọc Thời khóa biểu
+
+    Returns:
+        str | None: Handle, hoặc None nếu SESSION_TTL_SECONDS <= 0 (tắt)
+    """
+    if settings.SESSION_TTL_SECONDS <= 0:
+        return None
+    registered_digest = schedule_digest = None
+    if settings.RESPONSE_CACHE_ENABLED and registered_file is not None and schedule_file is not None:
+        registered_digest = response_cache.content_digest(registered_file)
+        schedule_digest = response_cache.content_digest(schedule_file)
+
+    handle = secrets.token_urlsafe(16)
+    size = _LESSON_SIZE * (1 + sum(len(class_.lessons) for class_ in classes))
+    SESSIONS.put(handle, ParsedSession(
+        tuple(classes), registered_digest, schedule_digest, id_header, schedule_id_header
+    ), size)
+    metrics.count("session_created_total")
+    return handle
+
+def get_session(handle: str) -> ParsedSession | None:
+    """
+    Lấy kết quả đọc file theo handle.
+
+    Args:
+        handle (str): Handle do create_session trả về
+
+    Returns:
+        ParsedSession | None: None nếu handle không tồn tại hoặc đã hết hạn
+    """
+    if not isinstance(handle, str):
+        return None
+    session = SESSIONS.get(handle)
+    metrics.count("session_hits_total" if session is not None else "session_misses_total")
+    return session
@@ -0,0 +1,177 @@
+"""
+Bản biên dịch (snapshot) dạng cột của file Thời khóa biểu.
+
+Đọc file .xlsx qua openpyxl tốn vài giây mỗi lần khởi động lại server. Snapshot lưu
+sẵn các cột đã chuẩn hóa (mã hóa từ điển) cùng chỉ mục theo mã lớp học phần, và được
+đọc lại qua mmap: chỉ phần header nhỏ được giải mã, các mảng mã chỉ được hệ điều hành
+nạp vào bộ nhớ khi thực sự được truy cập.
+
+Cấu trúc file (little-endian):
+    MAGIC (8 byte) | độ dài header (uint64) | header JSON (UTF-8) | padding
+    | mảng mã của từng cột (uint32) | mảng vị trí dòng theo lớp học phần (uint32)
+
+Biên dịch từ dòng lệnh (chạy trong thư mục src):
+    python -m utils.snapshot <file_thoi_khoa_bieu.xlsx> [--id-header "Mã lớp"] [--output <file>]
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+import numpy as np
+from typing import Any
+from classes.schedule import Schedule
+from classes.subject import Timetable
+from config import settings
+
+MAGIC = b"VNUTKB\x01\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+_ALIGNMENT = 8
+_LENGTH = struct.Struct("<Q")
+
+def snapshot_path(file_path: str) -> str:
+    """
+    Đường dẫn file snapshot tương ứng với một file Thời khóa biểu.
+
+    Mặc định nằm cạnh file gốc, hoặc trong thư mục SCHEDULE_SNAPSHOT_DIR nếu được cấu hình.
+
+    Args:
+        file_path (str): Đường dẫn đến file Thời khóa biểu
+
+    Returns:
+        str: Đường dẫn file snapshot
+    """
+    path = os.path.abspath(file_path)
+    directory = settings.SCHEDULE_SNAPSHOT_DIR or os.path.dirname(path)
+    return os.path.join(directory, os.path.basename(path) + SNAPSHOT_SUFFIX)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def write_snapshot(schedule: Schedule, path: str, source: list) -> str:
+    """
+    Ghi Schedule ra file snapshot (ghi vào file tạm rồi đổi tên để tránh file dở dang).
+
+    Args:
+        schedule (Schedule): Thời khóa biểu đã đọc
+        path (str): Đường dẫn file snapshot
+        source (list): Fingerprint của file gốc (không gồm đường dẫn), dùng để kiểm tra độ mới
+
+    Returns:
+        str: Đường dẫn file snapshot đã ghi
+    """
+    blobs: list[bytes] = []
+    offset = 0
+
+    def add_blob(array) -> dict:
+        nonlocal offset
+        data = np.asarray(array, dtype="<u4").tobytes()
+        blob = {'offset': offset, 'length': len(data) // 4}
+        blobs.append(data + b"\0" * (_align(len(data)) - len(data)))
+        offset += _align(len(data))
+        return blob
+
+    columns = {}
+    for name, (codes, values) in schedule.columns.items():
+        columns[name] = {'values': list(values), 'codes': add_blob(codes)}
+
+    class_ids = sorted(schedule.index, key=lambda class_id: schedule.index[class_id][0])
+    positions = [np.asarray(schedule.index[class_id], dtype="<u4") for class_id in class_ids]
+    index, start = [], 0
+    for class_id, class_positions in zip(class_ids, positions):
+        index.append([class_id, start, start + len(class_positions)])
+        start += len(class_positions)
+    positions_blob = add_blob(np.concatenate(positions) if positions else [])
+
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'source': list(source),
+        'id_header': schedule.id_header,
+        'columns': columns,
+        'index': index,
+        'positions': positions_blob
+    }, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+    prefix_length = len(MAGIC) + _LENGTH.size + len(header)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(_LENGTH.pack(len(header)))
+        file.write(header)
+        file.write(b"\0" * (_align(prefix_length) - prefix_length))
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, path)
+    return path
+
+def read_snapshot(path: str, id_header: str, timetable: Timetable, source: list | None = None) -> Schedule | None:
+    """
+    Đọc file snapshot qua mmap.
+
+    Args:
+        path (str): Đường dẫn file snapshot
+        id_header (str): Tên cột chứa Mã Lớp học phần
+        timetable (Timetable): Bảng tham chiếu thời gian tiết học
+        source (list | None): Fingerprint hiện tại của file gốc; nếu khác với lúc biên dịch thì bỏ qua snapshot
+
+    Returns:
+        Schedule | None: Thời khóa biểu, hoặc None nếu không có snapshot, snapshot đã cũ hoặc không khớp id_header
+
+    Raises:
+        ValueError: Nếu file không phải snapshot hợp lệ
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError(f"File snapshot rỗng: {path}")
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"File không phải snapshot Thời khóa biểu: {path}")
+    (header_length,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+    header_start = len(MAGIC) + _LENGTH.size
+    header = json.loads(buffer[header_start:header_start + header_length].decode("utf-8"))
+    if header.get('version') != SNAPSHOT_VERSION or header['id_header'] != id_header:
+        return None
+    if source is not None and header['source'] != list(source):
+        return None
+
+    data = memoryview(buffer)[_align(header_start + header_length):]
+
+    def view(blob: dict) -> memoryview:
+        return data[blob['offset']:blob['offset'] + blob['length'] * 4].cast("I")
+
+    columns = {
+        name: (view(column['codes']), column['values'])
+        for name, column in header['columns'].items()
+    }
+    positions = view(header['positions'])
+    index = {class_id: positions[start:stop] for class_id, start, stop in header['index']}
+    return Schedule(columns, index, id_header, timetable)
+
+def main():
+    from utils.getClass import compile_schedule_snapshot
+
+    parser = argparse.ArgumentParser(description="Biên dịch file Thời khóa biểu (.xlsx) thành snapshot dạng cột.")
+    parser.add_argument("file", help="Đường dẫn đến file Thời khóa biểu")
+    parser.add_argument("--id-header", default="Mã lớp", help="Tên cột chứa Mã Lớp học phần")
+    parser.add_argument("--output", default=None, help="Đường dẫn file snapshot (mặc định: cạnh file gốc)")
+    options = parser.parse_args()
+
+    path = compile_schedule_snapshot(options.file, options.id_header, options.output)
+    print(f"Đã ghi snapshot: {path}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Nhận file tải lên (multipart/form-data) và đọc trực tiếp trong bộ nhớ.
+
+File Thời khóa biểu (.xlsx) và file Kết quả Đăng ký học (.html) có thể được gửi kèm request
+thay vì truyền đường dẫn trên server. Nội dung file được giữ trong bộ nhớ (không ghi ra file
+tạm), bị giới hạn kích thước ngay trong lúc Werkzeug nhận multipart (UploadBuffer), và bị từ chối
+ngay nếu các byte đầu tiên không thuộc định dạng nào đã biết; loại file của từng trường được kiểm
+tra lại khi lấy file (get_upload).
+"""
+import io
+import json
+from typing import BinaryIO
+from flask import Request
+from config import settings
+from utils.response import APIError
+
+# Các byte đầu tiên của từng loại file
+XLSX_MAGIC = b"PK\x03\x04"  # .xlsx là file zip
+_BOM = b"\xef\xbb\xbf"
+_SNIFF_BYTES = 512
+
+class UploadBuffer(io.BytesIO):
+    """
+    Bộ đệm nhận nội dung một file trong lúc Werkzeug đọc request multipart.
+
+    Lỗi được báo ngay khi ghi, nên request bị dừng giữa chừng thay vì phải nhận hết file rồi mới kiểm tra.
+
+    Attributes:
+        filename (str | None): Tên file (dùng trong thông báo lỗi).
+        limit (int): Số byte tối đa.
+    """
+    def __init__(self, filename: str | None, limit: int):
+        super().__init__()
+        self.filename = filename
+        self.limit = limit
+        self._checked = False
+
+    def write(self, data) -> int:
+        if self.tell() + len(data) > self.limit:
+            raise APIError(f"File '{self.filename}' vượt quá giới hạn {self.limit} byte", status_code=413)
+        written = super().write(data)
+        if not self._checked and self.tell() >= _SNIFF_BYTES:
+            # File nhỏ hơn _SNIFF_BYTES được kiểm tra trong get_upload
+            self._checked = True
+            with self.getbuffer() as view:
+                head = bytes(view[:_SNIFF_BYTES])
+            if sniff_kind(head) is None:
+                raise APIError(f"File '{self.filename}' không phải định dạng được hỗ trợ", status_code=415)
+        return written
+
+class UploadRequest(Request):
+    """
+    Request của Flask giữ các file tải lên trong bộ nhớ (UploadBuffer) thay vì SpooledTemporaryFile.
+
+    Tổng kích thước bị giới hạn bởi MAX_CONTENT_LENGTH của app, mỗi file bởi MAX_UPLOAD_BYTES,
+    các trường không phải file (ví dụ "json") bởi max_form_memory_size.
+    """
+    max_form_memory_size = settings.MAX_UPLOAD_BYTES
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None) -> BinaryIO:
+        return UploadBuffer(filename, settings.MAX_UPLOAD_BYTES)
+
+def sniff_kind(head: bytes) -> str | None:
+    """
+    Đoán loại file từ các byte đầu tiên.
+
+    Args:
+        head (bytes): Các byte đầu tiên của file
+
+    Returns:
+        str | None: "xlsx", "html" hoặc None nếu không nhận ra
+    """
+    if head.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if head.removeprefix(_BOM).lstrip().startswith(b"<"):
+        return "html"
+    return None
+
+class LimitedReader(io.RawIOBase):
+    """
+    Bọc một stream nhị phân: kiểm tra loại file ở lần đọc đầu tiên và giới hạn số byte được đọc.
+
+    Attributes:
+        name (str): Tên trường của file trong request (dùng trong thông báo lỗi).
+        kind (str): Loại file mong đợi ("xlsx" hoặc "html").
+        limit (int): Số byte tối đa được đọc.
+    """
+    def __init__(self, stream: BinaryIO, name: str, kind: str, limit: int):
+        super().__init__()
+        self.name = name
+        self.kind = kind
+        self.limit = limit
+        self._stream = stream
+        self._read = 0
+        self._checked = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        if not self._checked:
+            self._checked = True
+            if sniff_kind(data[:512]) != self.kind:
+                raise APIError(f"File '{self.name}' không phải định dạng .{self.kind}", status_code=415)
+        self._read += len(data)
+        if self._read > self.limit:
+            raise APIError(f"File '{self.name}' vượt quá giới hạn {self.limit} byte", status_code=413)
+        buffer[:len(data)] = data
+        return len(data)
+
+def get_upload(request: Request, name: str, kind: str) -> bytes | None:
+    """
+    Đọc file tải lên theo tên trường vào bộ nhớ.
+
+    Định dạng được kiểm tra ngay ở khối đầu tiên và giới hạn kích thước được áp dụng trong
+    lúc đọc, nên file sai định dạng hoặc quá lớn bị từ chối trước khi đọc hết hay parse.
+
+    Args:
+        request (Request): Request object từ Flask
+        name (str): Tên trường chứa file
+        kind (str): Loại file mong đợi ("xlsx" hoặc "html")
+
+    Returns:
+        bytes | None: Nội dung file, None nếu request không có file này
+
+    Raises:
+        APIError: 415 nếu sai định dạng, 413 nếu vượt quá MAX_UPLOAD_BYTES
+    """
+    storage = request.files.get(name)
+    if storage is None:
+        return None
+    return LimitedReader(storage.stream, name, kind, settings.MAX_UPLOAD_BYTES).read()
+
+def get_form_parameters(request: Request) -> dict:
+    """
+    Đọc các tham số (không phải file) của request multipart từ trường "json".
+
+    Args:
+        request (Request): Request object từ Flask
+
+    Returns:
+        dict: Các tham số, giống body JSON của request thông thường
+
+    Raises:
+        APIError: Nếu trường "json" không phải JSON object
+    """
+    raw = request.form.get("json")
+    if raw is None:
+        return request.form.to_dict()
+    try:
+        parameters = json.loads(raw)
+    except json.JSONDecodeError:
+        raise APIError("Trường 'json' không phải JSON hợp lệ", status_code=400)
+    if not isinstance(parameters, dict):
+        raise APIError("Trường 'json' phải là một JSON object", status_code=400)
+    return parameters
+
+def get_file_parameter(request: Request, argv: dict, name: str, kind: str) -> str | bytes | None:
+    """
+    Lấy file theo tên tham số: file tải lên nếu có, nếu không thì đường dẫn trong body.
+
+    Args:
+        request (Request): Request object từ Flask
+        argv (dict): Request body (JSON) hoặc tham số của request multipart
+        name (str): Tên tham số
+        kind (str): Loại file mong đợi ("xlsx" hoặc "html")
+
+    Returns:
+        str | bytes | None: Nội dung file tải lên, đường dẫn, hoặc None nếu không có
+
+    Raises:
+        APIError: 415 nếu sai định dạng, 413 nếu vượt quá MAX_UPLOAD_BYTES
+    """
+    data = get_upload(request, name, kind)
+    return data if data is not None else argv.get(name)
@@ -0,0 +1,122 @@
+"""
+Theo dõi thay đổi của file bằng cách kiểm tra định kỳ mtime và kích thước trên một luồng nền.
+
+Dùng để đọc lại Thời khóa biểu và bảng tiết học (config/time.csv) ngay khi file được cập nhật,
+thay vì đợi request đầu tiên sau khi file thay đổi phải đọc lại. Các hàm xử lý được gọi trên
+luồng nền, lần lượt theo từng file.
+"""
+import os
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+def _stat(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class FileWatcher:
+    """
+    Kiểm tra định kỳ các file đang theo dõi, gọi hàm xử lý khi mtime hoặc kích thước thay đổi.
+
+    File bị xóa (hoặc tạm thời không đọc được) không được báo; khi file xuất hiện lại
+    với mtime/kích thước khác thì được báo như một lần thay đổi.
+
+    Attributes:
+        interval (float): Thời gian giữa hai lần kiểm tra (giây).
+    """
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval (float): Thời gian giữa hai lần kiểm tra (giây)
+        """
+        self.interval = interval
+        self._files: dict[str, tuple[tuple[int, int] | None, list[Callable[[str], None]]]] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, file_path: str, callback: Callable[[str], None]) -> None:
+        """
+        Theo dõi một file. Trạng thái hiện tại của file được lấy làm mốc.
+
+        Args:
+            file_path (str): Đường dẫn đến file
+            callback (Callable[[str], None]): Hàm nhận đường dẫn tuyệt đối của file khi file thay đổi
+        """
+        path = os.path.abspath(file_path)
+        with self._lock:
+            if path in self._files:
+                self._files[path][1].append(callback)
+            else:
+                self._files[path] = (_stat(path), [callback])
+
+    def unwatch(self, file_path: str) -> None:
+        """
+        Ngừng theo dõi một file.
+
+        Args:
+            file_path (str): Đường dẫn đến file
+        """
+        with self._lock:
+            self._files.pop(os.path.abspath(file_path), None)
+
+    def is_watching(self, file_path: str) -> bool:
+        return os.path.abspath(file_path) in self._files
+
+    def poll(self) -> list[str]:
+        """
+        Kiểm tra các file một lần và gọi hàm xử lý của các file đã thay đổi (trên luồng hiện tại).
+
+        Lỗi trong hàm xử lý được ghi log, không làm dừng việc theo dõi.
+
+        Returns:
+            list[str]: Các file đã thay đổi
+        """
+        changed = []
+        with self._lock:
+            for path, (baseline, callbacks) in self._files.items():
+                current = _stat(path)
+                if current is not None and current != baseline:
+                    self._files[path] = (current, callbacks)
+                    changed.append((path, list(callbacks)))
+
+        for path, callbacks in changed:
+            logger.info("File đã thay đổi: %s", path)
+            for callback in callbacks:
+                try:
+                    callback(path)
+                except Exception:
+                    logger.exception("Lỗi khi xử lý thay đổi của %s", path)
+        return [path for path, _ in changed]
+
+    def start(self) -> None:
+        """
+        Chạy luồng nền kiểm tra các file sau mỗi interval giây (không làm gì nếu đã chạy).
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Dừng luồng nền.
+
+        Args:
+            timeout (float | None): Thời gian tối đa chờ luồng kết thúc (giây)
+        """
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.poll()
@@ -0,0 +1,104 @@
+"""
+Đọc file Thời khóa biểu (.xlsx) theo kiểu luồng (streaming).
+
+pd.read_excel nạp mọi ô của sheet vào một DataFrame rồi mới tìm dòng header, "bo" bảng và
+lọc các lớp cần lấy. Ở đây các dòng được đọc lần lượt bằng openpyxl (read_only, values_only):
+dòng header được tìm ngay khi đọc, các cột được cắt giống _standardize_dataframe và chỉ giữ
+lại các dòng có mã lớp cần lấy, nên bộ nhớ chỉ phụ thuộc vào số dòng được giữ lại.
+"""
+import io
+from typing import BinaryIO, Iterable
+import numpy as np
+import pandas as pd
+
+def _cell(value):
+    # Giống giá trị pd.read_excel trả về: ô trống là NaN, số thực nguyên là int
+    if value is None:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _trim_header(row: tuple) -> list:
+    """
+    Cắt header giống _standardize_dataframe: bỏ các cột từ cột trống đầu tiên sau cột có tên.
+    """
+    header = [_cell(value) for value in row]
+    isna = [pd.isna(value) for value in header]
+    first_notna_index = next((index for index, value in enumerate(isna) if not value), len(header))
+    first_isna_after_notna = next((index for index in range(first_notna_index, len(isna)) if isna[index]), None)
+    return header[:first_isna_after_notna]
+
+def read_schedule_rows(
+    file_path: str | bytes | BinaryIO,
+    id_header: str,
+    id_list: Iterable[str] | None = None,
+    columns: Iterable[str] | None = None,
+    sheet: int | str = 0
+) -> pd.DataFrame:
+    """
+    Đọc bảng Thời khóa biểu của một sheet, chỉ giữ các dòng của các lớp cần lấy.
+
+    Args:
+        file_path (str | bytes | BinaryIO): Đường dẫn, nội dung hoặc file object của file Thời khóa biểu
+        id_header (str): Tên cột chứa Mã Lớp học phần
+        id_list (Iterable[str] | None): Mã các lớp cần lấy, None là lấy mọi dòng
+        columns (Iterable[str] | None): Các cột cần giữ lại (cột mã lớp luôn được giữ), None là mọi cột
+        sheet (int | str): Thứ tự hoặc tên sheet
+
+    Returns:
+        pd.DataFrame: Các dòng đã lọc, header là tên cột (giống DataFrame đã chuẩn hóa của getClass)
+
+    Raises:
+        FileNotFoundError: Nếu không tìm thấy file
+        ValueError: Nếu file không phải định dạng Excel, không có sheet hoặc không tìm thấy header
+    """
+    from openpyxl import load_workbook
+
+    if isinstance(file_path, (bytes, bytearray, memoryview)):
+        file_path = io.BytesIO(file_path)
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Không tìm thấy file: {file_path}")
+    except Exception as e:
+        raise ValueError(f"Lỗi khi đọc file Excel: {str(e)}")
+
+    try:
+        try:
+            worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+        except (IndexError, KeyError):
+            raise ValueError(f"Không tìm thấy sheet {sheet!r} trong file")
+
+        wanted = None if id_list is None else set(id_list)
+        rows = worksheet.iter_rows(values_only=True)
+        header = next((_trim_header(row) for row in rows if id_header in row), None)
+        if header is None:
+            raise ValueError(f"Không tìm thấy cột '{id_header}' trong file")
+
+        # Vị trí (đầu tiên) của các cột cần giữ lại
+        names = [name for name in dict.fromkeys(header) if isinstance(name, str)]
+        if columns is not None:
+            keep = {id_header, *columns}
+            names = [name for name in names if name in keep]
+        positions = [header.index(name) for name in names]
+        id_position = header.index(id_header)
+        width = len(header)
+
+        data: dict[str, list] = {name: [] for name in names}
+        for row in rows:
+            if wanted is not None and (len(row) <= id_position or row[id_position] not in wanted):
+                continue
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            for name, position in zip(names, positions):
+                data[name].append(_cell(row[position]))
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame(data, columns=names)
+    if wanted is None:
+        # pd.read_excel bỏ các dòng trống ở cuối sheet
+        last = df.notna().any(axis=1)
+        df = df.iloc[:last[::-1].idxmax() + 1] if last.any() else df.iloc[:0]
+    return df